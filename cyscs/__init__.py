@@ -3,8 +3,32 @@
 Functions and Classes
 ---------------------
 - `cyscs.solve()`: Solves the input conic optimization problem
+- `cyscs.Cone()`: Immutable description of the cones, whose C struct is
+built once and reused by every solve
+- `cyscs.Solution`: Type of the solution dictionaries, which slice `y` and `s`
+per cone block with `sol.block()`
+- `cyscs.svec()`, `cyscs.smat()`: Pack and unpack symmetric matrices in the
+scaled lower-triangular format of the semidefinite cones
+- `cyscs.PreparedProblem()`: Problem data and cone checked and converted
+once, for solving many times without repeating the checks
+- `cyscs.solve_many()`: Solves a list of problems in parallel, using threads
+which release the GIL
 - `cyscs.Workspace()`: Class for caching solver information to save time when
 solving multiple, related problems
+- `cyscs.WorkspacePool()`: Pool of `Workspace` objects for solving the same
+problem concurrently from several threads
+- `cyscs.SolveInfo`: Type of the solver exit information in `sol['info']`
+- `cyscs.solve_async()`: Coroutine solving a problem on an executor, without
+blocking the asyncio event loop (Python 3.6+)
+- `cyscs.solve_stream()`: Async generator yielding solutions in order of
+completion (Python 3.6+)
+- `cyscs.ProcessSolver()`: Pool of worker processes which solve problems
+passed through shared memory
+- `cyscs.WarmStartCache()`: LRU cache of solutions, which warm starts solves of
+problems with the same structure
+- `cyscs.CancelToken()`: Token for stopping running solves from another thread
+- `cyscs.profile()`: Context manager timing each phase of the solves run
+inside it, in the Python and Cython wrapper and in the C solver
 - `cyscs.version()`: The current version of the CySCS wrapper.
 - `cyscs.scs_version()`: The current version of the underlying SCS C library.
 - `cyscs.default_settings()`: `dict` of the default solver settings.
@@ -14,8 +38,19 @@ Modules
 -------
 - `cyscs.examples`: Functions that provide data for example problems, for
 bechmarking, testing, and demonstrating the data input format.
+- `cyscs.bench`: Benchmarks for tracking performance regressions, also run
+from the command line with `python -m cyscs.bench`.
 
 """
 
-from ._scs import solve, version, scs_version, Workspace, default_settings
+from ._scs import (solve, solve_many, version, scs_version, Workspace,
+                   WorkspacePool, CancelToken, SolveInfo, WarmStartCache,
+                   PreparedProblem, Cone, Solution,
+                   default_settings)
+from ._process import ProcessSolver
+from ._profile import profile
+from ._sdp import svec, smat
+import sys as _sys
+if _sys.version_info >= (3, 6):
+    from ._async import solve_async, solve_stream
 from . import examples
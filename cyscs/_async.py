@@ -0,0 +1,118 @@
+""" asyncio interface, running solves on an executor so the event loop is
+never blocked.
+
+Only imported on Python 3.6 and later.
+"""
+import asyncio
+import functools
+
+from . import _profile
+from ._scs import solve, CancelToken
+
+
+def _solve_recording(prof, *args, **kwargs):
+    # on the executor, record into the profile active where the solve was awaited
+    with _profile.recording(prof):
+        return solve(*args, **kwargs)
+
+
+async def solve_async(data, cone, warm_start=None, cancel=None, executor=None, **settings):
+    """ Solve a conic optimization problem without blocking the event loop.
+
+    `cyscs.solve()` runs on `executor`, by default the event loop's default
+    `ThreadPoolExecutor`. SCS releases the GIL, so solves run in parallel
+    with each other and with the event loop.
+
+    Parameters
+    ----------
+    data, cone, warm_start, cancel, **settings
+        As in `cyscs.solve()`.
+    executor : Optional[concurrent.futures.Executor]
+        Executor to run the solve on.
+
+    Returns
+    -------
+    dict
+        Solution dictionary, as in `cyscs.solve()`.
+
+    Cancelling the awaiting task cannot interrupt the C solver, which keeps
+    running on the executor. If a `cancel` token is given, it is cancelled
+    too, so the solve stops at its next check.
+    """
+    loop = asyncio.get_running_loop()
+    func = functools.partial(_solve_recording, _profile.active(), data, cone, warm_start,
+                             cancel=cancel, **settings)
+
+    try:
+        return await loop.run_in_executor(executor, func)
+    except asyncio.CancelledError:
+        if cancel is not None:
+            cancel.cancel()
+        raise
+
+
+async def solve_stream(problems, warm_starts=None, executor=None, cancel_on_close=True,
+                       **settings):
+    """ Solve a sequence of problems concurrently, yielding each solution as
+    soon as it is ready.
+
+    Parameters
+    ----------
+    problems : sequence of (dict, dict)
+        Sequence of `(data, cone)` pairs, each as described in `cyscs.solve()`.
+    warm_starts : Optional[sequence of dict]
+        Warm start dictionaries, one per problem. Entries may be `None`.
+    executor : Optional[concurrent.futures.Executor]
+        Executor to run the solves on, by default the event loop's default
+        `ThreadPoolExecutor`.
+    cancel_on_close : bool
+        If True, stop the running solves when the stream is closed early.
+    **settings
+        Settings applied to every problem, as in `cyscs.solve()`.
+
+    Yields
+    ------
+    (int, dict)
+        The index of the problem in `problems`, and its solution dictionary,
+        in order of completion.
+
+    When the stream is closed, the solves still queued on the executor
+    never start. With `cancel_on_close`, each solve gets its own
+    `CancelToken`, so running solves stop at their next check (every
+    `callback_stride` iterations) instead of finishing on the executor.
+    Solves with a token run in strides, which costs a little per stride;
+    pass `cancel_on_close=False` to avoid it when the stream is always read
+    to the end.
+    """
+    problems = list(problems)
+    if warm_starts is None:
+        warm_starts = [None]*len(problems)
+    else:
+        warm_starts = list(warm_starts)
+
+    if len(warm_starts) != len(problems):
+        raise ValueError("warm_starts must have one entry per problem.")
+
+    if cancel_on_close:
+        tokens = [CancelToken() for _ in problems]
+    else:
+        tokens = [None]*len(problems)
+
+    async def indexed(i, data, cone, warm_start):
+        sol = await solve_async(data, cone, warm_start, cancel=tokens[i],
+                                executor=executor, **settings)
+        return i, sol
+
+    tasks = [asyncio.ensure_future(indexed(i, data, cone, warm_start))
+             for i, ((data, cone), warm_start) in enumerate(zip(problems, warm_starts))]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # the C solves keep running on the executor after their tasks are
+        # cancelled, unless their tokens are cancelled too
+        for token, task in zip(tokens, tasks):
+            if token is not None:
+                token.cancel()
+            task.cancel()
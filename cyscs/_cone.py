@@ -0,0 +1,206 @@
+""" Immutable description of the cones of a problem.
+"""
+from collections import OrderedDict
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+import numpy as np
+
+
+# cone types, in the order of their rows in `A`
+CONE_KEYS = 'f', 'l', 'q', 's', 'ep', 'ed', 'p'
+
+
+_EMPTY = {}
+
+
+def _sizes(values, dtype, name):
+    if len(values) == 0:
+        # one shared empty array per dtype
+        if dtype not in _EMPTY:
+            _EMPTY[dtype] = _sizes([0], dtype, name)[:0]
+        return _EMPTY[dtype]
+
+    a = np.array(values, dtype=dtype, ndmin=1)
+    if a.ndim != 1:
+        raise ValueError("Cone sizes {} must be a 1D sequence.".format(name))
+    if a.dtype.kind == 'i' and np.any(a < 0):
+        raise ValueError("Cone sizes {} must be nonnegative.".format(name))
+    a.flags.writeable = False
+    return a
+
+
+class Cone(Mapping):
+    """ Immutable description of the sizes of the conic constraints.
+
+    A `Cone` can be passed anywhere a cone `dict` is accepted. It is checked,
+    converted, and laid out once: its arrays are read-only, its total length
+    and the offsets of each cone type are computed up front, and the C struct
+    SCS reads is built once per extension module and then reused, so solving
+    with the same `Cone` many times costs nothing per solve.
+
+    Parameters
+    ----------
+    f, l, ep, ed : int
+        Number of free, linear, primal exponential, and dual exponential
+        cones.
+    q, s : sequence of int
+        Lengths of the second-order cones, and sizes of the semidefinite cones.
+    p : sequence of float
+        Parameters of the power cones.
+
+    Like a `dict` from `format_and_copy_cone()`, the `Cone` maps only its
+    nontrivial keys to their values, with `q`, `s` as int64 arrays and `p`
+    as a float64 array.
+    """
+
+    __slots__ = '_items', '_size', '_offsets', '_bounds', '_c_cones', '_hash'
+
+    def __init__(self, f=0, l=0, q=(), s=(), ep=0, ed=0, p=()):
+        q = _sizes(q, np.int64, 'q')
+        s = _sizes(s, np.int64, 's')
+        p = _sizes(p, np.float64, 'p')
+
+        items = OrderedDict()
+        for key, value in zip(CONE_KEYS, (f, l, q, s, ep, ed, p)):
+            if np.ndim(value) == 0:
+                value = int(value)
+                if value < 0:
+                    raise ValueError("Cone size {} must be nonnegative.".format(key))
+                if value > 0:
+                    items[key] = value
+            elif len(value) > 0:
+                items[key] = value
+
+        lengths = [items.get('f', 0), items.get('l', 0), int(q.sum()),
+                   int((s*(s+1)//2).sum()), 3*items.get('ep', 0), 3*items.get('ed', 0),
+                   3*len(p)]
+
+        self._offsets = OrderedDict()
+        total = 0
+        for key, length in zip(CONE_KEYS, lengths):
+            self._offsets[key] = total
+            total += length
+
+        self._items = items
+        self._size = total
+        # row boundaries of the blocks of each cone type, computed when first used
+        self._bounds = {}
+        # Cython `Cone` of each extension module, built when first solved
+        self._c_cones = {}
+        self._hash = None
+
+    @property
+    def size(self):
+        """ Total length of the cones, i.e., the number of rows of `A`.
+        """
+        return self._size
+
+    @property
+    def offsets(self):
+        """ `dict` of the first row of each cone type, in the order `f`, `l`,
+        `q`, `s`, `ep`, `ed`, `p`.
+        """
+        return OrderedDict(self._offsets)
+
+    def block_rows(self, key):
+        """ Return a read-only int64 array `bounds` of the row boundaries of
+        the blocks of cone type `key`, so that block `i` is rows
+        `bounds[i]:bounds[i+1]` of `A`, `y`, and `s`.
+
+        The `f` and `l` cones are one block each, and every second-order,
+        semidefinite, exponential, and power cone is a separate block.
+        """
+        bounds = self._bounds.get(key)
+        if bounds is not None:
+            return bounds
+
+        if key not in self._offsets:
+            raise ValueError("Unknown cone type: {}".format(key))
+
+        if key in ('f', 'l'):
+            value = self._items.get(key, 0)
+            lengths = [value] if value else []
+        elif key in ('q', 's'):
+            value = self._items.get(key, _sizes((), np.int64, key))
+            lengths = value if key == 'q' else value*(value + 1)//2
+        else:
+            # exponential and power cones all have length 3
+            keys = list(self._offsets)
+            end = self._offsets[keys[keys.index(key) + 1]] if key != 'p' else self._size
+            lengths = np.full((end - self._offsets[key])//3, 3, dtype=np.int64)
+
+        bounds = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=bounds[1:])
+        bounds += self._offsets[key]
+        bounds.flags.writeable = False
+
+        self._bounds[key] = bounds
+        return bounds
+
+    def block(self, key, i=0):
+        """ Return the `slice` of the rows of block `i` of cone type `key`,
+        as numbered by `block_rows()`.
+        """
+        bounds = self.block_rows(key)
+        k = len(bounds) - 1
+        if not -k <= i < k:
+            raise IndexError("Cone {} has {} blocks.".format(key, k))
+
+        i %= k
+        return slice(int(bounds[i]), int(bounds[i+1]))
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _key(self):
+        return tuple((k, np.asarray(v).tolist()) for k, v in self._items.items())
+
+    def __eq__(self, other):
+        if not isinstance(other, Cone):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(repr(self._key()))
+        return self._hash
+
+    def __repr__(self):
+        return 'Cone({})'.format(', '.join('{}={}'.format(k, np.asarray(v).tolist())
+                                           for k, v in self._items.items()))
+
+    def __reduce__(self):
+        return as_cone, (dict(self._items),)
+
+    def _c_cone(self, cy):
+        """ Return the Cython `Cone` of extension module `cy`, pointing SCS
+        at this cone's arrays, converted to the module's dtypes.
+        """
+        c_cone = self._c_cones.get(cy)
+        if c_cone is None:
+            # built at most a few times if threads race; any of them can be kept
+            c_cone = self._c_cones.setdefault(cy, cy.Cone(self))
+        return c_cone
+
+
+def as_cone(cone):
+    """ Return `cone` if it is a `Cone`, and otherwise a new `Cone` from the
+    keys of the cone `dict`. Other keys are ignored.
+    """
+    if isinstance(cone, Cone):
+        return cone
+
+    return Cone(**{key: cone[key] for key in CONE_KEYS if key in cone})
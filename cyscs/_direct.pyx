@@ -1 +1,2 @@
-include "scs.pxi"
\ No newline at end of file
+include "scs.pxi"
+include "factor.pxi"
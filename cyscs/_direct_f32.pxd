@@ -0,0 +1,6 @@
+# compiled with DLONG and FLOAT: 64-bit integers, single-precision floats
+cdef extern from "glbopts.h":
+    ctypedef float scs_float
+    ctypedef long scs_int
+
+include "scsd.pxi"
\ No newline at end of file
@@ -0,0 +1,6 @@
+# compiled with FLOAT: 32-bit integers, single-precision floats
+cdef extern from "glbopts.h":
+    ctypedef float scs_float
+    ctypedef int scs_int
+
+include "scsd.pxi"
\ No newline at end of file
@@ -0,0 +1,2 @@
+include "scs.pxi"
+include "factor.pxi"
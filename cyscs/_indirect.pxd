@@ -1 +1,6 @@
+# compiled with DLONG: 64-bit integers
+cdef extern from "glbopts.h":
+    ctypedef double scs_float
+    ctypedef long scs_int
+
 include "scsd.pxi"
\ No newline at end of file
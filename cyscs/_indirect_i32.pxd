@@ -0,0 +1,6 @@
+# compiled without DLONG: 32-bit integers
+cdef extern from "glbopts.h":
+    ctypedef double scs_float
+    ctypedef int scs_int
+
+include "scsd.pxi"
\ No newline at end of file
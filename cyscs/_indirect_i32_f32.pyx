@@ -0,0 +1 @@
+include "scs.pxi"
\ No newline at end of file
@@ -0,0 +1,293 @@
+""" Presolve: shrinking a problem before the SCS setup, and mapping its
+solution back to the original problem.
+
+The reductions only depend on `A` and the cone, so a `Workspace` computes
+them once, and then applies them to each new `b` and `c`:
+- duplicate rows of the `f` and `l` cones are removed, keeping one row of
+  each group (for `l` rows, with the smallest `b`)
+- `f` rows with a single nonzero fix their variable, which is substituted
+  into the other rows
+- `f` and `l` rows left without nonzeros are removed, after checking that
+  `b` satisfies them
+- columns without nonzeros are removed, with their variable set to zero
+
+When these checks show that the problem is infeasible or unbounded, the
+solve is skipped, and a certificate is returned, as SCS would.
+Reductions are applied in a single pass, in this order.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+from ._cone import Cone
+
+
+# SCS status values of infeasibility and unboundedness certificates
+INFEASIBLE = -2, -7
+UNBOUNDED = -1, -6
+
+
+def _ranges(starts, lengths):
+    """ Concatenation of `arange(start, start + length)` for each pair.
+    """
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def _duplicate_rows(row, col, val, rows, n):
+    """ Return arrays `dup`, `rep` of the rows among `rows` that are equal
+    to an earlier row `rep`, for the nonzeros `row`, `col`, `val` of `A`.
+    """
+    if len(rows) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    m = rows.max() + 1
+    mask = np.zeros(m, dtype=bool)
+    mask[rows] = True
+    sel = (row < m) & mask[np.minimum(row, m - 1)]
+    R = sp.csr_matrix((val[sel], (row[sel], col[sel])), shape=(m, n))
+    R.sum_duplicates()
+    lengths = np.diff(R.indptr)
+
+    # rows with equal hashes are candidates, since equal rows are summed
+    # in the same order
+    rng = np.random.RandomState(0)
+    hashes = [R.dot(rng.rand(n)) for _ in range(2)]
+    keys = np.column_stack([lengths[rows]] + [h[rows] for h in hashes])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    rep = rows[first][inverse.ravel()]
+    dup = rep != rows
+    dup, rep = rows[dup], rep[dup]
+
+    # check candidates entry by entry
+    pos_d = _ranges(R.indptr[dup], lengths[dup])
+    pos_r = _ranges(R.indptr[rep], lengths[dup])
+    same = (R.indices[pos_d] == R.indices[pos_r]) & (R.data[pos_d] == R.data[pos_r])
+    ok = np.ones(len(dup), dtype=bool)
+    nonempty = lengths[dup] > 0
+    if same.size:
+        starts = np.cumsum(lengths[dup]) - lengths[dup]
+        ok[nonempty] = np.logical_and.reduceat(same, starts[nonempty])
+
+    return dup[ok], rep[ok]
+
+
+class Presolve(object):
+    """ Reductions of a problem with CSC matrix `A` and `Cone` `cone`.
+
+    Attributes
+    ----------
+    rows, cols : numpy.ndarray
+        Rows and columns of `A` kept in the reduced problem.
+    A, cone
+        Matrix and `Cone` of the reduced problem.
+    trivial : bool
+        True if nothing is removed, or if the reduced problem would be empty,
+        in which case the problem should be solved as is.
+    """
+
+    def __init__(self, A, cone, int_dtype=np.int64, tol=1e-9):
+        m, n = A.shape
+        f, l = cone.get('f', 0), cone.get('l', 0)
+        self.tol = tol
+
+        cols = np.repeat(np.arange(n), np.diff(A.indptr))
+        nz = A.data != 0
+        row = A.indices[nz].astype(np.int64)
+        col, val = cols[nz], A.data[nz]
+        row_nnz = np.bincount(row, minlength=m)
+
+        # duplicate nonempty rows, within the f rows and within the l rows
+        dups = [_duplicate_rows(row, col, val, rows[row_nnz[rows] > 0], n)
+                for rows in (np.arange(f), np.arange(f, f + l))]
+        (self._dup_f, self._rep_f), (self._dup_l, self._rep_l) = dups
+
+        dropped = np.zeros(m, dtype=bool)
+        dropped[self._dup_f] = True
+        dropped[self._dup_l] = True
+
+        # f rows with a single nonzero fix its variable, once per variable
+        single = np.zeros(m, dtype=bool)
+        single[:f] = (row_nnz[:f] == 1) & ~dropped[:f]
+        entries = single[row]
+        _, first = np.unique(col[entries], return_index=True)
+        self._fix_row = row[entries][first]
+        self._fix_col = col[entries][first]
+        self._fix_val = val[entries][first]
+
+        fixed_col = np.zeros(n, dtype=bool)
+        fixed_col[self._fix_col] = True
+        fixed_row = np.zeros(m, dtype=bool)
+        fixed_row[self._fix_row] = True
+
+        # f and l rows without nonzeros in the other variables
+        free_nnz = np.bincount(row[~fixed_col[col]], minlength=m)
+        empty = (free_nnz[:f + l] == 0) & ~dropped[:f + l] & ~fixed_row[:f + l]
+        self._empty_f = np.flatnonzero(empty[:f])
+        self._empty_l = f + np.flatnonzero(empty[f:])
+
+        self._empty_cols = np.flatnonzero((np.bincount(col, minlength=n) == 0) & ~fixed_col)
+
+        removed = dropped | fixed_row
+        removed[self._empty_f] = True
+        removed[self._empty_l] = True
+        removed_cols = fixed_col.copy()
+        removed_cols[self._empty_cols] = True
+
+        self.rows = np.flatnonzero(~removed)
+        self.cols = np.flatnonzero(~removed_cols)
+        self.shape = m, n
+        self.trivial = (len(self.rows) == m and len(self.cols) == n
+                        or len(self.rows) == 0 or len(self.cols) == 0)
+        if self.trivial:
+            return
+
+        self._AJ = A[:, self._fix_col]
+
+        A = A[self.rows][:, self.cols]
+        A.indices = A.indices.astype(int_dtype)
+        A.indptr = A.indptr.astype(int_dtype)
+        self.A = A
+
+        sizes = dict(cone)
+        sizes.update(f=int(np.sum(self.rows < f)),
+                     l=int(np.sum((self.rows >= f) & (self.rows < f + l))))
+        self.cone = Cone(**sizes)
+
+    def reduce(self, b, c):
+        """ Return the `b` and `c` of the reduced problem, and the state
+        `postsolve()` and `certificate()` need.
+        """
+        # each group of duplicate l rows keeps its smallest b
+        b1 = np.array(b, dtype=np.float64)
+        np.minimum.at(b1, self._rep_l, b[self._dup_l])
+
+        x_fixed = b1[self._fix_row]/self._fix_val
+        b2 = b1 - self._AJ.dot(x_fixed)
+
+        state = dict(b=b, c=c, b1=b1, b2=b2, x_fixed=x_fixed)
+        return b2[self.rows], c[self.cols], state
+
+    def certificate(self, state, sol):
+        """ If the reductions show that the problem is infeasible or
+        unbounded, write a certificate to `sol` (with arrays `x`, `y`, `s`)
+        and return its `(status, statusVal)`. Otherwise, return `None`.
+        """
+        b, c, b1, b2 = state['b'], state['c'], state['b1'], state['b2']
+        x, y, s = sol['x'], sol['y'], sol['s']
+
+        def tol(v):
+            return self.tol*(1 + np.abs(v))
+
+        # rows y with b'y = -1 and A'y = 0
+        seed = None
+        gap = b[self._rep_f] - b[self._dup_f]
+        bad = np.flatnonzero(np.abs(gap) > tol(b[self._dup_f]))
+        if len(bad):
+            i = bad[0]
+            seed = [self._rep_f[i], self._dup_f[i]], [-1/gap[i], 1/gap[i]]
+
+        bad = np.abs(b2[self._empty_f]) > tol(b1[self._empty_f])
+        if seed is None and np.any(bad):
+            i = self._empty_f[np.argmax(bad)]
+            seed = [i], [-1/b2[i]]
+
+        bad = b2[self._empty_l] < -tol(b1[self._empty_l])
+        if seed is None and np.any(bad):
+            i = self._empty_l[np.argmax(bad)]
+            seed = [self._argmin(b, b1, [i])[0]], [-1/b2[i]]
+
+        if seed is not None:
+            y.fill(0)
+            y[seed[0]] = seed[1]
+            y[self._fix_row] = -self._AJ.T.dot(y)/self._fix_val
+            x.fill(np.nan)
+            s.fill(np.nan)
+            return 'Infeasible', INFEASIBLE[0]
+
+        # x with Ax = 0 and c'x = -1
+        bad = np.flatnonzero(c[self._empty_cols] != 0)
+        if len(bad):
+            j = self._empty_cols[bad[0]]
+            x.fill(0)
+            x[j] = -1/c[j]
+            s.fill(0)
+            y.fill(np.nan)
+            return 'Unbounded', UNBOUNDED[0]
+
+        return None
+
+    def _argmin(self, b, b1, reps):
+        """ Return, for each of the l rows `reps` kept from groups of
+        duplicates, the row of the group with the smallest `b`.
+        """
+        reps = np.asarray(reps, dtype=np.int64)
+        out = reps.copy()
+
+        # duplicates with the smallest b, for groups where it is not reps
+        low = self._dup_l[b[self._dup_l] == b1[self._rep_l]]
+        low_rep = self._rep_l[b[self._dup_l] == b1[self._rep_l]]
+        _, first = np.unique(low_rep, return_index=True)
+        best = np.full(self.shape[0], -1, dtype=np.int64)
+        best[low_rep[first]] = low[first]
+
+        moved = (b[reps] != b1[reps]) & (best[reps] >= 0)
+        out[moved] = best[reps[moved]]
+        return out
+
+    def postsolve(self, red, state, status_val, sol):
+        """ Write the solution of the original problem to `sol`, from the
+        solution `red` of the reduced problem.
+        """
+        b, c, b1, b2 = state['b'], state['c'], state['b1'], state['b2']
+        x, y, s = sol['x'], sol['y'], sol['s']
+        infeasible = status_val in INFEASIBLE
+        unbounded = status_val in UNBOUNDED
+
+        x.fill(0)
+        x[self.cols] = red['x']
+        x[self._fix_col] = 0 if unbounded else state['x_fixed']
+
+        s.fill(0)
+        s[self.rows] = red['s']
+        if not unbounded:
+            s[self._empty_l] = np.maximum(b2[self._empty_l], 0)
+
+        # the slack of l rows is shifted from the smallest b of their group,
+        # and duplicate f rows are tight
+        rep, dup = self._rep_l, self._dup_l
+        reps = np.unique(rep)
+        if unbounded:
+            s[dup] = s[rep]
+        else:
+            s[dup] = s[rep] + b[dup] - b1[rep]
+            s[reps] += b[reps] - b1[reps]
+
+        y.fill(0)
+        y[self.rows] = red['y']
+
+        # the multiplier of each group of l rows goes to its smallest b
+        values = y[reps]
+        y[reps] = 0
+        y[self._argmin(b, b1, reps)] = values
+
+        # dual constraint A'y + c = 0 of each fixed variable
+        cJ = 0 if infeasible else c[self._fix_col]
+        y[self._fix_row] = -(cJ + self._AJ.T.dot(y))/self._fix_val
+
+        if infeasible:
+            x.fill(np.nan)
+            s.fill(np.nan)
+        if unbounded:
+            y.fill(np.nan)
+
+    def objective(self, state):
+        """ Constant added to the objective by the fixed variables.
+        """
+        return float(np.dot(state['c'][self._fix_col], state['x_fixed']))
+
+    def reduce_warm_start(self, warm_start):
+        """ Return the entries of a warm start for the reduced problem.
+        """
+        return dict(x=np.asarray(warm_start['x'])[self.cols],
+                    y=np.asarray(warm_start['y'])[self.rows],
+                    s=np.asarray(warm_start['s'])[self.rows])
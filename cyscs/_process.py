@@ -0,0 +1,253 @@
+""" Process-pool solver, moving problem data through shared memory.
+
+`ProcessSolver` keeps a pool of long-lived worker processes. For each solve,
+the parent copies `A`, `b`, `c` (and any warm start) into one
+`multiprocessing.shared_memory` block, and allocates a second block for the
+solution. Only the block names, array layouts, cone, and settings are
+pickled and sent to the worker, which checks the data, solves, and writes
+`x`, `y`, `s` straight into the solution block.
+
+Each worker keeps a small LRU cache of `Workspace` objects, keyed by a hash
+of `A`, the cone, and the fixed settings, so repeated solves of the same
+problem with new `b` and `c` skip the SCS setup (and the factorization).
+"""
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from ._cone import as_cone
+from ._scs import Workspace, Solution
+from ._util import default_settings, fingerprint
+
+
+# `Workspace` cache of each worker process, set by `_init_worker()`
+_cache = None
+_cache_size = 0
+
+
+def _pack(arrays):
+    """ Copy a dict of numpy arrays into a new shared memory block.
+
+    Returns the block and the layout of the arrays in it, a list of
+    `(key, dtype, offset, size)`, with each array aligned to 64 bytes.
+    """
+    from multiprocessing import shared_memory
+
+    layout, offset = [], 0
+    for key, a in arrays.items():
+        layout.append((key, a.dtype.str, offset, a.size))
+        offset += -(-a.nbytes // 64)*64
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (key, dtype, offset, size) in layout:
+        view = np.ndarray(size, dtype=dtype, buffer=shm.buf, offset=offset)
+        view[:] = arrays[key]
+        del view
+
+    return shm, layout
+
+
+def _unpack(shm, layout):
+    """ Return a dict of numpy arrays viewing the shared memory block.
+
+    The arrays must be deleted before the block is closed.
+    """
+    return {key: np.ndarray(size, dtype=dtype, buffer=shm.buf, offset=offset)
+            for (key, dtype, offset, size) in layout}
+
+
+def _attach(name):
+    """ Attach to an existing shared memory block created by the parent.
+    """
+    from multiprocessing import shared_memory
+
+    # workers share the parent's resource tracker, so attaching registers
+    # the block again harmlessly, and the parent's `unlink()` unregisters it
+    return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(cache_size):
+    global _cache, _cache_size
+    _cache = OrderedDict()
+    _cache_size = cache_size
+
+
+def _workspace(arrays, shape, cone, settings):
+    """ Return a cached `Workspace` for `A`, the cone, and the fixed settings,
+    creating it (and evicting the least recently used one) if needed.
+    """
+    # assign the arrays directly, so scipy does not copy or convert them
+    A = sp.csc_matrix(shape, dtype=arrays['A_data'].dtype)
+    A.data, A.indices, A.indptr = arrays['A_data'], arrays['A_indices'], arrays['A_indptr']
+
+    fixed = [(k, str(settings[k])) for k in Workspace._fixed_keys]
+    key = fingerprint(A, cone, values=True), repr(fixed)
+
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    # copy A out of shared memory, since the Workspace may keep it
+    A.data, A.indices, A.indptr = A.data.copy(), A.indices.copy(), A.indptr.copy()
+
+    data = dict(A=A, b=arrays['b'].copy(), c=arrays['c'].copy())
+    work = Workspace(data, cone, **settings)
+
+    _cache[key] = work
+    while len(_cache) > _cache_size:
+        _cache.popitem(last=False)
+
+    return work
+
+
+def _solve_views(arrays, out, shape, cone, settings):
+    """ Solve the problem in the `arrays` views, writing the solution into
+    the `out` views. Returns the solver info.
+    """
+    work = _workspace(arrays, shape, cone, settings)
+
+    warm_start = None
+    if 'x' in arrays:
+        warm_start = {key: arrays[key] for key in ('x', 'y', 's')}
+
+    stg = {k: v for k, v in settings.items() if k not in Workspace._fixed_keys}
+    new_bc = dict(b=arrays['b'].copy(), c=arrays['c'].copy())
+
+    return work.solve(new_bc, warm_start, out=out, **stg)['info']
+
+
+def _solve_shared(in_name, in_layout, out_name, out_layout, shape, cone, settings):
+    """ Worker task: solve the problem in the input block, writing the
+    solution into the output block. Returns the solver info.
+    """
+    shm_in, shm_out = _attach(in_name), _attach(out_name)
+    try:
+        return _solve_views(_unpack(shm_in, in_layout), _unpack(shm_out, out_layout),
+                            shape, cone, settings)
+    finally:
+        for shm in shm_in, shm_out:
+            try:
+                shm.close()
+            except BufferError:
+                # the views are still held by an exception traceback, and
+                # the block is unmapped once they are freed
+                pass
+
+
+class ProcessSolver(object):
+    """ Solve problems on a pool of long-lived worker processes.
+
+    Problem data and solutions move between processes through shared memory,
+    instead of being pickled. Checking the data, setup, and the solve all
+    happen in the workers, so they are not limited by the parent's GIL.
+    Each worker caches up to `cache_size` `Workspace` objects, so solving
+    the same `A` again with new `b` and `c` reuses its factorization, if
+    the problem is sent to a worker which has seen it.
+
+    Parameters
+    ----------
+    workers : Optional[int]
+        Number of worker processes. Defaults to the number of CPUs.
+    cache_size : int
+        Number of `Workspace` objects cached by each worker.
+
+    Use as a context manager, or call `close()`, to stop the workers.
+    """
+
+    def __init__(self, workers=None, cache_size=4):
+        self._pool = ProcessPoolExecutor(max_workers=workers,
+                                         initializer=_init_worker,
+                                         initargs=(cache_size,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """ Shut down the worker processes.
+        """
+        self._pool.shutdown()
+
+    def solve(self, data, cone, warm_start=None, **settings):
+        """ Solve a conic optimization problem on a worker process.
+
+        Parameters and return value are as in `cyscs.solve()`.
+        The `callback` setting is not supported.
+        """
+        return self.solve_many([(data, cone)], [warm_start], **settings)[0]
+
+    def solve_many(self, problems, warm_starts=None, **settings):
+        """ Solve a sequence of problems, spread over the worker processes.
+
+        Parameters and return value are as in `cyscs.solve_many()`.
+        The `callback` setting is not supported.
+        """
+        stg = default_settings()
+        stg.update(settings)
+
+        if stg['callback'] is not None:
+            raise ValueError("The callback setting is not supported by ProcessSolver.")
+
+        problems = list(problems)
+        if warm_starts is None:
+            warm_starts = [None]*len(problems)
+        else:
+            warm_starts = list(warm_starts)
+
+        if len(warm_starts) != len(problems):
+            raise ValueError("warm_starts must have one entry per problem.")
+
+        float_dtype = np.dtype(stg['dtype'])
+        blocks, outs, futures = [], [], []
+        try:
+            for (data, cone), warm_start in zip(problems, warm_starts):
+                A = data['A']
+                if not sp.isspmatrix_csc(A):
+                    A = sp.csc_matrix(A)
+                m, n = A.shape
+
+                arrays = dict(A_data=A.data, A_indices=A.indices, A_indptr=A.indptr,
+                              b=np.asarray(data['b']), c=np.asarray(data['c']))
+                if warm_start is not None:
+                    arrays.update((key, np.asarray(warm_start[key], dtype=float_dtype))
+                                  for key in ('x', 'y', 's'))
+
+                shm_in, in_layout = _pack(arrays)
+                blocks.append(shm_in)
+
+                zeros = dict(x=np.zeros(n, float_dtype), y=np.zeros(m, float_dtype),
+                             s=np.zeros(m, float_dtype))
+                shm_out, out_layout = _pack(zeros)
+                blocks.append(shm_out)
+                cone = as_cone(cone)
+                outs.append((shm_out, out_layout, cone))
+
+                futures.append(self._pool.submit(_solve_shared, shm_in.name, in_layout,
+                                                 shm_out.name, out_layout, (m, n),
+                                                 dict(cone), stg))
+
+            sols = []
+            for future, (shm_out, out_layout, cone) in zip(futures, outs):
+                info = future.result()
+
+                # copy the solution out of shared memory before unlinking it
+                sol = Solution(cone, ((key, a.copy()) for key, a
+                                      in _unpack(shm_out, out_layout).items()))
+                sol['info'] = info
+                sols.append(sol)
+        finally:
+            # wait for any remaining tasks, so no worker still uses the blocks
+            for future in futures:
+                future.cancel()
+                if not future.cancelled():
+                    future.exception()
+
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+        return sols
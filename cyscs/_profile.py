@@ -0,0 +1,179 @@
+""" Opt-in timing of the phases of a solve, in the Python, Cython and C layers.
+
+Instrumented code calls `laps()` on entry, and `lap(phase)` after each
+phase. Unless a `profile()` is active on the calling thread, `laps()`
+returns a recorder which does nothing, so the cost when not profiling is a
+thread-local lookup and a no-op call per phase. Otherwise it returns a
+`_Laps` recorder, and each call `lap(phase)` adds the time since the
+previous lap to that phase of the active `Profile`.
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from timeit import default_timer as timer
+
+
+# phases spent in the C solver; all others are wrapper overhead
+SOLVER_PHASES = 'scs', 'scs_init', 'scs_solve'
+
+# breakdown of the solver phases, as reported by SCS in `Info`
+C_PHASES = 'c_setup', 'c_solve'
+
+# the active Profile of each thread
+_local = threading.local()
+# worker threads may record into the same Profile
+_lock = threading.Lock()
+
+
+class Profile(object):
+    """ Wall time spent in each phase of the solves run inside `cyscs.profile()`.
+
+    Attributes
+    ----------
+    timings : OrderedDict
+        Total seconds spent in each phase, in order of first appearance.
+    counts : OrderedDict
+        Number of times each phase ran.
+
+    Wrapper phases are named after the Python or Cython functions they time,
+    such as `check_data`, `as_cone` or `stuff_c_data`. The C
+    solver phases are `scs` (the whole `scs()` call of `cyscs.solve()`),
+    `scs_init` (`Workspace` setup), and `scs_solve` (`Workspace.solve()`).
+    `c_setup` and `c_solve` are the setup and solve times SCS reports in
+    `Info`, which are included in the solver phases.
+    """
+
+    def __init__(self):
+        self.timings = OrderedDict()
+        self.counts = OrderedDict()
+
+    def add(self, phase, seconds):
+        with _lock:
+            self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    @property
+    def solver(self):
+        """ Total seconds spent in the C solver.
+        """
+        return sum(t for phase, t in self.timings.items() if phase in SOLVER_PHASES)
+
+    @property
+    def wrapper(self):
+        """ Total seconds spent in the Python and Cython wrapper.
+        """
+        return sum(t for phase, t in self.timings.items()
+                   if phase not in SOLVER_PHASES and phase not in C_PHASES)
+
+    def report(self):
+        """ Return a table of the phases, by decreasing time.
+        """
+        lines = ['{:<22} {:>7} {:>12} {:>12}'.format('phase', 'calls', 'total (s)', 'mean (s)')]
+        for phase, t in sorted(self.timings.items(), key=lambda item: -item[1]):
+            n = self.counts[phase]
+            lines.append('{:<22} {:>7} {:>12.6f} {:>12.3e}'.format(phase, n, t, t/n))
+
+        lines.append('wrapper {:.6f} s, solver {:.6f} s'.format(self.wrapper, self.solver))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return 'Profile(wrapper={:.6f}, solver={:.6f})'.format(self.wrapper, self.solver)
+
+
+class _Laps(object):
+    """ Records consecutive phases of one call into a `Profile`.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.last = timer()
+
+    def __call__(self, phase):
+        """ Add the time since the previous lap to `phase`.
+        """
+        now = timer()
+        self.profile.add(phase, now - self.last)
+        self.last = now
+
+    def reset(self):
+        """ Start the next lap now, without recording the time since the
+        previous one, e.g. when it was recorded by the Cython layer.
+        """
+        self.last = timer()
+
+    def times(self, setup=None, solve=None):
+        """ Add the setup and solve times in milliseconds reported by SCS.
+        """
+        if setup is not None:
+            self.profile.add('c_setup', setup/1e3)
+        if solve is not None:
+            self.profile.add('c_solve', solve/1e3)
+
+
+class _NoLaps(object):
+    """ Recorder used outside a profile, which records nothing.
+    """
+
+    def __call__(self, phase):
+        pass
+
+    def reset(self):
+        pass
+
+    def times(self, setup=None, solve=None):
+        pass
+
+
+_NO_LAPS = _NoLaps()
+
+
+def active():
+    """ Return the active `Profile` of the calling thread, or `None`.
+    """
+    return getattr(_local, 'profile', None)
+
+
+def laps():
+    """ Return a `_Laps` recorder for the active profile of the calling
+    thread, or a recorder which does nothing.
+    """
+    profile = getattr(_local, 'profile', None)
+    return _NO_LAPS if profile is None else _Laps(profile)
+
+
+@contextmanager
+def recording(prof):
+    """ Context manager making `prof` the active profile of the calling
+    thread, e.g. on a worker thread running solves for a caller inside
+    `profile()`. If `prof` is `None`, nothing is recorded.
+    """
+    previous = getattr(_local, 'profile', None)
+    _local.profile = prof
+    try:
+        yield prof
+    finally:
+        _local.profile = previous
+
+
+@contextmanager
+def profile():
+    """ Context manager timing each phase of the solves run inside it.
+
+    Yields a `Profile`, whose `timings` give the seconds spent in each phase
+    of the Python and Cython wrapper and of the C solver. Only solves started
+    on the calling thread are recorded, including those which
+    `cyscs.solve_many()` and `cyscs.solve_async()` run on worker threads,
+    but not solves run by other threads.
+
+    ```
+    with cyscs.profile() as prof:
+        for _ in range(1000):
+            cyscs.solve(data, cone, verbose=False)
+
+    print(prof.report())
+    ```
+
+    Profiles can be nested; the innermost one records the solves.
+    """
+    with recording(Profile()) as prof:
+        yield prof
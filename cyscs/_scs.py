@@ -21,17 +21,314 @@ a nice user interface, and checks for data correctness.
 The hope is to keep as much of this logic in the Python level as possible,
 for easy maintenance.
 """
+import abc
 import pkg_resources
+import importlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 import numpy as np
+import scipy.sparse as sp
 
 from ._direct import version as scs_version
 
 import cyscs._direct
 import cyscs._indirect
 
+
+class SolveInfo(abc.ABCMeta('_ABC', (object,), {})):
+    """ Solver exit information, as returned in `sol['info']`.
+
+    Each extension module has its own `SolveInfo` type, wrapping its C `Info`
+    struct; they are all registered as subclasses of this class.
+    Fields are read as attributes (`info.status`) or as keys (`info['status']`),
+    and `info.to_dict()` returns a plain `dict`.
+    """
+
+    @staticmethod
+    def to_numpy(infos):
+        """ Pack a sequence of `SolveInfo` objects, from solves with the same
+        dtypes, into a structured numpy array with one field per info field.
+        """
+        infos = list(infos)
+        if not infos:
+            return np.zeros(0, dtype=info_dtype())
+
+        return type(infos[0]).to_numpy(infos)
+
+
+def _find_extensions():
+    """ Return a dict of the available extension modules, keyed by
+    (use_indirect, C integer dtype, C float dtype).
+    """
+    variants = [('', np.int64, np.float64), ('_i32', np.int32, np.float64),
+                ('_f32', np.int64, np.float32), ('_i32_f32', np.int32, np.float32)]
+
+    extensions = {}
+    for suffix, int_dtype, float_dtype in variants:
+        for use_indirect, name in (False, '_direct'), (True, '_indirect'):
+            try:
+                module = importlib.import_module('cyscs.' + name + suffix)
+            except ImportError:
+                # optional modules, only built with `setup.py --int32` or `--float32`
+                continue
+            key = use_indirect, np.dtype(int_dtype), np.dtype(float_dtype)
+            extensions[key] = module
+            SolveInfo.register(module.SolveInfo)
+
+    return extensions
+
 from ._util import (default_settings, format_and_copy_cone,
-                  cone_len, not_met, check_data, check_xys, check_bc)
+                  cone_len, not_met, check_data, check_xys, check_bc,
+                  check_bc_batch, info_dtype, fingerprint, STATUS_CANCELLED,
+                  STATUS_TIME_LIMIT)
+from ._cone import Cone, as_cone
+from ._presolve import Presolve, INFEASIBLE, UNBOUNDED
+from . import _sdp
+from . import _profile
+
+_extensions = _find_extensions()
+
+
+def _index_dtype(data, float_dtype):
+    """ Return the integer dtype of the extension module to use for `data['A']`.
+
+    32-bit integers are only used if `A` is a CSC matrix which already
+    has int32 indices, and the 32-bit extension modules are available,
+    so that `A` can be passed to C without conversion.
+    """
+    A = data.get('A')
+    int32 = np.dtype(np.int32)
+
+    if ((False, int32, float_dtype) in _extensions and sp.isspmatrix_csc(A)
+            and A.indices.dtype == int32 and A.indptr.dtype == int32):
+        return int32
+
+    return np.dtype(np.int64)
+
+
+def _extension(use_indirect, int_dtype, float_dtype):
+    """ Return the extension module for the given solver type and C dtypes.
+    """
+    key = bool(use_indirect), int_dtype, float_dtype
+    if key not in _extensions:
+        msg = "cyscs was not built with support for dtype = numpy.{}. Build with `setup.py --float32`."
+        raise ValueError(msg.format(float_dtype.name))
+
+    return _extensions[key]
+
+
+def _private_A(A, A_in, normalize, cy):
+    """ Return `A`, with its values copied if SCS would otherwise normalize
+    the values of the caller's matrix `A_in` in place.
+
+    Extension modules built without COPYAMATRIX normalize the values of `A`
+    in place, but never modify its indices. So at most one copy of `A.data`
+    is made, and only if `check_data()` has not already made one.
+    """
+    if cy.COPY_A or not normalize or not np.may_share_memory(A.data, A_in.data):
+        return A
+
+    # shallow copy of the matrix, sharing the index arrays
+    A = sp.csc_matrix(A)
+    A.data = A.data.copy()
+
+    return A
+
+
+class Solution(dict):
+    """ Solution dictionary, with keys `x`, `y`, `s`, and `info`, as returned
+    by `cyscs.solve()` and `Workspace.solve()`.
+
+    It also holds the `Cone` of the problem, as `sol.cone`, so that the dual
+    and slack variables of each cone block can be sliced out with `block()`.
+    """
+
+    def __init__(self, cone, *args, **kwargs):
+        super(Solution, self).__init__(*args, **kwargs)
+        self.cone = cone
+
+    def block(self, key, i=0):
+        """ Return a `dict` of views of the entries of `y` and `s` in block `i`
+        of cone type `key`, e.g., `sol.block('q', 17)` for the 18th
+        second-order cone. See `Cone.block_rows()` for the numbering.
+
+        For `Workspace.solve_batch()` solutions, the views have one row per
+        problem.
+        """
+        rows = self.cone.block(key, i)
+        return dict(y=self['y'][..., rows], s=self['s'][..., rows])
+
+    def smat(self, key='y'):
+        """ Return the list of symmetric matrices of the semidefinite cones
+        in `y` or `s`, as unpacked by `cyscs.smat()`.
+        """
+        bounds = self.cone.block_rows('s')
+        return _sdp.smat(self[key][..., bounds[0]:bounds[-1]], self.cone.get('s', []))
+
+
+def _check_saved_A(A_p, A_i, A_x, m, n):
+    """ Raise a `ValueError` unless `A_p`, `A_i`, `A_x` from a saved
+    `Workspace` form a valid `m` by `n` CSC matrix: SCS indexes arrays with
+    them without checking.
+    """
+    if len(A_p) != n + 1 or len(A_i) != len(A_x):
+        raise ValueError("Saved A does not match the problem size.")
+    if A_p[0] != 0 or np.any(np.diff(A_p) < 0) or A_p[-1] != len(A_i):
+        raise ValueError("Saved A_p is not nondecreasing from 0 to the size of A.")
+    if len(A_i) and (A_i.min() < 0 or A_i.max() >= m):
+        raise ValueError("Saved A_i has row indices out of range.")
+
+
+def _make_sol(m, n, float_dtype, warm_start=None, out=None, cone=None):
+    """ Return a `Solution` of `x`, `y`, `s` arrays for SCS to write the solution into.
+
+    New arrays are allocated, unless caller-owned buffers are given in `out`.
+    Warm-start values are copied into the arrays, unless `warm_start` already
+    holds the same arrays as `out`. Otherwise, `out` buffers are zeroed.
+    """
+    if out is None:
+        sol = Solution(cone, x=np.zeros(n, dtype=float_dtype),
+                       y=np.zeros(m, dtype=float_dtype), s=np.zeros(m, dtype=float_dtype))
+    else:
+        sol = Solution(cone, ((key, out[key]) for key in ('x', 'y', 's')))
+        check_xys(sol['x'], sol['y'], sol['s'], m, n, float_dtype)
+
+        if not all(sol[key].flags.c_contiguous and sol[key].flags.writeable
+                   for key in sol):
+            raise ValueError("out arrays x, y, s must be contiguous and writeable.")
+
+        if not warm_start:
+            for key in sol:
+                sol[key].fill(0)
+
+    # copy (and do not modify) warm-start vectors
+    if warm_start:
+        for key in 'x', 'y', 's':
+            if warm_start[key] is not sol[key]:
+                sol[key][:] = warm_start[key]
+
+    return sol
+
+
+def _presolve(A, cone, int_dtype):
+    """ Return the `Presolve` of `A` and `cone`, or `None` if it removes
+    nothing and the problem should be solved as is.
+    """
+    presolve = Presolve(A, cone, int_dtype)
+    return None if presolve.trivial else presolve
+
+
+def _certificate_info(cy, status, status_val):
+    """ Return the `SolveInfo` of a certificate found by presolve, without
+    running SCS.
+    """
+    infeasible = status_val in INFEASIBLE
+    obj = np.inf if infeasible else -np.inf
+    return cy._info_from_dict(dict(iter=0, status=status, statusVal=status_val,
+                                   pobj=obj, dobj=obj, resPri=np.nan, resDual=np.nan,
+                                   resInfeas=0.0 if infeasible else np.nan,
+                                   resUnbdd=np.nan if infeasible else 0.0,
+                                   relGap=np.nan, setupTime=0.0, solveTime=0.0))
+
+
+def _solve_presolved(presolve, cy, b, c, sol, warm_start, float_dtype, solve_reduced):
+    """ Solve the problem reduced by `presolve`, and write the solution of
+    the original problem to `sol`. Return the `SolveInfo`.
+
+    `solve_reduced(b, c, red)` must solve the reduced problem with the given
+    `b` and `c`, writing its solution to the `Solution` `red`, and return
+    its `SolveInfo`.
+    """
+    b, c, state = presolve.reduce(b, c)
+    status = presolve.certificate(state, sol)
+    if status is not None:
+        return _certificate_info(cy, *status)
+
+    if warm_start:
+        warm_start = presolve.reduce_warm_start(warm_start)
+    red = _make_sol(len(presolve.rows), len(presolve.cols), float_dtype,
+                    warm_start, cone=presolve.cone)
+
+    info = solve_reduced(b.astype(float_dtype), c, red)
+    presolve.postsolve(red, state, info['statusVal'], sol)
+
+    if info['statusVal'] in INFEASIBLE + UNBOUNDED:
+        return info
+    shift = presolve.objective(state)
+    return info._replace(pobj=info['pobj'] + shift, dobj=info['dobj'] + shift)
+
+
+def _strided(stg, cancel):
+    """ Return True if the solve must be run with `_solve_in_strides()`.
+    """
+    return (stg['callback'] is not None or stg['time_limit'] is not None
+            or cancel is not None)
+
+
+def _solve_in_strides(work, b, c, cone, sol, stg, cancel=None):
+    """ Solve with the extension `Workspace` `work`, in strides of at most
+    `stg['callback_stride']` iterations.
+
+    After each stride, call `stg['callback']` (if any) with the current
+    residuals, and stop early if `cancel` has been cancelled or
+    `stg['time_limit']` seconds have passed.
+
+    The iterate stays in the SCS workspace between strides, so unless
+    stopped early, the solve takes exactly the iterations of a single call
+    to `work.solve()`, and writes the same solution to `sol`.
+
+    Returns the `SolveInfo`. If stopped early, the solution is SCS's best
+    guess from the last iterate, and the status is set to 'Cancelled' or
+    'Time limit reached'.
+    """
+    callback = stg['callback']
+    stride = stg['callback_stride']
+    time_limit = stg['time_limit']
+
+    if stride < 1:
+        raise ValueError("callback_stride must be at least 1.")
+
+    stopped = {}
+    start = time.time()
+    work.start(b, c, cone, sol, stg)
+
+    while True:
+        done = work.iterate(cone, stride)
+        if done:
+            work.finish(sol)
+
+        if callback is not None:
+            info = work.info
+            callback(dict(iter=info['iter'], resPri=info['resPri'],
+                          resDual=info['resDual'], relGap=info['relGap'],
+                          pobj=info['pobj'], dobj=info['dobj']))
+
+        if done:
+            break
+
+        if cancel is not None and cancel.cancelled:
+            stopped = dict(status='Cancelled', statusVal=STATUS_CANCELLED)
+            break
+
+        if time_limit is not None and time.time() - start >= time_limit:
+            stopped = dict(status='Time limit reached', statusVal=STATUS_TIME_LIMIT)
+            break
+
+    if stopped:
+        work.finish(sol)
+        return work.info._replace(**stopped)
+
+    return work.info
 
 
 def version():
@@ -40,22 +337,115 @@ def version():
     return pkg_resources.get_distribution("cyscs").version
 
 
-def solve(data, cone, warm_start=None, **settings):
-    """ Solve conic optimization problem given by dictionaries `data` and `cone`.
+class PreparedProblem(object):
+    """ Problem data and cone which have been checked and converted once, so
+    that they can be solved many times without repeating the work.
+
+    `cyscs.solve(prepared)` and `cyscs.solve_many()` pass a prepared problem
+    straight to the Cython layer, skipping `check_data()` and the formatting
+    of the cone, which can cost as much as solving a small problem.
 
     Parameters
     ----------
     data : dict
+        Dictionary providing `scipy.sparse` CSC matrix `A`,
+        and `numpy` arrays `b`, `c`, as in `cyscs.solve()`.
+    cone : dict or Cone
+        Dictionary describing the sizes of the conic constraints,
+        as in `cyscs.solve()`.
+    dtype : numpy dtype
+        Floating-point dtype of the extension modules the problem is solved
+        with, which must match the `dtype` setting of later solves.
+
+    Like `check_data()`, the prepared problem holds the *same* `A`, `b`, `c`
+    objects as `data` when they already have the right types, and otherwise
+    converted copies. Their values may change between solves, but not their
+    shapes or types.
+    """
+
+    def __init__(self, data, cone, dtype=np.float64):
+        float_dtype = np.dtype(dtype)
+        int_dtype = _index_dtype(data, float_dtype)
+        # raises if the dtype is not supported
+        _extension(False, int_dtype, float_dtype)
+
+        self._cone = as_cone(cone)
+        self._data = check_data(data, self._cone, int_dtype, float_dtype)
+        self._int_dtype = int_dtype
+        self._float_dtype = float_dtype
+        self._key = None
+
+    @property
+    def shape(self):
+        """ Shape `(m, n)` of `A`.
+        """
+        return self._data['A'].shape
+
+    @property
+    def dtype(self):
+        """ Floating-point dtype of the problem data.
+        """
+        return self._float_dtype
+
+    def _checked(self, float_dtype):
+        """ Return a new data dict and the `Cone`, for a solve with
+        `float_dtype`.
+        """
+        if float_dtype != self._float_dtype:
+            msg = "The problem was prepared with dtype = numpy.{}, but solved with dtype = numpy.{}."
+            raise ValueError(msg.format(self._float_dtype.name, float_dtype.name))
+
+        return dict(self._data), self._cone
+
+    def _fingerprint(self):
+        """ Return the `fingerprint()` of the problem, computed once.
+        """
+        if self._key is None:
+            self._key = fingerprint(self._data['A'], self._cone)
+        return self._key
+
+    def solve(self, **kwargs):
+        """ Solve the problem, with the arguments of `cyscs.solve()`.
+        """
+        return solve(self, **kwargs)
+
+
+def solve(data, cone=None, warm_start=None, out=None, cancel=None,
+          warm_start_cache=None, **settings):
+    """ Solve conic optimization problem given by dictionaries `data` and `cone`.
+
+    Parameters
+    ----------
+    data : dict or PreparedProblem
         Dictionary providing `scipy.sparse` CSC matrix `A`,
         and `numpy` arrays `b`, `c`.
-    cone : dict
+        Or a `PreparedProblem`, whose data and cone are used without
+        checking them again.
+    cone : dict or Cone
         Dictionary describing the sizes of the conic constraints.
         Optional Keys: `f`, `l`, `q`, `s, `ep`, `ed`, `p`.
         See the documentation or `cyscs.examples` for more information.
+        Reusing a `Cone` avoids converting the cone on every solve.
+        Omitted if `data` is a `PreparedProblem`.
     warm_start : Optional[dict]
         Warm start the solver with arrays `x`, `y`, `s`.
         All three arrays must be present.
         Copies and does not modify the input arrays.
+    out : Optional[dict]
+        Caller-owned, contiguous arrays `x`, `y`, `s` of the solution dtype,
+        which SCS writes the solution into, instead of allocating new arrays.
+        The buffers are zeroed first, unless warm starting.
+        Passing the same dict as `warm_start` and `out` warm starts from the
+        buffers' current values without copying.
+    cancel : Optional[CancelToken]
+        Token which can be cancelled from another thread to stop the solve
+        early, returning the last iterate with status 'Cancelled'.
+        Like the `time_limit` setting, it is checked every
+        `callback_stride` iterations.
+    warm_start_cache : Optional[WarmStartCache]
+        If no `warm_start` is given, warm start from the last solution
+        stored in the cache for a problem with the same structure.
+        The solution is then stored in the cache.
     **settings
         Settings can be given as keyword arguments.
         For the possible keys, see the documentation and
@@ -63,42 +453,309 @@ def solve(data, cone, warm_start=None, **settings):
 
     Returns
     -------
-    dict
+    Solution
         Dictionary with keys `x`, `y`, and `s`, describing solution.
-        Key `info` gives solver exit information.
+        Key `info` gives solver exit information, as a `SolveInfo`.
+        `sol.block(key, i)` slices `y` and `s` per cone block.
     """
+    lap = _profile.laps()
+
     stg = default_settings()
     stg.update(settings)
 
-    if stg['use_indirect']:
-        cy = cyscs._indirect
+    float_dtype = np.dtype(stg['dtype'])
+    prepared = data if isinstance(data, PreparedProblem) else None
+    if prepared is not None:
+        if cone is not None:
+            raise TypeError("The cone of a PreparedProblem cannot be given again.")
+        int_dtype = prepared._int_dtype
+    elif cone is None:
+        raise TypeError("A cone is required, unless data is a PreparedProblem.")
     else:
-        cy = cyscs._direct
+        int_dtype = _index_dtype(data, float_dtype)
+    cy = _extension(stg['use_indirect'], int_dtype, float_dtype)
+    lap('settings')
 
-    cone = format_and_copy_cone(cone)
+    if prepared is not None:
+        # already checked and formatted
+        data, cone = prepared._checked(float_dtype)
+        A_in = data['A']
+    else:
+        cone = as_cone(cone)
+        lap('as_cone')
 
-    # creates new data dict
-    # points to *new* array/matrix data if needed
-    # does not modify original matrices/arrays
-    data = check_data(data, cone)
+        # creates new data dict
+        # points to *new* array/matrix data if needed
+        # does not modify original matrices/arrays
+        A_in = data.get('A')
+        data = check_data(data, cone, int_dtype, float_dtype)
+        lap('check_data')
 
-    m, n = data['A'].shape
-    sol = dict(x=np.zeros(n), y=np.zeros(m), s=np.zeros(m))
-    
-    # copy (and do not modify) warm-start vectors
-    if warm_start:
-        for key in 'x', 'y', 's':
-            sol[key][:] = warm_start[key]
+    presolve = None
+    if stg['presolve']:
+        presolve = _presolve(data['A'], cone, int_dtype)
+        lap('presolve')
 
-    check_xys(sol['x'], sol['y'], sol['s'], m, n)
+    if presolve is None:
+        data['A'] = _private_A(data['A'], A_in, stg['normalize'], cy)
+        lap('private_A')
+
+    if warm_start_cache is not None:
+        if prepared is not None:
+            key = prepared._fingerprint()
+        else:
+            key = fingerprint(data['A'], cone)
+        if warm_start is None:
+            warm_start = warm_start_cache.get(key)
+        lap('warm_start_cache')
+
+    m, n = data['A'].shape
+    sol = _make_sol(m, n, float_dtype, warm_start, out, cone)
+    lap('make_sol')
 
     stg['warm_start'] = True
-    
-    # updates the sol dict
-    cy.solve(data, cone, sol, stg)
+
+    def solve_data(data, cone, sol):
+        c_cone = cone._c_cone(cy)
+
+        if not _strided(stg, cancel):
+            # updates the sol dict, recording its own phases
+            cy.solve(data, c_cone, sol, stg)
+            lap.reset()
+        else:
+            # use a workspace, which keeps the iterate between strides
+            work = cy.Workspace(data, c_cone, stg)
+            sol['info'] = _solve_in_strides(work, data['b'], data['c'], c_cone,
+                                            sol, stg, cancel)
+            lap.reset()
+
+        return sol['info']
+
+    if presolve is None:
+        solve_data(data, cone, sol)
+    else:
+        def solve_reduced(b, c, red):
+            return solve_data(dict(A=presolve.A, b=b, c=c), presolve.cone, red)
+
+        sol['info'] = _solve_presolved(presolve, cy, data['b'], data['c'], sol,
+                                       warm_start, float_dtype, solve_reduced)
+        lap('postsolve')
+
+    if warm_start_cache is not None:
+        warm_start_cache.put(key, sol)
+        lap('warm_start_cache')
 
     return sol
 
+
+def solve_many(problems, workers=1, warm_starts=None, chunksize=None, **settings):
+    """ Solve a sequence of conic optimization problems, using `workers` threads.
+
+    Input data is checked and formatted up front (holding the GIL), and then
+    the problems are split into chunks. Each thread releases the GIL once
+    for its entire chunk, so the underlying C solves run in parallel.
+
+    Parameters
+    ----------
+    problems : sequence of (dict, dict) or PreparedProblem
+        Sequence of `(data, cone)` pairs, each as described in `cyscs.solve()`,
+        or of `PreparedProblem` objects, which are not checked again.
+    workers : int
+        Number of threads used to solve the problems.
+    warm_starts : Optional[sequence of dict]
+        Warm start dictionaries, one per problem, as described in `cyscs.solve()`.
+        Entries may be `None`.
+    chunksize : Optional[int]
+        Number of problems each thread solves between reacquiring the GIL.
+        By default, the problems are split into about four chunks per worker,
+        to balance the load when problems vary in difficulty.
+    **settings
+        Settings can be given as keyword arguments, and are applied to
+        every problem.
+        For the possible keys, see the documentation and
+        `cyscs.default_settings()`.
+
+    Returns
+    -------
+    list of Solution
+        Solution dictionaries, in the same order as `problems`,
+        as described in `cyscs.solve()`.
+    """
+    stg = default_settings()
+    stg.update(settings)
+
+    if stg['presolve']:
+        raise ValueError("The presolve setting is not supported by solve_many().")
+
+    problems = list(problems)
+
+    # all problems in a batch must use the same extension module,
+    # so only use 32-bit integers if every problem allows it
+    float_dtype = np.dtype(stg['dtype'])
+    int_dtypes = set(problem._int_dtype if isinstance(problem, PreparedProblem)
+                     else _index_dtype(problem[0], float_dtype) for problem in problems)
+    if len(int_dtypes) == 1:
+        int_dtype = int_dtypes.pop()
+    else:
+        int_dtype = np.dtype(np.int64)
+    cy = _extension(stg['use_indirect'], int_dtype, float_dtype)
+    if warm_starts is None:
+        warm_starts = [None]*len(problems)
+    else:
+        warm_starts = list(warm_starts)
+
+    if len(warm_starts) != len(problems):
+        raise ValueError("warm_starts must have one entry per problem.")
+
+    datas, cones, sols = [], [], []
+    for problem, warm_start in zip(problems, warm_starts):
+        if isinstance(problem, PreparedProblem):
+            data, cone = problem._checked(float_dtype)
+        else:
+            data, cone = problem
+
+        A_in = data.get('A')
+        if not isinstance(problem, PreparedProblem) or problem._int_dtype != int_dtype:
+            # prepared problems are only converted again in batches with mixed index dtypes
+            cone = as_cone(cone)
+            data = check_data(data, cone, int_dtype, float_dtype)
+        data['A'] = _private_A(data['A'], A_in, stg['normalize'], cy)
+
+        m, n = data['A'].shape
+        sol = _make_sol(m, n, float_dtype, warm_start, cone=cone)
+
+        datas.append(data)
+        cones.append(cone._c_cone(cy))
+        sols.append(sol)
+
+    if _strided(stg, None):
+        raise ValueError("The callback and time_limit settings are not supported by solve_many().")
+
+    stg['warm_start'] = True
+
+    if chunksize is None:
+        chunksize = max(1, -(-len(sols) // (4*workers)))
+
+    prof = _profile.active()
+
+    def solve_chunk(i):
+        j = i + chunksize
+        # updates the sol dicts, recording into the caller's profile
+        with _profile.recording(prof):
+            cy.solve_many(datas[i:j], cones[i:j], sols[i:j], stg)
+
+    starts = range(0, len(sols), chunksize)
+
+    if workers == 1:
+        for i in starts:
+            solve_chunk(i)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            # consume the generator to re-raise any exceptions
+            list(ex.map(solve_chunk, starts))
+
+    return sols
+
+
+class CancelToken(object):
+    """ Token for cancelling running solves from another thread.
+
+    Pass the token as the `cancel` argument of `cyscs.solve()` or
+    `Workspace.solve()`. After `cancel()` is called, those solves stop at
+    their next check (every `callback_stride` iterations), and return the
+    last iterate with status 'Cancelled'. One token can cancel many solves.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """ Request that all solves using this token stop.
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class WarmStartCache(object):
+    """ LRU cache of the last solution for each problem structure, used to
+    warm start later solves of problems with the same structure.
+
+    Problems are keyed by a hash of the sparsity pattern of `A` (its
+    `indptr` and `indices`) and the cone, but not the values of `A`, `b`,
+    or `c`, so problems whose data drifts between solves share an entry.
+    Pass the cache as the `warm_start_cache` argument of `cyscs.solve()`
+    or `cyscs.Workspace()`. The cache can be shared between threads.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget for the stored `x`, `y`, `s` arrays. The least
+        recently used entries are evicted to stay within it.
+    """
+
+    def __init__(self, max_bytes=64*2**20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """ Total size of the stored arrays, in bytes.
+        """
+        return self._nbytes
+
+    def get(self, key):
+        """ Return the warm start `dict` stored for `key`, or `None`.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # move to the most recently used end
+                self._entries[key] = entry
+            return entry
+
+    def put(self, key, sol):
+        """ Store copies of the `x`, `y`, `s` arrays of `sol` for `key`.
+
+        Solutions with NaN or infinite entries are not stored: certificates
+        of infeasibility or unboundedness, failed solves, and solves stopped
+        early on such a guess.
+        """
+        if not all(np.isfinite(sol[k]).all() for k in ('x', 'y', 's')):
+            return
+
+        entry = {k: np.array(sol[k]) for k in ('x', 'y', 's')}
+        nbytes = sum(a.nbytes for a in entry.values())
+
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                return
+
+            self._entries[key] = entry
+            self._nbytes += nbytes
+
+            while self._nbytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= sum(a.nbytes for a in entry.values())
+
+
 class Workspace(object):
     """ `Workspace` objects cache SCS solver information to be reused between solves.
 
@@ -106,18 +763,22 @@ class Workspace(object):
     based on the current `Workspace` attributes.
 
     Typically, users can change `b`, `c` and some of the solver settings
-    between solves. The `A` matrix cannot be changed after
-    initialization.
+    between solves. The sparsity pattern of `A` cannot be changed after
+    initialization, but its values can, with `Workspace.update_A()`.
 
     Parameters
     ----------
     data : dict
         Dictionary providing `scipy.sparse` CSC matrix `A`,
         and `numpy` arrays `b`, `c`.
-    cone : dict
+    cone : dict or Cone
         Dictionary describing the sizes of the conic constraints.
         Optional Keys: `f`, `l`, `q`, `s, `ep`, `ed`, `p`.
         See the documentation or `cyscs.examples` for more information.
+    warm_start_cache : Optional[WarmStartCache]
+        If given, `Workspace.solve()` calls without a `warm_start` are warm
+        started from the last solution stored in the cache for a problem
+        with the same structure, and store their solutions in the cache.
     **settings
         Settings can be given as keyword arguments.
         For the possible keys, see the documentation and
@@ -127,47 +788,80 @@ class Workspace(object):
     ----------
     data : dict
         Dictionary with keys `b`, `c`, which can change between solves.
-        Note that `A` is not present because it cannot be changed.
+        Note that `A` is not present; see `Workspace.update_A()`.
     settings : dict
         All the solver settings for this `Workspace`.
     fixed : dict
         Solver settings which cannot be changed after initialization.
-    info : dict
+    info : SolveInfo
         Solver status info, including solve time and problem setup time.
 
 
     Development Notes
     -----------------
-    It is this object's responsibility to keep an internal *copy* of cone.
-    The underlying Cython layer will create and use numpy memory in C calls.
+    The cone is kept as an immutable `Cone`, whose C struct is built once and
+    reused by every solve.
+    If the extension modules are built without COPYAMATRIX, SCS normalizes
+    the values of `A` in place, so the Workspace hands it a private copy of
+    `A.data` (unless `check_data` already made one), which the Cython
+    `Workspace` keeps alive.
     """
 
-    _fixed_keys = 'use_indirect', 'rho_x', 'normalize', 'scale'
+    _fixed_keys = 'use_indirect', 'rho_x', 'normalize', 'scale', 'dtype', 'presolve'
 
-    def __init__(self, data, cone, **settings):
+    def __init__(self, data, cone, warm_start_cache=None, **settings):
         """ SCS Workspace
         
         """
+        lap = _profile.laps()
+
         self._settings = default_settings()
         self._settings.update(settings)
 
         self._fixed = {k: self._settings[k] for k in self._fixed_keys}
 
-        self._cone = format_and_copy_cone(cone)
-
-        self.data = check_data(data, self._cone)
-
-        self._m, self._n = data['A'].shape
+        self._float_dtype = np.dtype(self._settings['dtype'])
+        self._int_dtype = _index_dtype(data, self._float_dtype)
 
         # todo: does it make sense to have an indirect workspace?
         # should we only allow `direct` Workspaces?
-        if self._settings['use_indirect']:
-            cy = cyscs._indirect
+        cy = _extension(self._settings['use_indirect'], self._int_dtype,
+                        self._float_dtype)
+        lap('settings')
+
+        self._cone = as_cone(cone)
+        lap('as_cone')
+
+        self.data = check_data(data, self._cone, self._int_dtype, self._float_dtype)
+        lap('check_data')
+
+        self._presolve = None
+        if self._settings['presolve']:
+            self._presolve = _presolve(self.data['A'], self._cone, self._int_dtype)
+            lap('presolve')
+
+        if self._presolve is None:
+            self.data['A'] = _private_A(self.data['A'], data['A'],
+                                        self._settings['normalize'], cy)
+            lap('private_A')
+            work_data, work_cone = self.data, self._cone
         else:
-            cy = cyscs._direct
+            # SCS only sees the reduced problem
+            b, c, _ = self._presolve.reduce(self.data['b'], self.data['c'])
+            work_data = dict(A=self._presolve.A, b=b.astype(self._float_dtype), c=c)
+            work_cone = self._presolve.cone
 
+        self._m, self._n = data['A'].shape
+        self._nnz = self.data['A'].nnz
+
+        self._warm_start_cache = warm_start_cache
+        if warm_start_cache is not None:
+            self._fingerprint = fingerprint(self.data['A'], self._cone)
+            lap('warm_start_cache')
+
+        self._c_cone = work_cone._c_cone(cy)
         self._settings['warm_start'] = True
-        self._work = cy.Workspace(self.data, self._cone, self._settings)
+        self._work = cy.Workspace(work_data, self._c_cone, self._settings)
         del self._settings['warm_start']
 
         del self.data['A']
@@ -179,7 +873,7 @@ class Workspace(object):
 
     @property
     def info(self):
-        return self._work.c_info
+        return self._work.info
 
     @property
     def settings(self):
@@ -192,7 +886,7 @@ class Workspace(object):
                 msg = 'Setting {} has been changed from Workspace initialization.'
                 raise Exception(msg.format(key))
 
-    def solve(self, new_bc=None, warm_start=None, **settings):
+    def solve(self, new_bc=None, warm_start=None, out=None, cancel=None, **settings):
         """ Solve conic optimization problem based on `Workspace` attributes.
 
         Parameters
@@ -205,6 +899,17 @@ class Workspace(object):
             Warm start the solver with arrays `x`, `y`, `s`.
             All three arrays must be present.
             Copies and does not modify the input arrays.
+        out : Optional[dict]
+            Caller-owned, contiguous arrays `x`, `y`, `s` of the solution dtype,
+            which SCS writes the solution into, instead of allocating new arrays.
+            The buffers are zeroed first, unless warm starting.
+            Passing the same dict as `warm_start` and `out` warm starts from the
+            buffers' current values without copying.
+        cancel : Optional[CancelToken]
+            Token which can be cancelled from another thread to stop the solve
+            early, returning the last iterate with status 'Cancelled'.
+            Like the `time_limit` setting, it is checked every
+            `callback_stride` iterations.
         **settings
             Settings can be given as keyword arguments.
             For the possible keys, see the documentation and
@@ -214,10 +919,13 @@ class Workspace(object):
 
         Returns
         -------
-        dict
+        Solution
             Dictionary with keys `x`, `y`, and `s`, describing solution.
-            Key `info` gives solver exit information.
+            Key `info` gives solver exit information, as a `SolveInfo`.
+            `sol.block(key, i)` slices `y` and `s` per cone block.
         """
+        lap = _profile.laps()
+
         self._settings.update(settings)
         self.check_settings()
 
@@ -225,26 +933,386 @@ class Workspace(object):
             for key in 'b', 'c':
                 if key in new_bc:
                     self.data[key] = new_bc[key]
+        lap('settings')
+
+        if warm_start is None and self._warm_start_cache is not None:
+            warm_start = self._warm_start_cache.get(self._fingerprint)
+            lap('warm_start_cache')
+
+        sol = _make_sol(self._m, self._n, self._float_dtype, warm_start, out, self._cone)
+        lap('make_sol')
+
+        check_bc(self.data['b'],self.data['c'], self._m, self._n, self._float_dtype)
+        lap('check_bc')
+
+        def solve_bc(b, c, sol):
+            if not _strided(self._settings, cancel):
+                self._work.solve(b, c, self._c_cone, sol, self._settings)
+                lap.reset()
+                info = self.info
+                lap('make_info')
+                return info
+
+            info = _solve_in_strides(self._work, b, c, self._c_cone, sol,
+                                     self._settings, cancel)
+            lap.reset()
+            return info
+
+        self._settings['warm_start'] = True
+        if self._presolve is None:
+            sol['info'] = solve_bc(self.data['b'], self.data['c'], sol)
+        else:
+            cy = _extension(self._settings['use_indirect'], self._int_dtype,
+                            self._float_dtype)
+            sol['info'] = _solve_presolved(self._presolve, cy, self.data['b'],
+                                           self.data['c'], sol, warm_start,
+                                           self._float_dtype, solve_bc)
+            lap('postsolve')
+        del self._settings['warm_start']
+
+        if self._warm_start_cache is not None:
+            self._warm_start_cache.put(self._fingerprint, sol)
+            lap('warm_start_cache')
+
+        return sol
+
+    def solve_batch(self, B=None, C=None, warm_start=None, chain=False, **settings):
+        """ Solve a batch of problems, one for each row of `B` and `C`.
+
+        All problems reuse the cached `Workspace` factorization, and the
+        GIL is released once for the whole batch. Output arrays are allocated
+        once for the batch.
+
+        Parameters
+        ----------
+        B : Optional[numpy.ndarray]
+            2D float64 array with one `b` vector per row.
+            If `None`, `Workspace.data['b']` is used for every problem.
+        C : Optional[numpy.ndarray]
+            2D float64 array with one `c` vector per row.
+            If `None`, `Workspace.data['c']` is used for every problem.
+        warm_start : Optional[dict]
+            Warm start the solver with 2D arrays `x`, `y`, `s`,
+            with one row per problem.
+            Copies and does not modify the input arrays.
+        chain : bool
+            If `True`, warm start each problem with the solution of the
+            previous row. Useful for parametric sweeps.
+            The first problem is warm started with `warm_start`, if given.
+        **settings
+            Settings can be given as keyword arguments.
+            For the possible keys, see the documentation and
+            `cyscs.default_settings()`.
+            Will replace settings in `Workspace.settings`, so changes
+            persist after the call to `solve_batch()`.
+
+        Returns
+        -------
+        Solution
+            Dictionary with 2D arrays `x`, `y`, and `s`, with one solution
+            per row.
+            Key `info` gives a structured numpy array of solver exit information,
+            with one entry per problem.
+        """
+        self._settings.update(settings)
+        self.check_settings()
+
+        if _strided(self._settings, None):
+            raise ValueError("The callback and time_limit settings are not supported by solve_batch().")
+
+        if self._presolve is not None:
+            raise ValueError("Presolved Workspaces do not support solve_batch().")
+
+        if B is None and C is None:
+            raise ValueError("At least one of B or C must be given.")
+
+        k = len(B) if B is not None else len(C)
+        if B is None:
+            B = np.broadcast_to(self.data['b'], (k, self._m))
+        if C is None:
+            C = np.broadcast_to(self.data['c'], (k, self._n))
+
+        check_bc_batch(B, C, self._m, self._n, self._float_dtype)
+
+        sol = Solution(self._cone, x=np.zeros((k, self._n), dtype=self._float_dtype),
+                       y=np.zeros((k, self._m), dtype=self._float_dtype),
+                       s=np.zeros((k, self._m), dtype=self._float_dtype))
 
-        sol = dict(x=np.zeros(self._n), y=np.zeros(self._m),
-                   s=np.zeros(self._m))
-        
         # copy (and do not modify) warm-start vectors
         if warm_start:
             for key in 'x', 'y', 's':
                 sol[key][:] = warm_start[key]
 
+        sol['info'] = np.zeros(k, dtype=info_dtype(self._int_dtype, self._float_dtype))
+
+        self._settings['warm_start'] = True
+        self._work.solve_batch(B, C, self._c_cone, sol['x'], sol['y'], sol['s'],
+                               sol['info'].view(np.uint8), chain, self._settings)
+        del self._settings['warm_start']
+
+        return sol
+
+    def update_A(self, values):
+        """ Change the values of `A`, keeping its sparsity pattern.
+
+        SCS normalizes the new `A` and refactors the KKT matrix, but reuses
+        the fill-reducing ordering and the sparsity pattern of the
+        factorization, which is cheaper than creating a new `Workspace`.
+        Only direct solver `Workspace` objects support this.
+
+        The new factorization only replaces the old one once it succeeds, so
+        if this raises, the `Workspace` is unchanged.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            1D array with the new nonzero values of `A`, in the order of
+            `A.data` for the CSC matrix the `Workspace` was created with.
+            Copies and does not modify the input array.
+
+        Raises
+        ------
+        ValueError
+            If `values` has the wrong size or non-finite entries, or the KKT
+            matrix with the new values cannot be factored.
+        MemoryError
+            If the new factorization cannot be allocated.
+        """
+        cy = _extension(self._settings['use_indirect'], self._int_dtype,
+                        self._float_dtype)
+        if not hasattr(cy, 'update_A'):
+            raise ValueError("Only direct solver Workspaces support update_A().")
+
+        if self._presolve is not None:
+            # the reductions depend on the values of A
+            raise ValueError("Presolved Workspaces do not support update_A().")
+
+        # SCS may keep and normalize the array in place, so always copy it
+        values = np.array(values, dtype=self._float_dtype)
+        if values.shape != (self._nnz,):
+            raise ValueError("values must have one entry per nonzero of A.")
+
+        cy.update_A(self._work, self._c_cone, values)
+
+    def save(self, path):
+        """ Save the `Workspace` to an `.npz` file, including the normalized
+        `A`, the scaling vectors, and the factorization of the KKT matrix,
+        so that `Workspace.load()` can skip the SCS setup.
+
+        The `callback` setting and any `warm_start_cache` are not saved.
+        Only direct solver `Workspace` objects can be saved.
+        """
+        np.savez(path, **self.__getstate__())
+
+    @classmethod
+    def load(cls, path):
+        """ Load a `Workspace` saved with `Workspace.save()`, without
+        normalizing `A` or factoring the KKT matrix again.
+        """
+        with np.load(path) as f:
+            state = {key: f[key] for key in f.files}
+
+        work = cls.__new__(cls)
+        work.__setstate__(state)
+
+        return work
+
+    def _copy(self):
+        """ Return a new `Workspace` for the same problem and settings, with
+        the SCS workspace loaded from this one's state, so `A` is not
+        normalized or factored again.
+
+        Only direct solver `Workspace` objects can be copied.
+        """
+        work = Workspace.__new__(Workspace)
+        work.__setstate__(self.__getstate__())
+
+        # not saved in the state
+        work._settings = dict(self._settings)
+        work._warm_start_cache = self._warm_start_cache
+        if self._warm_start_cache is not None:
+            work._fingerprint = self._fingerprint
+
+        return work
+
+    def __getstate__(self):
+        """ Return a `dict` of numpy arrays, holding the problem data and
+        the SCS workspace state.
+        """
+        cy = _extension(self._settings['use_indirect'], self._int_dtype,
+                        self._float_dtype)
+        if not hasattr(cy, 'save_state'):
+            raise ValueError("Only direct solver Workspaces can be saved.")
+
+        if self._presolve is not None:
+            raise ValueError("Presolved Workspaces cannot be saved.")
+
+        settings = dict(self.settings, dtype=self._float_dtype.name, callback=None)
+        meta = dict(settings=settings, int_dtype=self._int_dtype.name,
+                    m=self._m, n=self._n)
+
+        state = cy.save_state(self._work)
+        state.update(b=np.asarray(self.data['b']), c=np.asarray(self.data['c']),
+                     meta=np.array(json.dumps(meta)))
+        state.update(('cone_' + key, np.asarray(val)) for key, val in self._cone.items())
+
+        return state
+
+    def __setstate__(self, state):
+        meta = json.loads(str(state['meta']))
+
+        self._float_dtype = np.dtype(meta['settings']['dtype'])
+        self._int_dtype = np.dtype(meta['int_dtype'])
+
+        self._settings = default_settings()
+        self._settings.update(meta['settings'], dtype=self._float_dtype)
+        self._fixed = {k: self._settings[k] for k in self._fixed_keys}
+        self._m, self._n = meta['m'], meta['n']
+
+        cy = _extension(self._settings['use_indirect'], self._int_dtype,
+                        self._float_dtype)
+
+        cone = {key[5:]: state[key] for key in state if key.startswith('cone_')}
+        self._cone = as_cone(cone)
+        self._c_cone = self._cone._c_cone(cy)
+
+        _check_saved_A(state['A_p'], state['A_i'], state['A_x'], self._m, self._n)
+
+        # assign the index arrays directly, so scipy does not change their dtype
+        A = sp.csc_matrix((self._m, self._n), dtype=self._float_dtype)
+        A.data, A.indices, A.indptr = state['A_x'], state['A_i'], state['A_p']
 
-        check_xys(sol['x'], sol['y'], sol['s'], self._m, self._n)
-        check_bc(self.data['b'],self.data['c'], self._m, self._n)
+        data = dict(A=A, b=state['b'], c=state['c'])
+        self.data = check_data(data, self._cone, self._int_dtype, self._float_dtype)
+        self._nnz = A.nnz
 
         self._settings['warm_start'] = True
-        self._work.solve(self.data['b'], self.data['c'],
-                         self._cone, sol, self._settings)
+        self._work = cy.load_workspace(self.data, self._c_cone, self._settings, state)
         del self._settings['warm_start']
 
-        
-        sol['info'] = self.info
+        self._warm_start_cache = None
+        self._presolve = None
 
-        return sol
+        del self.data['A']
+
+
+class WorkspacePool(object):
+    """ A fixed-size pool of `Workspace` objects for the same problem, so that
+    several threads can re-solve it concurrently.
+
+    A single `Workspace` mutates its internal C structs when solving, so it
+    cannot be shared between threads. The pool hands out one `Workspace`
+    per caller, with checkout/checkin semantics. Since `Workspace.solve()`
+    releases the GIL, solves on different workspaces run in parallel.
+
+    The problem data is checked and converted once, and shared by all the
+    workspaces in the pool. Direct solver workspaces are normalized and
+    factored once, and the others loaded from the saved state of the first,
+    as by `Workspace.load()`. Indirect and presolved workspaces each run
+    their own C setup.
+
+    Parameters
+    ----------
+    data : dict
+        Dictionary providing `scipy.sparse` CSC matrix `A`,
+        and `numpy` arrays `b`, `c`.
+    cone : dict or Cone
+        Dictionary describing the sizes of the conic constraints.
+        Optional Keys: `f`, `l`, `q`, `s, `ep`, `ed`, `p`.
+        See the documentation or `cyscs.examples` for more information.
+    size : int
+        Number of workspaces in the pool, i.e., the number of solves
+        that can run concurrently.
+    **settings
+        Settings can be given as keyword arguments.
+        For the possible keys, see the documentation and
+        `cyscs.default_settings()`.
+    """
 
+    def __init__(self, data, cone, size=2, **settings):
+        if size < 1:
+            raise ValueError("WorkspacePool size must be at least 1.")
+
+        stg = default_settings()
+        stg.update(settings)
+
+        # check and convert once, with the same dtypes each Workspace will use
+        float_dtype = np.dtype(stg['dtype'])
+        int_dtype = _index_dtype(data, float_dtype)
+        cone = as_cone(cone)
+        data = check_data(data, cone, int_dtype, float_dtype)
+
+        first = Workspace(data, cone, **settings)
+        copyable = not first.fixed['use_indirect'] and first._presolve is None
+
+        self._workspaces = [first]
+        for _ in range(size - 1):
+            if copyable:
+                self._workspaces.append(first._copy())
+            else:
+                self._workspaces.append(Workspace(data, cone, **settings))
+
+        self._free = queue.Queue()
+        for work in self._workspaces:
+            self._free.put(work)
+
+        # ids of the checked out workspaces
+        self._checked_out = set()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return len(self._workspaces)
+
+    def checkout(self, timeout=None):
+        """ Remove a `Workspace` from the pool, blocking until one is free.
+
+        Raises `queue.Empty` if no `Workspace` becomes free within `timeout`
+        seconds. The `Workspace` must be returned with `checkin()`.
+        """
+        work = self._free.get(timeout=timeout)
+        with self._lock:
+            self._checked_out.add(id(work))
+        return work
+
+    def checkin(self, work):
+        """ Return a `Workspace` obtained from `checkout()` to the pool.
+
+        Raises `ValueError` if `work` is not from this pool, or is not
+        checked out, e.g. when checked in twice.
+        """
+        if not any(work is w for w in self._workspaces):
+            raise ValueError("Workspace does not belong to this pool.")
+
+        with self._lock:
+            if id(work) not in self._checked_out:
+                raise ValueError("Workspace is not checked out.")
+            self._checked_out.remove(id(work))
+
+        self._free.put(work)
+
+    @contextmanager
+    def workspace(self, timeout=None):
+        """ Context manager which checks out a `Workspace` and checks it
+        back in on exit.
+        """
+        work = self.checkout(timeout)
+        try:
+            yield work
+        finally:
+            self.checkin(work)
+
+    def solve(self, new_bc=None, warm_start=None, out=None, cancel=None, **settings):
+        """ Solve the problem on a free `Workspace` from the pool.
+
+        Arguments are as in `Workspace.solve()`, but changes to `b`, `c`,
+        and the settings only apply to this call, and do not persist in
+        the pooled `Workspace`.
+        """
+        with self.workspace() as work:
+            data, stg = dict(work.data), dict(work._settings)
+            try:
+                return work.solve(new_bc, warm_start, out=out, cancel=cancel,
+                                  **settings)
+            finally:
+                work.data, work._settings = data, stg
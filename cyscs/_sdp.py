@@ -0,0 +1,129 @@
+""" Packing and unpacking of semidefinite cone variables.
+
+SCS stores each `n` by `n` symmetric matrix of an `s` cone as the
+`n*(n+1)/2` entries of its lower triangle, column by column, with the
+off-diagonal entries scaled by `sqrt(2)`, so that inner products of packed
+vectors equal the trace inner products of the matrices.
+
+Blocks of the same size are converted together, with one fancy-indexing
+operation per distinct size, so there are no loops over matrix entries.
+"""
+import numpy as np
+
+
+def svec_indices(n):
+    """ Row and column indices of the entries of an `n` by `n` symmetric matrix
+    in the order SCS stores them: the lower triangle, column by column.
+    """
+    # column-major lower triangle is row-major upper triangle, transposed
+    cols, rows = np.triu_indices(n)
+    return rows, cols
+
+
+def _layout(n):
+    rows, cols = svec_indices(n)
+    scale = np.where(rows == cols, 1.0, np.sqrt(2))
+    return rows, cols, scale
+
+
+def _groups(sizes):
+    """ Yield `(n, blocks, idx)` for each distinct size `n`, where `blocks`
+    are the positions of the blocks of that size, and `idx` is the
+    `(len(blocks), n*(n+1)/2)` array of their entries in the packed vector.
+    """
+    lengths = sizes*(sizes + 1)//2
+    starts = np.cumsum(lengths) - lengths
+
+    for n in np.unique(sizes):
+        blocks = np.flatnonzero(sizes == n)
+        idx = starts[blocks][:, None] + np.arange(n*(n + 1)//2)
+        yield int(n), blocks, idx
+
+
+def _sizes(sizes):
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if sizes.ndim != 1 or np.any(sizes < 0):
+        raise ValueError("sizes must be a sequence of nonnegative integers.")
+    return sizes
+
+
+def svec(mats):
+    """ Pack symmetric matrices into SCS's scaled lower-triangular format.
+
+    Parameters
+    ----------
+    mats : numpy.ndarray or sequence of numpy.ndarray
+        An array of shape `(..., n, n)`, packed into an array of shape
+        `(..., n*(n+1)/2)`. Or a sequence of such arrays, of possibly
+        different `n` but the same leading dimensions, packed one after the
+        other into a single array, in the layout of an `s` cone with the
+        sizes of the matrices.
+
+    Only the lower triangles of the matrices are read.
+    """
+    if not isinstance(mats, (list, tuple)):
+        M = np.asarray(mats)
+        if M.ndim < 2 or M.shape[-1] != M.shape[-2]:
+            raise ValueError("Matrices must be square, with shape (..., n, n).")
+
+        rows, cols, scale = _layout(M.shape[-1])
+        return M[..., rows, cols]*scale
+
+    mats = [np.asarray(M) for M in mats]
+    if any(M.ndim < 2 or M.shape[-1] != M.shape[-2] for M in mats):
+        raise ValueError("Matrices must be square, with shape (..., n, n).")
+
+    sizes = np.array([M.shape[-1] for M in mats], dtype=np.int64)
+    lead = mats[0].shape[:-2] if mats else ()
+    dtype = np.result_type(np.float64, *mats) if mats else np.float64
+    out = np.zeros(lead + (int(np.sum(sizes*(sizes + 1)//2)),), dtype=dtype)
+
+    for n, blocks, idx in _groups(sizes):
+        stack = np.stack([mats[i] for i in blocks], axis=-3)
+        out[..., idx] = svec(stack)
+
+    return out
+
+
+def smat(v, sizes):
+    """ Unpack vectors in SCS's scaled lower-triangular format into full
+    symmetric matrices.
+
+    Parameters
+    ----------
+    v : numpy.ndarray
+        Packed entries in the last axis, such as the rows of the `s` cones
+        in `sol['y']` or `sol['s']`.
+    sizes : int or sequence of int
+        If an integer `n`, `v` has shape `(..., n*(n+1)/2)`, and an array of
+        shape `(..., n, n)` is returned. Otherwise, the sizes of the
+        consecutive blocks in `v`, as in `cone['s']`, and a list of arrays
+        of shape `(..., n, n)` is returned, one per block.
+    """
+    v = np.asarray(v)
+
+    if np.ndim(sizes) == 0:
+        n = int(sizes)
+        if v.ndim < 1 or v.shape[-1] != n*(n + 1)//2:
+            raise ValueError("v must have n*(n+1)/2 entries in its last axis.")
+
+        rows, cols, scale = _layout(n)
+        vals = v/scale
+
+        M = np.empty(v.shape[:-1] + (n, n), dtype=vals.dtype)
+        M[..., rows, cols] = vals
+        M[..., cols, rows] = vals
+        return M
+
+    sizes = _sizes(sizes)
+    if v.ndim < 1 or v.shape[-1] != np.sum(sizes*(sizes + 1)//2):
+        raise ValueError("v must have one entry per entry of the packed matrices.")
+
+    out = [None]*len(sizes)
+    for n, blocks, idx in _groups(sizes):
+        # shape (..., len(blocks), n, n)
+        stack = smat(v[..., idx], n)
+        for j, i in enumerate(blocks):
+            out[i] = stack[..., j, :, :]
+
+    return out
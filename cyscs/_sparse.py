@@ -0,0 +1,81 @@
+""" Conversion of COO and CSR matrices to the CSC layout SCS reads.
+"""
+import importlib
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _extension(int_dtype, float_dtype):
+    """ Return an extension module with C dtypes `int_dtype` and `float_dtype`,
+    or `None` if it was not built.
+    """
+    suffix = (('_i32' if int_dtype == np.int32 else '')
+              + ('_f32' if float_dtype == np.float32 else ''))
+    try:
+        return importlib.import_module('cyscs._direct' + suffix)
+    except ImportError:
+        return None
+
+
+def _indices(*arrays):
+    """ Return the index arrays with a common int32 or int64 dtype, which the
+    conversion functions read without copying.
+    """
+    dtype = np.result_type(*arrays)
+    if dtype not in (np.int32, np.int64):
+        dtype = np.int64
+    return [np.ascontiguousarray(a, dtype=dtype) for a in arrays]
+
+
+def _values(values, float_dtype):
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(float_dtype)
+    return np.ascontiguousarray(values)
+
+
+def to_csc(A, int_dtype=np.int64, float_dtype=np.float64):
+    """ Return a new CSC matrix equal to the COO or CSR matrix `A`, with
+    `int_dtype` indices and `float_dtype` values. Duplicate entries are
+    summed, as by `A.tocsc()`.
+
+    The entries are sorted into columns and cast in a single pass, straight
+    into arrays of the final dtypes, so no intermediate CSC matrix with the
+    dtypes of `A` is made.
+    """
+    if A.format not in ('coo', 'csr'):
+        raise TypeError("A must be a COO or CSR matrix.")
+
+    int_dtype, float_dtype = np.dtype(int_dtype), np.dtype(float_dtype)
+    m, n = A.shape
+
+    cy = _extension(int_dtype, float_dtype)
+    if cy is None:
+        B = sp.csc_matrix(A.tocsc())
+        B.indices = B.indices.astype(int_dtype)
+        B.indptr = B.indptr.astype(int_dtype)
+        B.data = B.data.astype(float_dtype)
+        return B
+
+    if A.format == 'coo':
+        row, col = _indices(A.row, A.col)
+        arrays = cy.coo_to_csc(m, n, row, col, _values(A.data, float_dtype))
+    else:
+        indptr, indices = _indices(A.indptr, A.indices)
+        arrays = cy.csr_to_csc(m, n, indptr, indices, _values(A.data, float_dtype))
+
+    data, indices, indptr, canonical = arrays
+
+    # assign the arrays directly, so scipy does not change their dtype
+    B = sp.csc_matrix((m, n), dtype=float_dtype)
+    B.data, B.indices, B.indptr = data, indices, indptr
+
+    if canonical:
+        B.has_canonical_format = True
+    else:
+        B.has_sorted_indices = False
+        B.has_canonical_format = False
+        # in place, keeping the dtypes
+        B.sum_duplicates()
+
+    return B
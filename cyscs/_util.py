@@ -2,13 +2,17 @@
 """
 
 from warnings import warn
+import hashlib
 import scipy.sparse as sp
 import numpy as np
 
+from ._cone import Cone
+from ._sparse import to_csc
 
-def check_xys(x,y,s,m,n):
+
+def check_xys(x,y,s,m,n,float_dtype=np.float64):
     """ Check that x, y, s are dense numpy arrays of the right shape, length
-    and dtype.
+    and dtype (default float64).
 
     Raise a value error otherwise.
 
@@ -27,12 +31,13 @@ def check_xys(x,y,s,m,n):
         raise ValueError("x, y, s must be 1D NumPy ND arrays with sizes matching matrix A.")
 
     # check that they have the right data type. warn if not and convert
-    if not_met(x.dtype == np.float64, y.dtype == np.float64, s.dtype == np.float64):
-        raise ValueError("x, y, s must be numpy arrays with dtype = numpy.float64")
+    if not_met(x.dtype == float_dtype, y.dtype == float_dtype, s.dtype == float_dtype):
+        msg = "x, y, s must be numpy arrays with dtype = numpy.{}"
+        raise ValueError(msg.format(np.dtype(float_dtype).name))
 
-def check_bc(b,c,m,n):
+def check_bc(b,c,m,n,float_dtype=np.float64):
     """ Check that b, c are dense numpy arrays of the right shape, length
-    and dtype.
+    and dtype (default float64).
 
     Raise a value error otherwise.
 
@@ -47,9 +52,56 @@ def check_bc(b,c,m,n):
         raise ValueError("b, c must be 1D NumPy ND arrays with sizes matching matrix A.")
 
     # check that they have the right data type. warn if not and convert
-    if not_met(b.dtype == np.float64, c.dtype == np.float64):
-        raise ValueError("b, c must be numpy arrays with dtype = numpy.float64")
+    if not_met(b.dtype == float_dtype, c.dtype == float_dtype):
+        msg = "b, c must be numpy arrays with dtype = numpy.{}"
+        raise ValueError(msg.format(np.dtype(float_dtype).name))
+
+
+def check_bc_batch(B, C, m, n, float_dtype=np.float64):
+    """ Check that B, C are dense 2D numpy arrays with rows of length m and n,
+    the same number of rows, and dtype `float_dtype` (default float64).
+
+    Raise a value error otherwise.
+
+    """
+    if sp.issparse(B) or sp.issparse(C):
+        raise ValueError("B and C must be (dense) NumPy ndarrays.")
 
+    if not_met(B.ndim == 2, C.ndim == 2, B.shape[1] == m, C.shape[1] == n):
+        raise ValueError("B, C must be 2D NumPy ND arrays with rows matching the size of matrix A.")
+
+    if not_met(B.shape[0] == C.shape[0]):
+        raise ValueError("B and C must have the same number of rows.")
+
+    if not_met(B.dtype == float_dtype, C.dtype == float_dtype):
+        msg = "B, C must be numpy arrays with dtype = numpy.{}"
+        raise ValueError(msg.format(np.dtype(float_dtype).name))
+
+
+# `statusVal` of solves stopped early by cyscs, extending the SCS status codes
+STATUS_CANCELLED = -8
+STATUS_TIME_LIMIT = -9
+
+
+def info_dtype(int_dtype=np.int64, float_dtype=np.float64):
+    """ Return the numpy structured dtype equivalent to the C `Info` struct,
+    used for batches of solver info.
+
+    The layout depends on the C integer and float types the extension module
+    is compiled with, given by `int_dtype` and `float_dtype`.
+    """
+    return np.dtype([('iter', int_dtype),
+                     ('status', 'S32'),
+                     ('statusVal', int_dtype),
+                     ('pobj', float_dtype),
+                     ('dobj', float_dtype),
+                     ('resPri', float_dtype),
+                     ('resDual', float_dtype),
+                     ('resInfeas', float_dtype),
+                     ('resUnbdd', float_dtype),
+                     ('relGap', float_dtype),
+                     ('setupTime', float_dtype),
+                     ('solveTime', float_dtype)], align=True)
 
 
 def default_settings():
@@ -67,14 +119,20 @@ def default_settings():
                        alpha = 1.5,
                        cg_rate = 2.0,
                        verbose = True,
-                       use_indirect=False)
+                       use_indirect=False,
+                       dtype=np.float64,
+                       callback=None,
+                       callback_stride=100,
+                       time_limit=None,
+                       presolve=False)
     return stg_default
 
 
-def format_and_copy_cone(cone_in):
+def format_and_copy_cone(cone_in, int_dtype=np.int64, float_dtype=np.float64):
     """ Make a cone dictionary with the proper keys and numpy arrays.
 
     Converts from cones with q,s,p as lists or numpy arrays with improper type.
+    q,s are converted to arrays with dtype `int_dtype`, and p to `float_dtype`.
 
     Makes a *deep* copy, creating and copying data for numpy arrays.
 
@@ -88,49 +146,60 @@ def format_and_copy_cone(cone_in):
 
     for key in 'q', 's':
         if key in cone_in and len(cone_in[key]) > 0:
-            cone_out[key] = np.array(cone_in[key], dtype=np.int64)
+            cone_out[key] = np.array(cone_in[key], dtype=int_dtype)
 
     if 'p' in cone_in and len(cone_in['p']) > 0:
-        cone_out['p'] = np.array(cone_in['p'], dtype=np.float64)
+        cone_out['p'] = np.array(cone_in['p'], dtype=float_dtype)
 
     return cone_out
 
 def cone_len(cone):
-    total = 0
-
-    if 'f' in cone:
-        total += cone['f']
-
-    if 'l' in cone:
-        total += cone['l']
-
-    if 'ep' in cone:
-        total += 3*cone['ep']
+    """ Return the number of rows of `A` described by the cone.
+    """
+    if isinstance(cone, Cone):
+        return cone.size
 
-    if 'ed' in cone:
-        total += 3*cone['ed']
+    total = cone.get('f', 0) + cone.get('l', 0) + 3*(cone.get('ep', 0) + cone.get('ed', 0))
 
     if 'q' in cone:
-        total += sum(cone['q'])
+        total += int(np.sum(cone['q']))
 
     if 's' in cone:
-        s = cone['s']
-        # numpy array operations
-        total += sum(s*(s+1)/2)
+        s = np.asarray(cone['s'], dtype=np.int64)
+        total += int(np.sum(s*(s+1)//2))
 
     if 'p' in cone:
         total += 3*len(cone['p'])
 
-    return total
+    return int(total)
+
+def fingerprint(A, cone, values=False):
+    """ Return a hex digest identifying the sparsity structure of the CSC
+    matrix `A` and the cone, and also the values of `A` if `values` is true.
+    """
+    h = hashlib.sha1(repr(A.shape).encode())
+
+    arrays = [A.indptr, A.indices] + ([A.data] if values else [])
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(a.dtype.str.encode())
+        h.update(a)
+
+    cone = sorted((k, np.asarray(v).tolist()) for k, v in cone.items())
+    h.update(repr(cone).encode())
+
+    return h.hexdigest()
+
 
 def not_met(*vargs):
     return not all(vargs)
 
 
-def check_data(data, cone):
+def check_data(data, cone, int_dtype=np.int64, float_dtype=np.float64):
     """ Check the correctness of input data.
-    A is CSC with int64 indices and float64 values
-    b,c are float64 vectors, with correct sizes
+    A is CSC with `int_dtype` (default int64) indices and `float_dtype`
+    (default float64) values
+    b,c are `float_dtype` vectors, with correct sizes
 
     If all datatypes are OK, returns *new* dictionary with *same* A, b, c objects.
 
@@ -155,26 +224,31 @@ def check_data(data, cone):
         raise TypeError("A is required to be a scipy sparse matrix.")
 
     if not sp.isspmatrix_csc(A):
-        warn("Converting A to a scipy CSC (compressed sparse column) matrix; may take a while.")
-        A = A.tocsc()
+        if A.format not in ('coo', 'csr'):
+            warn("Converting A to a scipy CSC (compressed sparse column) matrix; may take a while.")
+            A = A.tocoo()
+        # one pass, straight to the dtypes SCS reads
+        A = to_csc(A, int_dtype, float_dtype)
 
     m,n = A.shape
-    check_bc(b,c,m,n)
+    check_bc(b,c,m,n,float_dtype)
 
-    if not_met(A.indptr.dtype == np.int64, A.indices.dtype == np.int64):
-        warn("Converting A.indptr and A.indices to arrays with dtype = numpy.int64")
+    if not_met(A.indptr.dtype == int_dtype, A.indices.dtype == int_dtype):
+        msg = "Converting A.indptr and A.indices to arrays with dtype = numpy.{}"
+        warn(msg.format(np.dtype(int_dtype).name))
         # copy the matrix to avoid modifying original
         A = sp.csc_matrix(A)
-        A.indptr = A.indptr.astype(np.int64)
-        A.indices = A.indices.astype(np.int64)
+        A.indptr = A.indptr.astype(int_dtype)
+        A.indices = A.indices.astype(int_dtype)
 
-    if not_met(A.data.dtype == np.float64):
-        warn("Converting A.data to array with dtype = numpy.float64")
+    if not_met(A.data.dtype == float_dtype):
+        warn("Converting A.data to array with dtype = numpy.{}".format(np.dtype(float_dtype).name))
         # copy the matrix to avoid modifying original
         A = sp.csc_matrix(A)
-        A.data = A.data.astype(np.float64)
+        A.data = A.data.astype(float_dtype)
 
-    if not_met(cone_len(cone) > 0, A.shape[0] == cone_len(cone)):
+    rows = cone_len(cone)
+    if not_met(rows > 0, A.shape[0] == rows):
         raise ValueError('The cones must match the number of rows of A.')
 
 
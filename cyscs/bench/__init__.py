@@ -0,0 +1,27 @@
+""" Benchmarks of the CySCS solver, for tracking performance regressions.
+
+Sweeps the problems in `cyscs.bench.PROBLEMS` over problem size, direct and
+indirect solvers, thread and process counts, and cold and warm starts,
+recording setup time, solve time, iterations, time per iteration and peak
+memory. Results are plain `dict` objects, which can be written to JSON and
+compared against a saved baseline.
+
+Run from the command line with `python -m cyscs.bench`; see
+`python -m cyscs.bench --help`.
+
+Functions
+---------
+- `cyscs.bench.cases()`: The benchmark cases of a sweep
+- `cyscs.bench.run_case()`: Run one benchmark case
+- `cyscs.bench.run()`: Run a sweep, returning the results with metadata
+- `cyscs.bench.compare()`: Find regressions against baseline results
+- `cyscs.bench.tile()`: Stack copies of a problem into one larger problem
+
+Modules
+-------
+- `cyscs.bench.memory`: Memory profiling of `solve()` and `Workspace`, and
+checks for memory growth across repeated calls
+"""
+
+from ._bench import (PROBLEMS, Case, cases, run_case, run, compare, tile,
+                     peak_rss)
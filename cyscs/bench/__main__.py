@@ -0,0 +1,104 @@
+""" Command line interface to the CySCS benchmarks.
+
+Examples
+--------
+Benchmark the default sweep, saving a baseline::
+
+    python -m cyscs.bench -o baseline.json
+
+Later, check for regressions against it, exiting with status 1 if any
+metric grew by more than 25%::
+
+    python -m cyscs.bench -o results.json --baseline baseline.json
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+
+from ._bench import PROBLEMS, cases, run, compare
+
+
+_COLUMNS = [('problem', '{:>11}'), ('size', '{:>7}'), ('indirect', '{:>8}'),
+            ('threads', '{:>7}'), ('processes', '{:>9}'), ('warm', '{:>5}'),
+            ('nnz', '{:>9}'), ('setup_time', '{:>10}'), ('solve_time', '{:>10}'),
+            ('iter', '{:>6}'), ('time_per_iter', '{:>13}'), ('peak_rss', '{:>10}')]
+
+
+def _format(value):
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return '{:.3g}'.format(value)
+    return str(value)
+
+
+def _print_row(result):
+    print(' '.join(fmt.format(_format(result[key])) for key, fmt in _COLUMNS))
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog='python -m cyscs.bench',
+                                     description='Benchmark the CySCS solver.')
+    parser.add_argument('--problems', nargs='+', default=['l1', 'socp'],
+                        choices=sorted(PROBLEMS), help='problem families')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 400],
+                        help='problem sizes')
+    parser.add_argument('--solvers', nargs='+', default=['direct', 'indirect'],
+                        choices=['direct', 'indirect'], help='linear system solvers')
+    parser.add_argument('--threads', nargs='+', type=int, default=[1],
+                        help='thread counts for cyscs.solve_many()')
+    parser.add_argument('--processes', nargs='+', type=int, default=[0],
+                        help='process counts for cyscs.ProcessSolver (0 for none)')
+    parser.add_argument('--start', nargs='+', default=['cold', 'warm'],
+                        choices=['cold', 'warm'], help='cold or warm starts')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per case; the minimum time is reported')
+    parser.add_argument('--batch', type=int, default=None,
+                        help='problems per batch with several threads or processes')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative increase over the baseline counted as a regression')
+    return parser
+
+
+def main(argv=None):
+    """ Run the benchmarks, returning the exit status: 1 if there are
+    regressions against the baseline, and 0 otherwise.
+    """
+    args = _parser().parse_args(argv)
+
+    case_list = cases(problems=args.problems, sizes=sorted(args.sizes),
+                      indirect=[s == 'indirect' for s in args.solvers],
+                      threads=args.threads, processes=args.processes,
+                      warm=[s == 'warm' for s in args.start])
+
+    print(' '.join(fmt.format(key) for key, fmt in _COLUMNS))
+    results = run(case_list, repeat=args.repeat, batch=args.batch, seed=args.seed,
+                  progress=_print_row)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        for r in regressions:
+            case = ' '.join('{}={}'.format(k, v) for k, v in r['case'].items())
+            print('REGRESSION {}: {} {:.3g} -> {:.3g} ({:.2f}x)'.format(
+                case, r['metric'], r['baseline'], r['value'], r['ratio']))
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+""" Benchmark cases, timing, and comparison against a baseline.
+"""
+import itertools
+import multiprocessing
+import platform
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+
+import numpy as np
+import scipy.sparse as sp
+
+import cyscs
+from cyscs import examples
+
+
+def tile(data, cone, k):
+    """ Return a problem made of `k` independent copies of the input problem.
+
+    The copies are stacked block diagonally, with the rows of `A` and `b`
+    reordered so that the cones of all the copies are grouped in the order
+    SCS expects (`f`, `l`, `q`, `s`, `ep`, `ed`, `p`).
+    """
+    A = sp.csc_matrix(data['A'])
+    (m, n), nnz = A.shape, A.nnz
+
+    s = np.asarray(cone.get('s', []), dtype=np.int64)
+    lengths = [cone.get('f', 0), cone.get('l', 0), int(np.sum(cone.get('q', []))),
+               int(np.sum(s*(s+1)//2)), 3*cone.get('ep', 0), 3*cone.get('ed', 0),
+               3*len(cone.get('p', []))]
+    starts = np.cumsum([0] + lengths[:-1])
+
+    # for each cone type, the rows of that type from every copy
+    perm = np.concatenate([(np.arange(k)[:, None]*m + start + np.arange(size)).ravel()
+                           for start, size in zip(starts, lengths)])
+    new_row = np.empty_like(perm)
+    new_row[perm] = np.arange(k*m)
+
+    copies = np.arange(k)[:, None]
+    indices = new_row[(A.indices[None, :] + m*copies).ravel()]
+    indptr = np.append((A.indptr[:-1][None, :] + nnz*copies).ravel(), k*nnz)
+
+    A = sp.csc_matrix((np.tile(A.data, k), indices.astype(np.int64),
+                       indptr.astype(np.int64)), shape=(k*m, k*n))
+    A.sort_indices()
+
+    b = np.tile(data['b'], k)[perm]
+    c = np.tile(data['c'], k)
+
+    out = {}
+    for key in 'f', 'l', 'ep', 'ed':
+        if cone.get(key):
+            out[key] = k*cone[key]
+    for key in 'q', 's', 'p':
+        if len(cone.get(key, [])) > 0:
+            out[key] = list(cone[key])*k
+
+    return dict(A=A, b=b, c=c), out
+
+
+def _tiled(example):
+    def problem(size, seed=0):
+        data, cone = example()[:2]
+        return tile(data, cone, size)
+
+    problem.__doc__ = "{} copies of `cyscs.examples.{}()`.".format('`size`', example.__name__)
+    return problem
+
+
+def _l1(size, seed=0):
+    """ `cyscs.examples.l1()` with `m = size`.
+    """
+    return examples.l1(m=size, seed=seed)
+
+
+def _random(generator, density):
+    def problem(size, seed=0):
+        return generator(size, density=density, seed=seed)[:2]
+
+    problem.__doc__ = "`cyscs.examples.{}(size)`.".format(generator.__name__)
+    return problem
+
+
+# benchmark problems: name -> function(size, seed) returning (data, cone)
+PROBLEMS = dict(l1=_l1,
+                lp=_tiled(examples.simple_lp),
+                socp=_tiled(examples.simple_socp),
+                sdp=_tiled(examples.simple_sdp),
+                ecp=_tiled(examples.simple_ecp),
+                pcp=_tiled(examples.simple_pcp),
+                random_lp=_random(examples.random_lp, 0.01),
+                random_socp=_random(examples.random_socp, 0.01),
+                random_sdp=_random(examples.random_sdp, 0.01),
+                random_ecp=_random(examples.random_ecp, 0.01),
+                random_pcp=_random(examples.random_pcp, 0.01),
+                lasso=_random(examples.sparse_lasso, 0.1),
+                portfolio=_random(examples.portfolio, 0.1))
+
+
+Case = namedtuple('Case', 'problem size indirect threads processes warm')
+Case.__doc__ = """ One benchmark case.
+
+problem : str
+    Key of `PROBLEMS`.
+size : int
+    Problem size, passed to the problem function.
+indirect : bool
+    Use the indirect solver.
+threads : int
+    Number of threads solving a batch of problems with `cyscs.solve_many()`.
+processes : int
+    If positive, the number of worker processes solving a batch of problems
+    with `cyscs.ProcessSolver`, instead of threads.
+warm : bool
+    Warm start each solve from the solution of the unperturbed problem.
+"""
+
+
+def cases(problems=('l1',), sizes=(100,), indirect=(False,), threads=(1,),
+          processes=(0,), warm=(False,)):
+    """ Return the list of `Case` tuples of a sweep over every combination of
+    the arguments, skipping those with both several threads and processes.
+    """
+    out = []
+    for case in itertools.product(problems, sizes, indirect, threads, processes, warm):
+        case = Case(*case)
+        if case.problem not in PROBLEMS:
+            raise ValueError("Unknown benchmark problem: {}".format(case.problem))
+        if case.processes > 0 and case.threads > 1:
+            continue
+        out.append(case)
+
+    return out
+
+
+def peak_rss():
+    """ Return the peak resident set size of this process in bytes, or `None`
+    if it is not available on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == 'darwin' else 1024*rss
+
+
+def _perturbed(data, rng, scale=0.01):
+    """ Return a copy of the problem data with `b` randomly perturbed.
+    """
+    b = data['b']*(1 + scale*rng.randn(len(data['b'])))
+    return dict(A=data['A'], b=b, c=data['c'])
+
+
+def run_case(case, repeat=3, batch=None, seed=0, **settings):
+    """ Run one benchmark case, returning a `dict` of results.
+
+    For a single thread, the setup time is the time to create a `Workspace`
+    and the solve time the time of `Workspace.solve()`, each the minimum over
+    `repeat` runs. Warm solves solve a perturbed problem, warm started from
+    the solution of the original one.
+
+    Otherwise, a batch of `batch` perturbed problems (by default, two per
+    worker) is solved with `cyscs.solve_many()` or `cyscs.ProcessSolver`, and
+    the solve time is the minimum wall time of the batch, including setup.
+    Worker processes are started by an untimed first batch, and cache the
+    `Workspace` of the problem, so later batches skip most of the setup.
+    The iterations are the total over the batch, so the time per iteration
+    reflects the parallel speedup.
+
+    `peak_rss` is the growth of the peak resident set size of this process
+    during the case, in bytes, or `None` if it is not available. Only memory
+    above the earlier peak of the process is counted, so `run()` runs each
+    case in a new process. It does not include the memory of worker
+    processes.
+    """
+    rss_base = peak_rss()
+    result = _run_case(case, repeat, batch, seed, settings)
+
+    result['peak_rss'] = None if rss_base is None else peak_rss() - rss_base
+    return result
+
+
+def _run_case(case, repeat, batch, seed, settings):
+    rng = np.random.RandomState(seed)
+    data, cone = PROBLEMS[case.problem](case.size, seed)
+
+    stg = dict(verbose=False)
+    stg.update(settings, use_indirect=case.indirect)
+
+    warm_start = None
+    if case.warm:
+        warm_start = cyscs.solve(data, cone, **stg)
+
+    workers = case.processes or case.threads
+    if workers > 1 or case.processes > 0:
+        setup_time, solve_time, iters = _run_batch(case, data, cone, warm_start, rng,
+                                                   repeat, batch or 2*workers, stg)
+    else:
+        setup_time, solve_time, iters = _run_serial(data, cone, warm_start, rng,
+                                                    repeat, stg)
+
+    A = data['A']
+    return dict(case._asdict(), m=A.shape[0], n=A.shape[1], nnz=A.nnz,
+                setup_time=setup_time, solve_time=solve_time, iter=iters,
+                time_per_iter=solve_time/max(iters, 1))
+
+
+def _run_serial(data, cone, warm_start, rng, repeat, stg):
+    setup_times, solve_times = [], []
+    for _ in range(repeat):
+        start = timer()
+        work = cyscs.Workspace(data, cone, **stg)
+        setup_times.append(timer() - start)
+
+        new_bc = None
+        if warm_start is not None:
+            new_bc = dict(b=_perturbed(data, rng)['b'])
+
+        start = timer()
+        sol = work.solve(new_bc, warm_start)
+        solve_times.append(timer() - start)
+
+    return min(setup_times), min(solve_times), int(sol['info']['iter'])
+
+
+def _run_batch(case, data, cone, warm_start, rng, repeat, batch, stg):
+    problems = [(_perturbed(data, rng), cone) for _ in range(batch)]
+    warm_starts = [warm_start]*batch
+
+    solver = None
+    if case.processes > 0:
+        solver = cyscs.ProcessSolver(workers=case.processes)
+        # start the workers before timing
+        solver.solve_many(problems[:case.processes], warm_starts[:case.processes], **stg)
+
+    try:
+        solve_times = []
+        for _ in range(repeat):
+            start = timer()
+            if solver is not None:
+                sols = solver.solve_many(problems, warm_starts, **stg)
+            else:
+                sols = cyscs.solve_many(problems, workers=case.threads,
+                                        warm_starts=warm_starts, **stg)
+            solve_times.append(timer() - start)
+    finally:
+        if solver is not None:
+            solver.close()
+
+    return None, min(solve_times), int(sum(sol['info']['iter'] for sol in sols))
+
+
+def _meta():
+    try:
+        version = cyscs.version()
+    except Exception:
+        # not installed, e.g. built in place
+        version = None
+
+    return dict(cyscs=version, scs=cyscs.scs_version(), python=platform.python_version(),
+                numpy=np.__version__, platform=platform.platform(),
+                machine=platform.machine(), time=time.strftime('%Y-%m-%dT%H:%M:%S'))
+
+
+def _run_in_process(case, repeat, batch, seed, settings):
+    """ Run `run_case()` in a new process, so that its `peak_rss` does not
+    depend on the cases run before it.
+    """
+    # spawned rather than forked, so it does not inherit the peak of this process
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_case, case, repeat, batch, seed, **settings).result()
+
+
+def run(case_list, repeat=3, batch=None, seed=0, progress=None, **settings):
+    """ Run each case of `case_list` in a new process, returning a
+    JSON-serializable `dict` with keys `meta`, describing the versions and
+    platform, and `results`, the list of `run_case()` results.
+
+    `progress`, if given, is called with each result as it completes.
+    """
+    results = []
+    for case in case_list:
+        result = _run_in_process(case, repeat, batch, seed, settings)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+
+    return dict(meta=_meta(), results=results)
+
+
+_TIMES = 'setup_time', 'solve_time', 'time_per_iter'
+
+
+def _key(result):
+    return tuple(result[field] for field in Case._fields)
+
+
+def compare(results, baseline, tolerance=0.25, min_time=1e-3, min_rss=2**20,
+            metrics=('setup_time', 'solve_time', 'time_per_iter', 'iter', 'peak_rss')):
+    """ Compare `run()` results against a baseline `run()` output.
+
+    Returns a list of regressions, one `dict` per case and metric, with keys
+    `case`, `metric`, `baseline`, `value`, and `ratio`, for each metric which
+    grew by more than a fraction `tolerance` over the baseline.
+    Times where both values are below `min_time` seconds, and `peak_rss`
+    where both are below `min_rss` bytes, are ignored as noise. Any growth
+    from a zero baseline that is not ignored is a regression, with an
+    infinite `ratio`.
+    Cases missing from either input are skipped.
+    """
+    base = {_key(r): r for r in baseline['results']}
+
+    regressions = []
+    for result in results['results']:
+        old = base.get(_key(result))
+        if old is None:
+            continue
+
+        for metric in metrics:
+            a, b = old.get(metric), result.get(metric)
+            if a is None or b is None:
+                continue
+            if metric in _TIMES:
+                t = 'solve_time' if metric == 'time_per_iter' else metric
+                if max(old[t], result[t]) < min_time:
+                    continue
+            if metric == 'peak_rss' and max(a, b) < min_rss:
+                continue
+            if b > (1 + tolerance)*a:
+                regressions.append(dict(case=Case(*_key(result))._asdict(), metric=metric,
+                                        baseline=a, value=b,
+                                        ratio=b/a if a > 0 else float('inf')))
+
+    return regressions
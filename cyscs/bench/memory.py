@@ -0,0 +1,285 @@
+""" Memory profiling of `cyscs.solve()` and `cyscs.Workspace`.
+
+`measure()` reports the peak and retained memory of a call, both as traced
+by `tracemalloc` (Python and numpy allocations) and as sampled from the
+resident set size (which also covers the C solver's allocations), and
+attributes the traced bytes to the copies made by `check_data()`,
+`as_cone()`, `_private_A()` and the solution allocation.
+
+`measure_growth()` repeats a call and fits the memory growth per call, to
+catch leaks in long-lived processes which re-solve the same `Workspace`.
+
+Run from the command line with `python -m cyscs.bench.memory`, which exits
+with status 1 if memory grows across repeated calls.
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+import cyscs
+from cyscs import _scs
+from ._bench import PROBLEMS
+
+
+def rss():
+    """ Return the current resident set size of this process in bytes, or
+    `None` if it cannot be read on this platform.
+    """
+    try:
+        # a raw read, since open() itself shows up as traced growth
+        fd = os.open('/proc/self/statm', os.O_RDONLY)
+        try:
+            statm = os.read(fd, 256)
+        finally:
+            os.close(fd)
+        return int(statm.split()[1])*os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        pass
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    return psutil.Process().memory_info().rss
+
+
+class _RSSSampler(object):
+    """ Context manager sampling the resident set size on a background
+    thread, recording its maximum.
+
+    SCS releases the GIL, so the thread keeps sampling during the C solve.
+    """
+
+    def __init__(self, interval=1e-3):
+        self.interval = interval
+        self.peak = rss()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def _sample(self):
+        current = rss()
+        if current is not None and (self.peak is None or current > self.peak):
+            self.peak = current
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+        self._sample()
+
+
+# functions of `cyscs._scs` whose copies are attributed, and their labels
+_COPIES = [('check_data', 'check_data'),
+           ('as_cone', 'cone'),
+           ('_private_A', 'private_A'),
+           ('_make_sol', 'solution')]
+
+
+@contextmanager
+def _attributed(copies):
+    """ Temporarily wrap the functions in `_COPIES`, adding the traced bytes
+    still allocated when each returns (the copies it made) to `copies`.
+    """
+    originals = {name: getattr(_scs, name) for name, _ in _COPIES}
+
+    def wrap(func, label):
+        def wrapper(*args, **kwargs):
+            before = tracemalloc.get_traced_memory()[0]
+            result = func(*args, **kwargs)
+            copies[label] += tracemalloc.get_traced_memory()[0] - before
+            return result
+        return wrapper
+
+    for name, label in _COPIES:
+        copies[label] = 0
+        setattr(_scs, name, wrap(originals[name], label))
+
+    try:
+        yield copies
+    finally:
+        for name, func in originals.items():
+            setattr(_scs, name, func)
+
+
+@contextmanager
+def _tracing():
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def _traced():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def measure(func, interval=1e-3):
+    """ Measure the memory used by calling `func()`.
+
+    Returns a `dict` of sizes in bytes, relative to the memory in use
+    before the call:
+    - `peak`: peak traced memory during the call
+    - `result`: traced memory held by the returned object
+    - `retained`: traced memory still held after the result is freed
+    - `rss_peak`, `rss_retained`: the same, for the sampled resident set size,
+      or `None` if it is not available
+    - `copies`: a `dict` of the traced bytes allocated by `check_data`,
+      `cone` (converting a cone `dict` to a `Cone`), `private_A` and
+      `solution` (allocating `x`, `y`, `s`), and still held when they return
+    """
+    copies = {}
+    with _tracing():
+        base = _traced()
+        rss_base = rss()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+        with _RSSSampler(interval) as sampler, _attributed(copies):
+            result = func()
+
+        peak = tracemalloc.get_traced_memory()[1] - base
+        held = _traced() - base
+        del result
+        retained = _traced() - base
+        rss_after = rss()
+
+    def relative(value):
+        return None if value is None or rss_base is None else value - rss_base
+
+    return dict(peak=peak, result=held - retained, retained=retained,
+                rss_peak=relative(sampler.peak), rss_retained=relative(rss_after),
+                copies=copies)
+
+
+def measure_growth(func, n=50, warmup=5):
+    """ Call `func()` `warmup` times, and then `n` more times, recording the
+    traced memory and the resident set size after each of the `n` calls.
+
+    Returns a `dict` with arrays `traced` and `rss` of the memory after each
+    call, relative to the first, and the median growth per call,
+    `traced_per_call` and `rss_per_call`, in bytes. The median ignores
+    one-off steps, such as a cache being resized, but not steady leaks.
+    RSS entries are `None` if it is not available.
+    """
+    traced, rss_after = np.zeros(n), np.zeros(n)
+    with _tracing():
+        # one-off allocations, such as caches, happen while tracing
+        for _ in range(warmup):
+            func()
+
+        for i in range(n):
+            func()
+            traced[i] = _traced()
+            rss_after[i] = rss() or 0
+
+    def per_call(y):
+        return float(np.median(np.diff(y))) if n > 1 else 0.0
+
+    has_rss = rss() is not None
+    return dict(traced=traced - traced[0], traced_per_call=per_call(traced),
+                rss=rss_after - rss_after[0] if has_rss else None,
+                rss_per_call=per_call(rss_after) if has_rss else None)
+
+
+def leaks(growth, traced_limit=64, rss_limit=4096):
+    """ Return `True` if the `measure_growth()` results grow by more than
+    `traced_limit` traced bytes or `rss_limit` bytes of RSS per call.
+    """
+    if growth['traced_per_call'] > traced_limit:
+        return True
+
+    return growth['rss_per_call'] is not None and growth['rss_per_call'] > rss_limit
+
+
+def scenarios(data, cone, **settings):
+    """ Return a `dict` of the profiled calls for a problem: `solve`,
+    `workspace` (creating a `Workspace`), and `resolve` (solving a
+    `Workspace` created beforehand).
+    """
+    stg = dict(verbose=False)
+    stg.update(settings)
+
+    work = cyscs.Workspace(data, cone, **stg)
+
+    return dict(solve=lambda: cyscs.solve(data, cone, **stg),
+                workspace=lambda: cyscs.Workspace(data, cone, **stg),
+                resolve=lambda: work.solve())
+
+
+def _mb(value):
+    return '-' if value is None else '{:.3f}'.format(value/2.0**20)
+
+
+def main(argv=None):
+    """ Profile the scenarios, returning the exit status: 1 if memory grows
+    across repeated calls, and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog='python -m cyscs.bench.memory',
+                                     description='Profile the memory use of CySCS.')
+    parser.add_argument('--problem', default='l1', choices=sorted(PROBLEMS),
+                        help='problem family')
+    parser.add_argument('--size', type=int, default=100, help='problem size')
+    parser.add_argument('--indirect', action='store_true', help='use the indirect solver')
+    parser.add_argument('-n', '--repeat', type=int, default=20,
+                        help='calls when checking for memory growth')
+    parser.add_argument('--traced-limit', type=float, default=64,
+                        help='allowed traced growth per call, in bytes')
+    parser.add_argument('--rss-limit', type=float, default=4096,
+                        help='allowed RSS growth per call, in bytes')
+    args = parser.parse_args(argv)
+
+    data, cone = PROBLEMS[args.problem](args.size)
+    calls = scenarios(data, cone, use_indirect=args.indirect)
+
+    print('sizes in MB')
+    print('{:>10} {:>8} {:>8} {:>8} {:>8} {:>8}  {}'.format(
+        'call', 'peak', 'result', 'retained', 'rss_peak', 'rss_kept', 'copies'))
+
+    leaked = False
+    for name in 'solve', 'workspace', 'resolve':
+        m = measure(calls[name])
+        copies = ', '.join('{}={}'.format(k, _mb(v)) for k, v in sorted(m['copies'].items()) if v)
+        print('{:>10} {:>8} {:>8} {:>8} {:>8} {:>8}  {}'.format(
+            name, _mb(m['peak']), _mb(m['result']), _mb(m['retained']),
+            _mb(m['rss_peak']), _mb(m['rss_retained']), copies))
+
+    print()
+    print('growth over {} calls, in bytes per call'.format(args.repeat))
+    for name in 'solve', 'workspace', 'resolve':
+        growth = measure_growth(calls[name], n=args.repeat)
+        leak = leaks(growth, args.traced_limit, args.rss_limit)
+        leaked = leaked or leak
+
+        rss_per_call = growth['rss_per_call']
+        print('{:>10} traced {:>10.1f}  rss {:>10}  {}'.format(
+            name, growth['traced_per_call'],
+            '-' if rss_per_call is None else '{:.1f}'.format(rss_per_call),
+            'GROWING' if leak else 'ok'))
+
+    return 1 if leaked else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
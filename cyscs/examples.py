@@ -4,11 +4,16 @@ Demonstrates proper input format (particularly for SDP).
 Also used for testing and benchmarking.
 
 Functions return cone, data, and (possibly) the known solution.
+
+The `random_*` generators, `sparse_lasso()` and `portfolio()` build large,
+seedable problems with vectorized code, for load testing.
 """
 
 import numpy as np
 import scipy.sparse as sp
 
+from ._sdp import svec, svec_indices
+
 def simple_lp():
     ij = np.array([[0,1,2,3],[0,1,2,3]])
     A = sp.csc_matrix(([-1.,-1.,1.,1.], ij), (4,4))
@@ -158,23 +163,285 @@ def l1(m=100, seed=0):
     n = 2*m
     np.random.seed(seed)
 
-    C = sp.rand(m, n, 0.1, format='csc')
-    Ae = sp.hstack([C, sp.csc_matrix((m, n))], format="csc")
+    C = sp.rand(m, n, 0.1, format='coo')
     h = np.zeros(2 * n)
     d = np.random.randn(m)
     bt = np.hstack([d, h])  # in cone formulation
     c = np.hstack([np.zeros(n), np.ones(n)])
-    I = sp.eye(n)
-    G = sp.vstack([sp.hstack([I, -I]), sp.hstack([-I, -I])], format="csc")
-    At = sp.vstack([Ae, G], format="csc")  # in cone formulation
-    At.indices = At.indices.astype(np.int64)
-    At.indptr = At.indptr.astype(np.int64)
+
+    # At = [[C, 0], [I, -I], [-I, -I]], built directly from its triplets
+    j = np.arange(n)
+    rows = np.concatenate([C.row, m + j, m + n + j, m + j, m + n + j])
+    cols = np.concatenate([C.col, j, j, n + j, n + j])
+    vals = np.concatenate([C.data, np.ones(n), -np.ones(n), -np.ones(n), -np.ones(n)])
+    At = _csc(vals, rows, cols, (m + 2*n, 2*n))
 
     data = {'A': At, 'b': bt, 'c': c}
     cone = {'l': 2 * n, 'f': m}
     #opts = {'normalize': True}
 
-    # the unstuffed problem data
-    extra = dict(C=C,d=d)
-
     return data, cone
+
+
+# Large, random problems.
+#
+# The generators below build their matrices with vectorized numpy code,
+# and are meant for load testing: with their sizes and densities scaled up,
+# they produce problems with millions of nonzeros in a few seconds.
+#
+# Those which return a known solution `true_x` construct it as in the SCS
+# test suite: draw `x`, and `s` in the cone and `y` in the dual cone with
+# `s'y = 0`, then set `b = Ax + s` and `c = -A'y`. These `(x, y, s)` satisfy
+# the optimality conditions, so the optimal value is `c'x = -b'y`.
+
+def _csc(vals, rows, cols, shape):
+    """ CSC matrix with int64 indices from triplets, summing duplicates.
+    """
+    A = sp.csc_matrix((vals, (rows, cols)), shape=shape)
+    A.indices = A.indices.astype(np.int64)
+    A.indptr = A.indptr.astype(np.int64)
+    return A
+
+def sparse_matrix(m, n, density=0.01, rng=None):
+    """ Random `m` by `n` CSC matrix, with about `density*m` normally
+    distributed nonzeros in each column, built directly in CSC format.
+    """
+    rng = np.random.RandomState(0) if rng is None else rng
+    k = min(m, max(1, int(round(density*m))))
+
+    indices = np.sort(rng.randint(m, size=(n, k)), axis=1).ravel()
+    indptr = np.arange(n + 1, dtype=np.int64)*k
+    A = sp.csc_matrix((rng.randn(n*k), indices.astype(np.int64), indptr), shape=(m, n))
+
+    # drawn rows may repeat within a column
+    A.sum_duplicates()
+    A.indices = A.indices.astype(np.int64)
+    A.indptr = A.indptr.astype(np.int64)
+    return A
+
+def _segments(sizes):
+    """ Segment index of each entry, and the start of each segment.
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    starts = np.cumsum(sizes) - sizes
+    return np.repeat(np.arange(len(sizes)), sizes), starts
+
+def _soc_pair(sizes, rng):
+    """ `s` and `y` on the boundary of second-order cones, with `s'y = 0`.
+    """
+    seg, starts = _segments(sizes)
+    v = rng.randn(len(seg))
+    v[starts] = 0
+    t = np.sqrt(np.add.reduceat(v**2, starts)) if len(starts) else v[:0]
+
+    s, y = v.copy(), -v
+    s[starts] = y[starts] = t
+
+    return s*rng.uniform(0.5, 2, len(sizes))[seg], y*rng.uniform(0.5, 2, len(sizes))[seg]
+
+def _psd_pair(sizes, rng):
+    """ `s` and `y` holding PSD matrices `S` and `Y` with `SY = 0`, in SCS's
+    scaled, lower-triangular format.
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    lengths = sizes*(sizes + 1)//2
+    _, starts = _segments(lengths)
+    s, y = np.zeros(lengths.sum()), np.zeros(lengths.sum())
+
+    # blocks of the same size are generated together
+    for n in np.unique(sizes):
+        blocks = np.flatnonzero(sizes == n)
+        k = len(blocks)
+
+        U = np.linalg.qr(rng.randn(k, n, n))[0]
+        # S has rank r, and Y has the complementary eigenvectors
+        r = rng.randint(0, n + 1, size=(k, 1))
+        on = np.arange(n) < r
+        lam = np.where(on, rng.uniform(0.5, 2, (k, n)), 0)
+        mu = np.where(on, 0, rng.uniform(0.5, 2, (k, n)))
+
+        idx = (starts[blocks][:, None] + np.arange(n*(n + 1)//2)).ravel()
+
+        for out, eig in (s, lam), (y, mu):
+            M = np.einsum('kij,kj,klj->kil', U, eig, U)
+            out[idx] = svec(M).ravel()
+
+    return s, y
+
+def _exp_pair(k, rng):
+    """ `s` on the boundary of the exponential cone, and `y` on the boundary
+    of its dual, with `s'y = 0`.
+    """
+    r = rng.uniform(-1, 1, k)
+    er = np.exp(r)
+    s = np.column_stack([r, np.ones(k), er])*rng.uniform(0.5, 2, (k, 1))
+    y = np.column_stack([-er, -er*(1 - r), np.ones(k)])*rng.uniform(0.5, 2, (k, 1))
+    return s.ravel(), y.ravel()
+
+def _pow_pair(p, rng):
+    """ `s` on the boundary of the power cones with exponents `p`, and `y`
+    on the boundary of their duals, with `s'y = 0`. Negative entries of `p`
+    denote dual power cones, with exponent `-p`.
+    """
+    k, dual = len(p), p < 0
+    p = np.abs(p)
+    x, w = rng.uniform(0.5, 2, k), rng.uniform(0.5, 2, k)
+    z = x**p * w**(1 - p)
+    sign = rng.choice([-1.0, 1.0], k)
+
+    s = np.column_stack([x, w, sign*z])*rng.uniform(0.5, 2, (k, 1))
+    y = np.column_stack([p*z/x, (1 - p)*z/w, -sign])*rng.uniform(0.5, 2, (k, 1))
+    s[dual], y[dual] = y[dual], s[dual]
+    return s.ravel(), y.ravel()
+
+def _cone_pair(cone, rng):
+    """ Complementary `s` in the cone and `y` in the dual cone, for each cone
+    type in the order SCS expects.
+    """
+    f, l = cone.get('f', 0), cone.get('l', 0)
+
+    # zero cone: s = 0, y free; linear cone: complementary supports
+    on = rng.rand(l) < 0.5
+    pairs = [(np.zeros(f), rng.randn(f)),
+             (np.where(on, rng.uniform(0.5, 2, l), 0), np.where(on, 0, rng.uniform(0.5, 2, l))),
+             _soc_pair(cone.get('q', []), rng),
+             _psd_pair(cone.get('s', []), rng)]
+
+    ep, ed = cone.get('ep', 0), cone.get('ed', 0)
+    pairs.append(_exp_pair(ep, rng))
+    # the dual exponential cone swaps the roles of s and y
+    pairs.append(_exp_pair(ed, rng)[::-1])
+
+    pairs.append(_pow_pair(np.asarray(cone.get('p', []), dtype=np.float64), rng))
+
+    return np.concatenate([s for s, _ in pairs]), np.concatenate([y for _, y in pairs])
+
+def random_cone_problem(cone, n=None, density=0.01, seed=0):
+    """ Random problem over `cone`, with a known solution.
+
+    `A` is a random sparse matrix with `n` columns (by default, half as many
+    as the rows), with about `density` of each column nonzero.
+
+    Returns `data`, `cone`, and an optimal `true_x`.
+    """
+    rng = np.random.RandomState(seed)
+
+    s, y = _cone_pair(cone, rng)
+    m = len(s)
+    n = max(1, m//2) if n is None else n
+
+    A = sparse_matrix(m, n, density, rng)
+    x = rng.randn(n)
+
+    b = A.dot(x) + s
+    c = -A.T.dot(y)
+
+    return dict(A=A, b=b, c=c), cone, x
+
+def random_lp(m=1000, n=None, density=0.01, seed=0):
+    """ Random LP with `m` inequality constraints and a known solution.
+    """
+    return random_cone_problem({'l': m}, n, density, seed)
+
+def random_socp(num_cones=1000, max_size=5, n=None, density=0.01, seed=0):
+    """ Random SOCP over many small second-order cones, with sizes between 2
+    and `max_size`, and a known solution.
+    """
+    sizes = np.random.RandomState(seed).randint(2, max_size + 1, num_cones)
+    return random_cone_problem({'q': sizes.tolist()}, n, density, seed)
+
+def random_sdp(num_blocks=10, max_size=20, n=None, density=0.01, seed=0):
+    """ Random SDP over PSD blocks with sizes between 1 and `max_size`, and a
+    known solution.
+    """
+    sizes = np.random.RandomState(seed).randint(1, max_size + 1, num_blocks)
+    return random_cone_problem({'s': sizes.tolist()}, n, density, seed)
+
+def random_ecp(num_cones=1000, n=None, density=0.01, seed=0):
+    """ Random problem over exponential cones and their duals, with a known
+    solution.
+    """
+    cone = {'ep': num_cones - num_cones//2, 'ed': num_cones//2}
+    return random_cone_problem(cone, n, density, seed)
+
+def random_pcp(num_cones=1000, n=None, density=0.01, seed=0):
+    """ Random problem over power cones with random exponents, with a known
+    solution.
+    """
+    p = np.random.RandomState(seed).uniform(0.1, 0.9, num_cones)
+    return random_cone_problem({'p': p.tolist()}, n, density, seed)
+
+def sparse_lasso(m=1000, n=None, density=0.1, lam=None, seed=0):
+    """ Lasso problem with a random sparse `C`, `n = 2*m` by default:
+
+    min. (1/2)||Cx - d||^2 + lam*||x||_1
+
+    The variables are `(x, u, t)`, and the problem is stuffed as
+
+    min. (1/2)t + lam*sum(u)
+    s.t. -u <= x <= u
+         ||(t - 1, 2(Cx - d))|| <= t + 1
+
+    Returns `data`, `cone`, and the unstuffed data `C`, `d`.
+    """
+    n = 2*m if n is None else n
+    rng = np.random.RandomState(seed)
+
+    C = sparse_matrix(m, n, density, rng).tocoo()
+    x0 = np.where(rng.rand(n) < 0.1, rng.randn(n), 0)
+    d = C.dot(x0) + 0.1*rng.randn(m)
+    # the solution is zero for lam >= ||C'd||_inf
+    lam = 0.1*np.abs(C.T.dot(d)).max() if lam is None else lam
+
+    j = np.arange(n)
+    rows = np.concatenate([j, n + j, j, n + j, 2*n + 2 + C.row, [2*n, 2*n + 1]])
+    cols = np.concatenate([j, j, n + j, n + j, C.col, [2*n, 2*n]])
+    vals = np.concatenate([np.ones(n), -np.ones(n), -np.ones(n), -np.ones(n),
+                           -2*C.data, [-1, -1]])
+    A = _csc(vals, rows, cols, (2*n + 2 + m, 2*n + 1))
+
+    b = np.concatenate([np.zeros(2*n), [1, -1], -2*d])
+    c = np.concatenate([np.zeros(n), lam*np.ones(n), [0.5]])
+    cone = {'l': 2*n, 'q': [m + 2]}
+
+    return dict(A=A, b=b, c=c), cone, dict(C=C.tocsc(), d=d)
+
+def portfolio(n_assets=1000, n_factors=None, density=0.1, gamma=1.0, seed=0):
+    """ Long-only portfolio problem with a factor risk model:
+
+    max. mu'w - gamma*w'(FF' + D)w
+    s.t. sum(w) = 1, w >= 0
+
+    `F` is a sparse `n_assets` by `n_factors` matrix, and `D` is diagonal.
+    The variables are `(w, f, t)`, with `f = F'w`, and the problem is
+    stuffed as
+
+    min. -mu'w + gamma*t
+    s.t. f = F'w, sum(w) = 1, w >= 0
+         ||(t - 1, 2sqrt(D)w, 2f)|| <= t + 1
+
+    Returns `data`, `cone`, and the unstuffed data `mu`, `F`, `D`.
+    """
+    n = n_assets
+    k = max(1, n//10) if n_factors is None else n_factors
+    rng = np.random.RandomState(seed)
+
+    F = sparse_matrix(n, k, density, rng).tocoo()
+    D = rng.uniform(0, np.sqrt(k), n)
+    mu = rng.randn(n)
+
+    i, j = np.arange(n), np.arange(k)
+    # rows: f = F'w (k), sum(w) = 1 (1), w >= 0 (n), then the cone (n + k + 2)
+    q = k + 1 + n
+    rows = np.concatenate([F.col, j, np.full(n, k), k + 1 + i,
+                           [q, q + 1], q + 2 + i, q + 2 + n + j])
+    cols = np.concatenate([F.row, n + j, i, i, [n + k, n + k], i, n + j])
+    vals = np.concatenate([F.data, -np.ones(k), np.ones(n), -np.ones(n),
+                           [-1, -1], -2*np.sqrt(D), -2*np.ones(k)])
+    A = _csc(vals, rows, cols, (q + n + k + 2, n + k + 1))
+
+    b = np.concatenate([np.zeros(k), [1], np.zeros(n), [1, -1], np.zeros(n + k)])
+    c = np.concatenate([-mu, np.zeros(k), [gamma]])
+    cone = {'f': k + 1, 'l': n, 'q': [n + k + 2]}
+
+    return dict(A=A, b=b, c=c), cone, dict(mu=mu, F=F.tocsc(), D=D)
@@ -0,0 +1,177 @@
+# Saving and loading the SCS workspace state, including the LDL factorization,
+# and refactoring it for new values of A.
+# Only included in the direct extension modules, since the indirect solver
+# has no factorization and its setup is cheap.
+
+cdef extern from "workio.h":
+    scs_int cyscs_factor_nnz(const Work* w)
+    void cyscs_save_work(const Work* w, scs_int* A_p, scs_int* A_i,
+                         scs_float* A_x, scs_float* Anorm_x, scs_float* D,
+                         scs_float* E, scs_float* means, scs_int* L_p,
+                         scs_int* L_i, scs_float* L_x, scs_float* L_D,
+                         scs_int* P)
+    Work* cyscs_load_work(const c_Data* d, const c_Cone* k,
+                          const scs_float* Anorm_x, const scs_float* D,
+                          const scs_float* E, const scs_float* means,
+                          scs_int lnz, const scs_int* L_p, const scs_int* L_i,
+                          const scs_float* L_x, const scs_float* L_D,
+                          const scs_int* P) nogil
+    scs_int cyscs_update_A(Work* w, const c_Cone* k, scs_float* values) nogil
+
+
+def save_state(Workspace work):
+    """ Return a `dict` of numpy arrays holding `A`, its normalized values,
+    the scaling vectors and the LDL factorization of the SCS workspace.
+    """
+    cdef:
+        scs_int m = work.c_data.m
+        scs_int n = work.c_data.n
+        scs_int nnz = work.c_A.p[n]
+        scs_int lnz = cyscs_factor_nnz(work._work)
+        scs_int k = m if work.c_settings.normalize else 0
+
+        scs_int[::1] A_p, A_i, L_p, L_i, P
+        scs_float[::1] A_x, Anorm_x, D, E, means, L_x, L_D
+
+    int_dtype = np.dtype('i{}'.format(sizeof(scs_int)))
+    float_dtype = np.dtype('f{}'.format(sizeof(scs_float)))
+
+    state = dict(A_p=np.empty(n+1, int_dtype), A_i=np.empty(nnz, int_dtype),
+                 A_x=np.empty(nnz, float_dtype), Anorm_x=np.empty(nnz, float_dtype),
+                 D=np.zeros(k, float_dtype),
+                 E=np.zeros(n if k else 0, float_dtype),
+                 means=np.zeros(2, float_dtype),
+                 L_p=np.empty(m+n+1, int_dtype), L_i=np.empty(lnz, int_dtype),
+                 L_x=np.empty(lnz, float_dtype), L_D=np.empty(m+n, float_dtype),
+                 P=np.empty(m+n, int_dtype))
+
+    A_p, A_i, A_x, Anorm_x = state['A_p'], state['A_i'], state['A_x'], state['Anorm_x']
+    D, E, means = state['D'], state['E'], state['means']
+    L_p, L_i, L_x, L_D, P = state['L_p'], state['L_i'], state['L_x'], state['L_D'], state['P']
+
+    # D and E are not written if `normalize` is off, so they may be empty
+    cyscs_save_work(work._work, &A_p[0], ptr_int(A_i), ptr_float(A_x),
+                    ptr_float(Anorm_x), ptr_float(D), ptr_float(E), &means[0],
+                    &L_p[0], ptr_int(L_i), ptr_float(L_x), &L_D[0], &P[0])
+
+    return state
+
+
+def load_workspace(dict data, Cone cone, dict settings, dict state):
+    """ Return a `Workspace` for the problem, with the SCS workspace rebuilt
+    from `save_state()` output instead of by `scs_init()`.
+
+    `data['A']` must hold the same matrix the state was saved from.
+    """
+    cdef:
+        Workspace work
+        scs_int m, n, nnz, lnz
+
+        const scs_float[::1] Anorm_x = state['Anorm_x']
+        const scs_float[::1] D = state['D']
+        const scs_float[::1] E = state['E']
+        const scs_float[::1] means = state['means']
+        const scs_int[::1] L_p = state['L_p']
+        const scs_int[::1] L_i = state['L_i']
+        const scs_float[::1] L_x = state['L_x']
+        const scs_float[::1] L_D = state['L_D']
+        const scs_int[::1] P = state['P']
+
+    work = Workspace(data, cone, settings, init=False)
+
+    m, n = work.c_data.m, work.c_data.n
+    nnz = work.c_A.p[n]
+    lnz = L_i.shape[0]
+
+    if Anorm_x.shape[0] != nnz or means.shape[0] != 2:
+        raise ValueError("Saved state does not match the matrix A.")
+
+    if work.c_settings.normalize and (D.shape[0] != m or E.shape[0] != n):
+        raise ValueError("Saved state does not match the normalize setting.")
+
+    if (L_p.shape[0] != m+n+1 or L_x.shape[0] != lnz or L_p[m+n] != lnz
+            or L_D.shape[0] != m+n or P.shape[0] != m+n):
+        raise ValueError("Saved factorization does not match the problem size.")
+
+    check_state(state, m + n, work.c_settings.normalize)
+
+    with nogil:
+        work._work = cyscs_load_work(&work.c_data, &cone.c_cone, cptr_float(Anorm_x),
+                                     cptr_float(D), cptr_float(E), &means[0], lnz,
+                                     &L_p[0], cptr_int(L_i), cptr_float(L_x),
+                                     &L_D[0], &P[0])
+
+    if work._work == NULL:
+        raise MemoryError("Memory error in allocating Workspace.")
+
+    return work
+
+
+def check_state(dict state, scs_int k, bint normalize):
+    """ Raise a `ValueError` unless the factorization of the `k` by `k` KKT
+    matrix and the scaling in `state` can be used by SCS: the C code indexes
+    arrays with `P`, `L_p` and `L_i` without checking them.
+    """
+    P = np.asarray(state['P'])
+    if not np.array_equal(np.sort(P), np.arange(k)):
+        raise ValueError("Saved P is not a permutation of the KKT matrix rows.")
+
+    L_p = np.asarray(state['L_p'])
+    if L_p[0] != 0 or np.any(np.diff(L_p) < 0):
+        raise ValueError("Saved L_p is not nondecreasing from 0 to the size of L.")
+
+    L_i = np.asarray(state['L_i'])
+    if len(L_i) and (L_i.min() < 0 or L_i.max() >= k):
+        raise ValueError("Saved L_i has row indices out of range.")
+
+    keys = ('Anorm_x', 'L_x', 'L_D') + (('D', 'E', 'means') if normalize else ())
+    for key in keys:
+        if not np.all(np.isfinite(state[key])):
+            raise ValueError("Saved {} has NaN or infinite values.".format(key))
+
+
+def update_A(Workspace work, Cone cone, scs_float[::1] values):
+    """ Change the values of `A` in the SCS workspace, keeping its sparsity
+    pattern, and refactor the KKT matrix.
+
+    `values` must be a new array owned by the workspace from now on, since
+    SCS may keep a pointer to it and normalize it in place.
+
+    If the values are not finite or the refactorization fails, the workspace
+    is unchanged.
+    """
+    cdef:
+        scs_int status
+
+    if values.shape[0] != work.c_A.p[work.c_data.n] or values.shape[0] == 0:
+        raise ValueError("values must have one entry per nonzero of A.")
+    if not np.isfinite(values).all():
+        raise ValueError("values must be finite.")
+
+    with nogil:
+        status = cyscs_update_A(work._work, &cone.c_cone, &values[0])
+
+    if status == -2:
+        raise ValueError("The KKT matrix with the new values of A could not "
+                         "be factored; the Workspace is unchanged.")
+    if status < 0:
+        raise MemoryError("Memory error in refactoring Workspace.")
+
+    if not CYSCS_COPY_A or not work.c_settings.normalize:
+        # SCS uses c_A directly, which now points to values
+        work._A_x = values
+
+
+# pointers to the start of possibly empty arrays
+
+cdef inline scs_int* ptr_int(scs_int[::1] a):
+    return &a[0] if a.shape[0] > 0 else NULL
+
+cdef inline scs_float* ptr_float(scs_float[::1] a):
+    return &a[0] if a.shape[0] > 0 else NULL
+
+cdef inline const scs_int* cptr_int(const scs_int[::1] a) nogil:
+    return &a[0] if a.shape[0] > 0 else NULL
+
+cdef inline const scs_float* cptr_float(const scs_float[::1] a) nogil:
+    return &a[0] if a.shape[0] > 0 else NULL
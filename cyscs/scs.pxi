@@ -1,3 +1,24 @@
+cimport cython
+from libc.stdint cimport int32_t, int64_t
+from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy, memset, strncpy, strlen
+
+try:
+    from collections.abc import Mapping, KeysView, ItemsView, ValuesView
+except ImportError:
+    from collections import Mapping, KeysView, ItemsView, ValuesView
+
+import numpy as np
+
+from ._util import info_dtype
+from . import _profile
+
+
+# True if SCS copies A before normalizing it. Otherwise, SCS normalizes
+# the values of A in place, and un-normalizes them in scs_finish().
+COPY_A = CYSCS_COPY_A
+
+
 def version():
     """Return the current version of the underlying SCS C library.
     """
@@ -5,29 +26,98 @@ def version():
     return c_string
 
 
-def solve(dict data, dict cone, dict sol, dict settings):
+def solve(dict data, Cone cone, sol, dict settings):
     """ Call the C function scs().
-
-    cone - assume cone has numpy arrays where appropriate
     """
     cdef:
         c_AMatrix c_A
         c_Settings c_settings
         Info c_info
 
+    lap = _profile.laps()
+
     c_data = stuff_c_data(data, settings, &c_A, &c_settings)
+    lap('stuff_c_data')
     c_sol = stuff_c_sol(sol)
-    c_cone = stuff_c_cone(cone)
+    lap('stuff_c_sol')
 
     with nogil:
         # write to sol and info
-        scs(&c_data, &c_cone, &c_sol, &c_info)
+        scs(&c_data, &cone.c_cone, &c_sol, &c_info)
 
-    sol['info'] = c_info
+    lap('scs')
+    sol['info'] = make_info(c_info)
+    lap('make_info')
+    lap.times(setup=c_info.setupTime, solve=c_info.solveTime)
 
     return sol
 
 
+def solve_many(list datas, list cones, list sols, dict settings):
+    """ Call the C function scs() on each problem in the lists, releasing the
+    GIL once for the whole batch.
+
+    All C structs are filled out up front, so the GIL is only held for
+    stuffing the structs and for wrapping the `Info` structs afterwards.
+
+    datas, cones, sols - lists of equal length, as in `solve()`
+    """
+    cdef:
+        Py_ssize_t i, k = len(datas)
+        c_Settings c_settings
+        c_AMatrix* c_As
+        c_Data* c_datas
+        c_Cone* c_cones
+        c_Sol* c_sols
+        Info* c_infos
+
+    if not len(cones) == len(sols) == k:
+        raise ValueError("datas, cones, and sols must have the same length.")
+
+    if k == 0:
+        return sols
+
+    c_As = <c_AMatrix*> malloc(k*sizeof(c_AMatrix))
+    c_datas = <c_Data*> malloc(k*sizeof(c_Data))
+    c_cones = <c_Cone*> malloc(k*sizeof(c_Cone))
+    c_sols = <c_Sol*> malloc(k*sizeof(c_Sol))
+    c_infos = <Info*> malloc(k*sizeof(Info))
+
+    try:
+        if (c_As == NULL or c_datas == NULL or c_cones == NULL
+                or c_sols == NULL or c_infos == NULL):
+            raise MemoryError("Memory error in allocating batch structs.")
+
+        lap = _profile.laps()
+
+        for i in range(k):
+            c_datas[i] = stuff_c_data(datas[i], settings, &c_As[i], &c_settings)
+            lap('stuff_c_data')
+            c_cones[i] = (<Cone?> cones[i]).c_cone
+            c_sols[i] = stuff_c_sol(sols[i])
+            lap('stuff_c_sol')
+
+        with nogil:
+            for i in range(k):
+                # write to sols and infos
+                scs(&c_datas[i], &c_cones[i], &c_sols[i], &c_infos[i])
+
+        lap('scs')
+
+        for i in range(k):
+            sols[i]['info'] = make_info(c_infos[i])
+            lap('make_info')
+            lap.times(setup=c_infos[i].setupTime, solve=c_infos[i].solveTime)
+    finally:
+        free(c_As)
+        free(c_datas)
+        free(c_cones)
+        free(c_sols)
+        free(c_infos)
+
+    return sols
+
+
 cdef class Workspace:
     """ Maintain SCS _work and c_Data structs to keep a reference to the A matrix.
     Maintain c_settings and b and c only coincidentally, since they are part
@@ -41,41 +131,366 @@ cdef class Workspace:
 
     Assume that data, cone, and settings have the appropriate formats
     to be directly converted for use in C.
+
+    SCS keeps pointers to the arrays of A (without copying them) if it was
+    built without COPYAMATRIX, or if `normalize` is off, so we keep a
+    reference to A in those cases.
     """
     cdef: #private by default, 'readonly' to make public
         Work * _work
         c_Settings c_settings
         c_AMatrix c_A
         c_Data c_data
+        object _A
+        object _A_x  # values of A from `update_A()`, which SCS may point to
+        Info c_info
+        # state of a solve run in strides, between `start()` and `finish()`
+        residuals _r
+        scs_int _iter
+        scs_int _status
 
-        readonly Info c_info
+    def __cinit__(self, dict data, Cone cone, dict settings, bint init=True):
+        if not CYSCS_COPY_A or not settings['normalize']:
+            self._A = data['A']
+
+        lap = _profile.laps()
 
-    def __cinit__(self, dict data, dict cone, dict settings):
         self.c_data = stuff_c_data(data, settings, &self.c_A, &self.c_settings)
-        c_cone = stuff_c_cone(cone)
+        lap('stuff_c_data')
+
+        if not init:
+            # the SCS workspace is filled in by `load_workspace()`
+            return
 
         with nogil:
-            self._work = scs_init(&self.c_data, &c_cone, &self.c_info)
+            self._work = scs_init(&self.c_data, &cone.c_cone, &self.c_info)
 
         if self._work == NULL:
             raise MemoryError("Memory error in allocating Workspace.")
 
+        lap('scs_init')
+        lap.times(setup=self.c_info.setupTime)
+
+    @property
+    def info(self):
+        return make_info(self.c_info)
+
     def __dealloc__(self):
         if self._work != NULL:
             with nogil:
                 scs_finish(self._work);
 
-    def solve(self, scs_float[:] b, scs_float[:] c, dict cone, dict sol, dict settings):
+    def solve(self, scs_float[:] b, scs_float[:] c, Cone cone, sol, dict settings):
         self.c_settings = settings
         self.c_data.b = &b[0]
         self.c_data.c = &c[0]
         
+        lap = _profile.laps()
+
         c_sol = stuff_c_sol(sol)
-        c_cone = stuff_c_cone(cone)
+        lap('stuff_c_sol')
 
         with nogil:
             # write to sol and info
-            scs_solve(self._work, &self.c_data, &c_cone, &c_sol, &self.c_info)
+            scs_solve(self._work, &self.c_data, &cone.c_cone, &c_sol, &self.c_info)
+
+        lap('scs_solve')
+        lap.times(solve=self.c_info.solveTime)
+
+    def start(self, scs_float[:] b, scs_float[:] c, Cone cone, sol, dict settings):
+        """ Start a solve to run in strides with `iterate()`, warm-started
+        from `sol` if `warm_start` is set, and end it with `finish()`.
+
+        Between strides, the iterate stays in the SCS workspace, so the
+        strides take exactly the iterations of a single `solve()`.
+        """
+        self.c_settings = settings
+        self.c_data.b = &b[0]
+        self.c_data.c = &c[0]
+        self._iter = 0
+
+        c_sol = stuff_c_sol(sol)
+
+        with nogil:
+            self._status = cyscs_start(self._work, &self.c_data, &cone.c_cone,
+                                       &c_sol, &self.c_info, &self._r)
+
+    def iterate(self, Cone cone, scs_int stride):
+        """ Run up to `stride` more iterations, and return True if the solve
+        is over. Otherwise, `info` holds the residuals and objectives of the
+        current iterate.
+        """
+        cdef scs_int stop = self._iter + stride
+
+        if self._status == 0:
+            with nogil:
+                self._status = cyscs_iterate(self._work, &cone.c_cone, &self._r,
+                                             &self._iter, stop, &self.c_info)
+
+        return self._status != 0 or self._iter >= self.c_settings.max_iters
+
+    def finish(self, sol):
+        """ Write the solution of the solve run with `iterate()` to `sol`,
+        and its exit information to `info`.
+        """
+        c_sol = stuff_c_sol(sol)
+
+        with nogil:
+            cyscs_finish(self._work, &c_sol, &self.c_info, &self._r, self._iter,
+                         self._status)
+
+    def solve_batch(self, const scs_float[:, :] B, const scs_float[:, :] C, Cone cone,
+                    scs_float[:, ::1] X, scs_float[:, ::1] Y, scs_float[:, ::1] S,
+                    unsigned char[::1] infos, bint chain, dict settings):
+        """ Solve once for each row of `B` and `C`, writing the solutions to the
+        rows of `X`, `Y`, `S` and the `Info` structs into the raw bytes of `infos`.
+
+        The GIL is released once for the whole batch.
+        If `chain` is true, each solve is warm-started from the previous solution.
+        """
+        cdef:
+            Py_ssize_t i, k = B.shape[0]
+            scs_int m = self.c_data.m
+            scs_int n = self.c_data.n
+            Info* c_infos
+            c_Sol c_sol
+
+        if not (C.shape[0] == X.shape[0] == Y.shape[0] == S.shape[0] == k):
+            raise ValueError("All batch arrays must have the same number of rows.")
+
+        if k > 0 and (B.strides[1] != sizeof(scs_float) or C.strides[1] != sizeof(scs_float)):
+            raise ValueError("Rows of B and C must be contiguous.")
+
+        if infos.shape[0] != k*sizeof(Info):
+            raise ValueError("infos buffer does not match the size of the Info struct.")
+
+        if k == 0:
+            return
+
+        self.c_settings = settings
+        c_infos = <Info*> &infos[0]
+
+        with nogil:
+            for i in range(k):
+                if chain and i > 0:
+                    memcpy(&X[i, 0], &X[i-1, 0], n*sizeof(scs_float))
+                    memcpy(&Y[i, 0], &Y[i-1, 0], m*sizeof(scs_float))
+                    memcpy(&S[i, 0], &S[i-1, 0], m*sizeof(scs_float))
+
+                self.c_data.b = <scs_float*> &B[i, 0]
+                self.c_data.c = <scs_float*> &C[i, 0]
+                c_sol = c_Sol(&X[i, 0], &Y[i, 0], &S[i, 0])
+
+                # write to the solution rows and info
+                scs_solve(self._work, &self.c_data, &cone.c_cone, &c_sol, &c_infos[i])
+                clear_status(&c_infos[i])
+
+            self.c_info = c_infos[k-1]
+
+
+_INFO_FIELDS = ('iter', 'status', 'statusVal', 'pobj', 'dobj', 'resPri',
+                'resDual', 'resInfeas', 'resUnbdd', 'relGap', 'setupTime',
+                'solveTime')
+
+
+cdef class SolveInfo:
+    """ Solver exit information, holding a copy of the C `Info` struct.
+
+    Fields are only converted to Python objects when read, as attributes
+    (`info.status`) or, like a `dict`, as keys (`info['status']`).
+    It is a read-only `Mapping`, which compares equal to a `dict` with the
+    same items, counting NaN fields (such as `resInfeas` of a solved
+    problem) as equal.
+    Use `to_dict()` for a plain `dict`, and `SolveInfo.to_numpy()` to pack
+    many infos into a structured numpy array.
+    """
+    cdef Info c_info
+
+    def __init__(self):
+        raise TypeError("SolveInfo objects are only created by the solver.")
+
+    @property
+    def iter(self):
+        return self.c_info.iter
+
+    @property
+    def status(self):
+        return self.c_info.status
+
+    @property
+    def statusVal(self):
+        return self.c_info.statusVal
+
+    @property
+    def pobj(self):
+        return self.c_info.pobj
+
+    @property
+    def dobj(self):
+        return self.c_info.dobj
+
+    @property
+    def resPri(self):
+        return self.c_info.resPri
+
+    @property
+    def resDual(self):
+        return self.c_info.resDual
+
+    @property
+    def resInfeas(self):
+        return self.c_info.resInfeas
+
+    @property
+    def resUnbdd(self):
+        return self.c_info.resUnbdd
+
+    @property
+    def relGap(self):
+        return self.c_info.relGap
+
+    @property
+    def setupTime(self):
+        return self.c_info.setupTime
+
+    @property
+    def solveTime(self):
+        return self.c_info.solveTime
+
+    def __getitem__(self, key):
+        if key not in _INFO_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in _INFO_FIELDS
+
+    def __iter__(self):
+        return iter(_INFO_FIELDS)
+
+    def __len__(self):
+        return len(_INFO_FIELDS)
+
+    def get(self, key, default=None):
+        if key not in _INFO_FIELDS:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if len(other) != len(_INFO_FIELDS):
+            return False
+        for key in _INFO_FIELDS:
+            if key not in other:
+                return False
+            a, b = getattr(self, key), other[key]
+            # NaN residuals are equal
+            if not (a == b or (a != a and b != b)):
+                return False
+        return True
+
+    def __ne__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return not self == other
+
+    def to_dict(self):
+        return self.c_info
+
+    def __repr__(self):
+        return 'SolveInfo({})'.format(self.to_dict())
+
+    def __reduce__(self):
+        return _info_from_dict, (self.to_dict(),)
+
+    def _replace(self, **fields):
+        """ Return a copy of this info with the given fields changed.
+        """
+        d = self.to_dict()
+        for key in fields:
+            if key not in _INFO_FIELDS:
+                raise KeyError(key)
+        d.update(fields)
+
+        return _info_from_dict(d)
+
+    @staticmethod
+    def to_numpy(infos):
+        """ Pack a sequence of `SolveInfo` objects into a structured numpy
+        array, with one field per `Info` struct field.
+        """
+        cdef:
+            Py_ssize_t i
+            SolveInfo info
+            unsigned char[::1] buf
+
+        int_dtype = np.dtype('i{}'.format(sizeof(scs_int)))
+        float_dtype = np.dtype('f{}'.format(sizeof(scs_float)))
+        out = np.zeros(len(infos), dtype=info_dtype(int_dtype, float_dtype))
+        buf = out.view(np.uint8)
+
+        for i, info in enumerate(infos):
+            memcpy(&buf[i*sizeof(Info)], &info.c_info, sizeof(Info))
+
+        return out
+
+
+Mapping.register(SolveInfo)
+
+
+cdef inline void clear_status(Info* c_info) noexcept nogil:
+    """ Zero the bytes after the end of the status string, which SCS leaves
+    uninitialized, so that copies of the struct compare equal as bytes.
+    """
+    cdef size_t n = strlen(c_info.status)
+    memset(&c_info.status[n], 0, sizeof(c_info.status) - n)
+
+
+cdef SolveInfo make_info(Info c_info):
+    """ Wrap a copy of the `Info` struct in a `SolveInfo` object.
+    """
+    cdef SolveInfo info = SolveInfo.__new__(SolveInfo)
+    info.c_info = c_info
+    clear_status(&info.c_info)
+    return info
+
+
+def _info_from_dict(dict d):
+    """ Return a `SolveInfo` object from a `dict` of all the `Info` fields.
+    """
+    cdef:
+        Info c_info
+        bytes status = d['status'].encode('utf8')
+
+    if len(status) >= sizeof(c_info.status):
+        raise ValueError("status string is too long.")
+
+    memset(&c_info, 0, sizeof(Info))
+    strncpy(c_info.status, status, sizeof(c_info.status) - 1)
+
+    c_info.iter = d['iter']
+    c_info.statusVal = d['statusVal']
+    c_info.pobj = d['pobj']
+    c_info.dobj = d['dobj']
+    c_info.resPri = d['resPri']
+    c_info.resDual = d['resDual']
+    c_info.resInfeas = d['resInfeas']
+    c_info.resUnbdd = d['resUnbdd']
+    c_info.relGap = d['relGap']
+    c_info.setupTime = d['setupTime']
+    c_info.solveTime = d['solveTime']
+
+    return make_info(c_info)
 
 
 cdef c_Data stuff_c_data(dict data, dict settings,
@@ -106,63 +521,68 @@ cdef c_Data stuff_c_data(dict data, dict settings,
     return c_Data(m, n, c_A, &b[0], &c[0], c_settings)
 
 
-cdef c_Cone stuff_c_cone(dict cone):
-    """ Returns a filled-out C struct for SCS c_Cone.
-
-    Cython cdef functions return by *value*, not by reference,
-    but this struct is lightweight enough (contains pointers to larger objects)
-    to pass around by value.
+cdef class Cone:
+    """ C struct for SCS c_Cone, built once from a `cyscs.Cone`.
 
-    Expects s,q,p to be numpy arrays.
+    Holds the arrays the struct points to, converted to the C dtypes of
+    this module, so the struct can be reused by any number of solves.
     """
     cdef:
         c_Cone c_cone
-        scs_int[:] q
-        scs_int[:] s
-        scs_float[:] p
+        readonly object q, s, p
+
+    def __cinit__(self, cone):
+        cdef:
+            const scs_int[::1] q
+            const scs_int[::1] s
+            const scs_float[::1] p
 
-    c_cone = c_Cone(f=0, l=0, ep=0, ed=0,
-                    q=NULL, qsize=0,
-                    s=NULL, ssize=0,
-                    p=NULL, psize=0)
+        lap = _profile.laps()
 
-    c_cone.f = cone.get('f', 0)
-    c_cone.l = cone.get('l', 0)
-    c_cone.ep = cone.get('ep', 0)
-    c_cone.ed = cone.get('ed', 0)
+        int_dtype = np.dtype('i{}'.format(sizeof(scs_int)))
+        float_dtype = np.dtype('f{}'.format(sizeof(scs_float)))
 
-    if 'q' in cone:
-        q = cone['q']
-        c_cone.qsize = q.shape[0]
-        c_cone.q = &q[0]
+        self.c_cone = c_Cone(f=cone.get('f', 0), l=cone.get('l', 0),
+                             ep=cone.get('ep', 0), ed=cone.get('ed', 0),
+                             q=NULL, qsize=0,
+                             s=NULL, ssize=0,
+                             p=NULL, psize=0)
 
-    if 's' in cone:
-        s = cone['s']
-        c_cone.ssize = s.shape[0]
-        c_cone.s = &s[0]
+        # SCS does not modify the cone arrays, so they may be read-only
+        if 'q' in cone:
+            self.q = np.ascontiguousarray(cone['q'], dtype=int_dtype)
+            q = self.q
+            self.c_cone.qsize = q.shape[0]
+            self.c_cone.q = <scs_int*> &q[0]
 
-    if 'p' in cone:
-        p = cone['p']
-        c_cone.psize = p.shape[0]
-        c_cone.p = &p[0]
+        if 's' in cone:
+            self.s = np.ascontiguousarray(cone['s'], dtype=int_dtype)
+            s = self.s
+            self.c_cone.ssize = s.shape[0]
+            self.c_cone.s = <scs_int*> &s[0]
 
-    return c_cone    
+        if 'p' in cone:
+            self.p = np.ascontiguousarray(cone['p'], dtype=float_dtype)
+            p = self.p
+            self.c_cone.psize = p.shape[0]
+            self.c_cone.p = <scs_float*> &p[0]
 
+        lap('stuff_c_cone')
 
 
-cdef c_Sol stuff_c_sol(dict sol):
+cdef c_Sol stuff_c_sol(sol):
     """ Returns a filled-out C struct for SCS c_Sol.
 
     Cython cdef functions return by *value*, not by reference,
     but this struct is lightweight enough (contains pointers to larger objects)
     to pass around by value.
 
-    Expects x,y,s to be numpy arrays.
+    Expects x,y,s to be contiguous numpy arrays.
     """
     cdef:
-        scs_float[:] x = sol['x']
-        scs_float[:] y = sol['y']
-        scs_float[:] s = sol['s']
+        scs_float[::1] x = sol['x']
+        scs_float[::1] y = sol['y']
+        scs_float[::1] s = sol['s']
 
     return c_Sol(&x[0], &y[0], &s[0])
 
@@ -189,3 +609,165 @@ cdef c_AMatrix stuff_c_amatrix(A):
 
     return c_AMatrix(&data[0], &ind[0], &indptr[0], m, n)
 
+
+
+# Conversion of COO and CSR matrices to CSC, with the C dtypes of this module.
+#
+# Both functions are counting sorts by column: one pass counts the entries of
+# each column, and a second one casts each entry and writes it straight to its
+# final position. So the output arrays are the only allocations, and there is
+# no intermediate matrix with the input dtypes. Indices are validated up front,
+# so the loops run without bounds checks.
+
+ctypedef fused index_t:
+    int32_t
+    int64_t
+
+ctypedef fused value_t:
+    float
+    double
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint sorted_columns(scs_int[::1] indptr, scs_int[::1] indices,
+                                Py_ssize_t n) noexcept nogil:
+    """ Return True if the row indices of each column strictly increase.
+    """
+    cdef Py_ssize_t j, p
+
+    for j in range(n):
+        for p in range(indptr[j] + 1, indptr[j + 1]):
+            if indices[p] <= indices[p - 1]:
+                return False
+
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void shift_indptr(scs_int[::1] indptr, Py_ssize_t n) noexcept nogil:
+    """ Turn the column ends left in `indptr` by the scatter pass back into
+    column starts.
+    """
+    cdef Py_ssize_t j
+
+    for j in range(n, 0, -1):
+        indptr[j] = indptr[j - 1]
+    indptr[0] = 0
+
+
+def _csc_arrays(Py_ssize_t n, Py_ssize_t nnz):
+    int_dtype = np.dtype('i{}'.format(sizeof(scs_int)))
+    float_dtype = np.dtype('f{}'.format(sizeof(scs_float)))
+
+    return (np.empty(nnz, dtype=float_dtype), np.empty(nnz, dtype=int_dtype),
+            np.zeros(n + 1, dtype=int_dtype))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def coo_to_csc(Py_ssize_t m, Py_ssize_t n, const index_t[::1] row,
+               const index_t[::1] col, const value_t[::1] values):
+    """ Return the arrays `data, indices, indptr` of the `m` by `n` CSC matrix
+    with entries `values` at `row`, `col`, and whether the row indices
+    of each column are sorted, without duplicates.
+
+    Entries keep their input order within each column, and duplicates are
+    not summed.
+    """
+    cdef:
+        Py_ssize_t k, j, p, nnz = values.shape[0]
+        bint valid = True, canonical = False
+        scs_float[::1] Ax
+        scs_int[::1] Ai, Ap
+
+    if row.shape[0] != nnz or col.shape[0] != nnz:
+        raise ValueError("row, col, and values must have the same length.")
+
+    data, indices, indptr = _csc_arrays(n, nnz)
+    Ax, Ai, Ap = data, indices, indptr
+
+    with nogil:
+        for k in range(nnz):
+            if not (0 <= row[k] < m and 0 <= col[k] < n):
+                valid = False
+                break
+            Ap[col[k] + 1] += 1
+
+        if valid:
+            for j in range(n):
+                Ap[j + 1] += Ap[j]
+
+            for k in range(nnz):
+                j = col[k]
+                p = Ap[j]
+                Ai[p] = <scs_int> row[k]
+                Ax[p] = <scs_float> values[k]
+                Ap[j] = p + 1
+
+            shift_indptr(Ap, n)
+            canonical = sorted_columns(Ap, Ai, n)
+
+    if not valid:
+        raise ValueError("Row or column index out of bounds.")
+
+    return data, indices, indptr, canonical
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def csr_to_csc(Py_ssize_t m, Py_ssize_t n, const index_t[::1] row_ptr,
+               const index_t[::1] col, const value_t[::1] values):
+    """ Return the arrays `data, indices, indptr` of the CSC matrix equal to
+    the `m` by `n` CSR matrix with arrays `values, col, row_ptr`, and
+    whether the row indices of each column are sorted, without duplicates.
+    """
+    cdef:
+        Py_ssize_t i, k, j, p, nnz
+        bint valid = True, canonical = False
+        scs_float[::1] Ax
+        scs_int[::1] Ai, Ap
+
+    if row_ptr.shape[0] != m + 1:
+        raise ValueError("row_ptr must have m + 1 entries.")
+
+    nnz = row_ptr[m]
+    if row_ptr[0] != 0 or not 0 <= nnz <= min(col.shape[0], values.shape[0]):
+        raise ValueError("row_ptr does not match col and values.")
+
+    data, indices, indptr = _csc_arrays(n, nnz)
+    Ax, Ai, Ap = data, indices, indptr
+
+    with nogil:
+        for i in range(m):
+            if row_ptr[i] > row_ptr[i + 1]:
+                valid = False
+                break
+
+        for k in range(nnz if valid else 0):
+            if not 0 <= col[k] < n:
+                valid = False
+                break
+            Ap[col[k] + 1] += 1
+
+        if valid:
+            for j in range(n):
+                Ap[j + 1] += Ap[j]
+
+            # rows in order, so row indices increase within each column
+            for i in range(m):
+                for k in range(row_ptr[i], row_ptr[i + 1]):
+                    j = col[k]
+                    p = Ap[j]
+                    Ai[p] = <scs_int> i
+                    Ax[p] = <scs_float> values[k]
+                    Ap[j] = p + 1
+
+            shift_indptr(Ap, n)
+            canonical = sorted_columns(Ap, Ai, n)
+
+    if not valid:
+        raise ValueError("Invalid row_ptr or column index out of bounds.")
+
+    return data, indices, indptr, canonical
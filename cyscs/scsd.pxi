@@ -1,7 +1,7 @@
+# `scs_float` and `scs_int` are declared in each extension module's .pxd file,
+# to match the C types that module is compiled with
+
 cdef extern from "glbopts.h":
-    ctypedef double scs_float
-    ctypedef long scs_int
-    
     ctypedef SCS_PROBLEM_DATA c_Data "Data"
     ctypedef SCS_SETTINGS c_Settings "Settings"
     ctypedef SCS_SOL_VARS c_Sol "Sol"
@@ -97,3 +97,27 @@ cdef extern from "cones.h":
         scs_float * p # array of power cone params, must be \in [-1, 1],
                        # negative values are interpreted as specifying the dual cone */
 
+
+# expose whether SCS makes its own copy of A, or normalizes it in place
+cdef extern from *:
+    """
+    #ifdef COPYAMATRIX
+    #define CYSCS_COPY_A 1
+    #else
+    #define CYSCS_COPY_A 0
+    #endif
+    """
+    bint CYSCS_COPY_A
+
+
+# running a solve in strides of iterations, keeping the iterate between them
+cdef extern from "strides.h":
+    struct residuals:
+        pass
+
+    scs_int cyscs_start(Work* w, const c_Data* d, const c_Cone* k, c_Sol* sol,
+                        Info* info, residuals* r) nogil
+    scs_int cyscs_iterate(Work* w, const c_Cone* k, residuals* r, scs_int* iter,
+                          scs_int stop, Info* info) nogil
+    void cyscs_finish(Work* w, c_Sol* sol, Info* info, residuals* r,
+                      scs_int iter, scs_int status) nogil
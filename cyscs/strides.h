@@ -0,0 +1,310 @@
+#ifndef CYSCS_STRIDES_H_GUARD
+#define CYSCS_STRIDES_H_GUARD
+
+/* Run an SCS solve in strides of iterations, returning to the caller
+ * between strides.
+ *
+ * scs_solve() rebuilds the iterate from the warm start on every call, so
+ * a solve split into several calls is not the same solve: the scaling of
+ * the iterate and kappa are lost, and a stride that stops on an
+ * infeasibility or unboundedness guess restarts from NaNs. Here, the
+ * iterate (u, v) stays in the workspace between strides, and the loop
+ * below does exactly what the loop in scs_solve() does, so a solve run in
+ * strides takes the same iterations and ends with the same solution as a
+ * single call to scs_solve().
+ *
+ * The static functions of scs.c used by the loop are repeated here, built
+ * from the public functions of the linear system and cone code. They read
+ * the fields of Work directly, and mirror src/scs.c of the SCS 1.2.6
+ * release (tag v1.2.6): check them against the new scs.c whenever c/scs
+ * is updated. test_strides_match_scs compares the two solves.
+ *
+ * Usage: cyscs_start(), then cyscs_iterate() until it returns nonzero or
+ * the iterations run out, then cyscs_finish() for the solution.
+ */
+
+#include <string.h>
+#include "glbopts.h"
+#include "scs.h"
+
+/* as in scs.c */
+#define CYSCS_CONVERGED_INTERVAL 20
+#define CYSCS_INDETERMINATE_TOL 1e-9
+
+/* calcResiduals() of scs.c */
+static void cyscs_residuals(Work *w, struct residuals *r, scs_int iter) {
+    scs_float *x = w->u, *y = &(w->u[w->n]), *s = &(w->v[w->n]);
+    scs_float *pr = w->pr, *dr = w->dr;
+    scs_float pres = 0, dres = 0, nmAxs = 0, nmATy = 0, scale, cTx, bTy;
+    scs_float norm = w->stgs->normalize
+                         ? w->stgs->scale * w->sc_c * w->sc_b : 1;
+    scs_int i, n = w->n, m = w->m;
+
+    if (r->lastIter == iter)
+        return;
+    r->lastIter = iter;
+
+    r->tau = ABS(w->u[n + m]);
+    r->kap = ABS(w->v[n + m]) / norm;
+
+    /* norm(Ax + s - b * tau) */
+    memset(pr, 0, m * sizeof(scs_float));
+    accumByA(w->A, w->p, x, pr);
+    addScaledArray(pr, s, m, 1.0);
+    for (i = 0; i < m; ++i) {
+        scale = w->stgs->normalize
+                    ? w->scal->D[i] / (w->sc_b * w->stgs->scale) : 1;
+        scale = scale * scale;
+        nmAxs += (pr[i] * pr[i]) * scale;
+        pres += (pr[i] - w->b[i] * r->tau) * (pr[i] - w->b[i] * r->tau) *
+                scale;
+    }
+    nmAxs = SQRTF(nmAxs);
+    pres = SQRTF(pres);
+
+    /* norm(A'y + c * tau) */
+    memset(dr, 0, n * sizeof(scs_float));
+    accumByAtrans(w->A, w->p, y, dr);
+    for (i = 0; i < n; ++i) {
+        scale = w->stgs->normalize
+                    ? w->scal->E[i] / (w->sc_c * w->stgs->scale) : 1;
+        scale = scale * scale;
+        nmATy += (dr[i] * dr[i]) * scale;
+        dres += (dr[i] + w->c[i] * r->tau) * (dr[i] + w->c[i] * r->tau) *
+                scale;
+    }
+    nmATy = SQRTF(nmATy);
+    dres = SQRTF(dres);
+
+    r->bTy_by_tau = innerProd(y, w->b, m) / norm;
+    r->cTx_by_tau = innerProd(x, w->c, n) / norm;
+
+    r->resInfeas = r->bTy_by_tau < 0 ? w->nm_b * nmATy / -r->bTy_by_tau : NAN;
+    r->resUnbdd = r->cTx_by_tau < 0 ? w->nm_c * nmAxs / -r->cTx_by_tau : NAN;
+
+    bTy = r->bTy_by_tau / r->tau;
+    cTx = r->cTx_by_tau / r->tau;
+
+    r->resPri = pres / (1 + w->nm_b) / r->tau;
+    r->resDual = dres / (1 + w->nm_c) / r->tau;
+    r->relGap = ABS(cTx + bTy) / (1 + ABS(cTx) + ABS(bTy));
+}
+
+/* hasConverged() of scs.c */
+static scs_int cyscs_converged(const Work *w, const struct residuals *r) {
+    scs_float eps = w->stgs->eps;
+    if (r->resPri < eps && r->resDual < eps && r->relGap < eps)
+        return SCS_SOLVED;
+    if (r->resUnbdd < eps)
+        return SCS_UNBOUNDED;
+    if (r->resInfeas < eps)
+        return SCS_INFEASIBLE;
+    return 0;
+}
+
+/* one iteration: projectLinSys(), projectCones() and updateDualVars() of
+ * scs.c. Returns a negative value on failure. */
+static scs_int cyscs_step(Work *w, const Cone *k, scs_int iter) {
+    scs_int i, n = w->n, m = w->m, l = n + m + 1;
+    scs_float alpha = w->stgs->alpha;
+
+    memcpy(w->u_prev, w->u, l * sizeof(scs_float));
+
+    /* ut = u + v */
+    memcpy(w->u_t, w->u, l * sizeof(scs_float));
+    addScaledArray(w->u_t, w->v, l, 1.0);
+    scaleArray(w->u_t, w->stgs->rho_x, n);
+    addScaledArray(w->u_t, w->h, l - 1, -w->u_t[l - 1]);
+    addScaledArray(w->u_t, w->h, l - 1,
+                   -innerProd(w->u_t, w->g, l - 1) / (w->gTh + 1));
+    scaleArray(&(w->u_t[n]), -1, m);
+    if (solveLinSys(w->A, w->stgs, w->p, w->u_t, w->u, iter) < 0)
+        return -1;
+    w->u_t[l - 1] += innerProd(w->u_t, w->h, l - 1);
+
+    /* this does not relax 'x' variable */
+    for (i = 0; i < n; ++i)
+        w->u[i] = w->u_t[i] - w->v[i];
+    for (i = n; i < l; ++i)
+        w->u[i] = alpha * w->u_t[i] + (1 - alpha) * w->u_prev[i] - w->v[i];
+    if (projDualCone(&(w->u[n]), k, w->coneWork, &(w->u_prev[n]), iter) < 0)
+        return -1;
+    if (w->u[l - 1] < 0.0)
+        w->u[l - 1] = 0.0;
+
+    for (i = n; i < l; ++i)
+        w->v[i] += w->u[i] - alpha * w->u_t[i] - (1.0 - alpha) * w->u_prev[i];
+
+    return 0;
+}
+
+/* Set up the solve of `d` with scs_solve(), without running any iteration:
+ * normalize b and c, and start the iterate from `sol` if warm_start is set.
+ * `r` is reset for cyscs_iterate(). Returns a negative value on failure. */
+static scs_int cyscs_start(Work *w, const Data *d, const Cone *k, Sol *sol,
+                           Info *info, struct residuals *r) {
+    Settings *stgs = w->stgs;
+    scs_int max_iters = stgs->max_iters, verbose = stgs->verbose, status;
+
+    stgs->max_iters = 0;
+    stgs->verbose = 0;
+    status = scs_solve(w, d, k, sol, info);
+    stgs->max_iters = max_iters;
+    stgs->verbose = verbose;
+
+    r->lastIter = -1;
+    info->iter = 0;
+    info->statusVal = SCS_UNFINISHED;
+    return status == SCS_FAILED ? SCS_FAILED : 0;
+}
+
+/* Run the iterations from `*iter` up to `stop` (at most max_iters), as
+ * scs_solve() does, leaving `*iter` at the iteration the loop stopped at.
+ *
+ * Returns the status once SCS has converged (SCS_SOLVED, SCS_INFEASIBLE or
+ * SCS_UNBOUNDED), SCS_FAILED or SCS_SIGINT, or 0 otherwise. In that case,
+ * `info` holds the residuals and objectives of the current iterate, and its
+ * solveTime is increased by the time taken.
+ */
+static scs_int cyscs_iterate(Work *w, const Cone *k, struct residuals *r,
+                             scs_int *iter, scs_int stop, Info *info) {
+    scs_int i, status = 0;
+    struct residuals now;
+    timer strideTimer;
+
+    if (stop > w->stgs->max_iters)
+        stop = w->stgs->max_iters;
+
+    startInterruptListener();
+    tic(&strideTimer);
+
+    for (i = *iter; i < stop; ++i) {
+        if (cyscs_step(w, k, i) < 0) {
+            status = SCS_FAILED;
+            break;
+        }
+        if (isInterrupted()) {
+            status = SCS_SIGINT;
+            break;
+        }
+        if (i % CYSCS_CONVERGED_INTERVAL == 0) {
+            cyscs_residuals(w, r, i);
+            if ((status = cyscs_converged(w, r)) != 0)
+                break;
+        }
+    }
+    *iter = i;
+
+    if (status == 0) {
+        /* without touching `r`, whose iteration numbers must match the
+         * checks above */
+        now.lastIter = -1;
+        cyscs_residuals(w, &now, i);
+        info->iter = i;
+        info->resPri = now.resPri;
+        info->resDual = now.resDual;
+        info->resInfeas = now.resInfeas;
+        info->resUnbdd = now.resUnbdd;
+        info->relGap = now.relGap;
+        info->pobj = now.cTx_by_tau / now.tau;
+        info->dobj = -now.bTy_by_tau / now.tau;
+    }
+
+    info->solveTime += tocq(&strideTimer);
+    endInterruptListener();
+    return status;
+}
+
+/* Write the solution and `info` at iteration `iter`, with the `status`
+ * returned by the last cyscs_iterate(): getSolution() of scs.c, or the
+ * NaN solution of a failure. */
+static void cyscs_finish(Work *w, Sol *sol, Info *info, struct residuals *r,
+                         scs_int iter, scs_int status) {
+    scs_int i, n = w->n, m = w->m, l = n + m + 1;
+    scs_float *D, *E, scale;
+
+    if (status == SCS_FAILED || status == SCS_SIGINT) {
+        info->iter = -1;
+        info->statusVal = status;
+        info->relGap = info->resPri = info->resDual = NAN;
+        info->pobj = info->dobj = info->solveTime = NAN;
+        strcpy(info->status, status == SCS_FAILED ? "Failure" : "Interrupted");
+        scaleArray(sol->x, NAN, n);
+        scaleArray(sol->y, NAN, m);
+        scaleArray(sol->s, NAN, m);
+        return;
+    }
+
+    cyscs_residuals(w, r, iter);
+    memcpy(sol->x, w->u, n * sizeof(scs_float));
+    memcpy(sol->y, &(w->u[n]), m * sizeof(scs_float));
+    memcpy(sol->s, &(w->v[n]), m * sizeof(scs_float));
+
+    if (status == SCS_UNFINISHED) {
+        /* not yet converged, take best guess */
+        if (r->tau > CYSCS_INDETERMINATE_TOL && r->tau > r->kap)
+            status = SCS_SOLVED_INACCURATE;
+        else if (calcNorm(w->u, l) <
+                 CYSCS_INDETERMINATE_TOL * SQRTF((scs_float)l))
+            status = SCS_INDETERMINATE;
+        else if (r->bTy_by_tau < r->cTx_by_tau)
+            status = SCS_INFEASIBLE_INACCURATE;
+        else
+            status = SCS_UNBOUNDED_INACCURATE;
+    }
+
+    info->iter = iter;
+    info->statusVal = status;
+    info->resInfeas = r->resInfeas;
+    info->resUnbdd = r->resUnbdd;
+
+    if (status == SCS_SOLVED || status == SCS_SOLVED_INACCURATE) {
+        scaleArray(sol->x, 1.0 / r->tau, n);
+        scaleArray(sol->y, 1.0 / r->tau, m);
+        scaleArray(sol->s, 1.0 / r->tau, m);
+        strcpy(info->status,
+               status == SCS_SOLVED ? "Solved" : "Solved/Inaccurate");
+        info->relGap = r->relGap;
+        info->resPri = r->resPri;
+        info->resDual = r->resDual;
+        info->pobj = r->cTx_by_tau / r->tau;
+        info->dobj = -r->bTy_by_tau / r->tau;
+    } else if (status == SCS_INDETERMINATE) {
+        strcpy(info->status, "Indeterminate");
+        scaleArray(sol->x, NAN, n);
+        scaleArray(sol->y, NAN, m);
+        scaleArray(sol->s, NAN, m);
+    } else if (status == SCS_INFEASIBLE ||
+               status == SCS_INFEASIBLE_INACCURATE) {
+        scaleArray(sol->y, -1 / r->bTy_by_tau, m);
+        scaleArray(sol->x, NAN, n);
+        scaleArray(sol->s, NAN, m);
+        strcpy(info->status, status == SCS_INFEASIBLE
+                                 ? "Infeasible" : "Infeasible/Inaccurate");
+        info->relGap = info->resPri = info->resDual = NAN;
+        info->pobj = info->dobj = INFINITY;
+    } else {
+        scaleArray(sol->x, -1 / r->cTx_by_tau, n);
+        scaleArray(sol->s, -1 / r->cTx_by_tau, m);
+        scaleArray(sol->y, NAN, m);
+        strcpy(info->status, status == SCS_UNBOUNDED
+                                 ? "Unbounded" : "Unbounded/Inaccurate");
+        info->relGap = info->resPri = info->resDual = NAN;
+        info->pobj = info->dobj = -INFINITY;
+    }
+
+    /* unNormalizeSol() of normalize.h */
+    if (w->stgs->normalize) {
+        D = w->scal->D;
+        E = w->scal->E;
+        scale = w->sc_b * w->stgs->scale;
+        for (i = 0; i < n; ++i)
+            sol->x[i] /= (E[i] * w->sc_b);
+        for (i = 0; i < m; ++i)
+            sol->y[i] /= (D[i] * w->sc_c);
+        for (i = 0; i < m; ++i)
+            sol->s[i] *= D[i] / scale;
+    }
+}
+
+#endif
@@ -0,0 +1,29 @@
+""" Problems for the tests of infeasibility and unboundedness certificates.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+
+def infeasible_lp(n=20, delta=0.1, seed=0):
+    """ Narrowly infeasible LP, which takes SCS a few hundred iterations:
+    the rotated box `|Qx| <= 1`, with `1'Qx >= n + delta`.
+    """
+    rng = np.random.RandomState(seed)
+    Q = np.linalg.qr(rng.randn(n, n))[0]
+    A = np.vstack([Q, -Q, -Q.sum(axis=0)])
+    b = np.hstack([np.ones(2*n), -(n + delta)])
+    cone = {'l': 2*n + 1}
+
+    return dict(A=sp.csc_matrix(A), b=b, c=rng.randn(n)), cone
+
+
+def unbounded_lp(n=20, delta=0.1, seed=0):
+    """ Narrowly unbounded LP: the dual of `infeasible_lp()`.
+    """
+    data, cone = infeasible_lp(n, delta, seed)
+    A, b, c = data['A'], data['b'], data['c']
+    m = A.shape[0]
+    A = sp.vstack([A.T, -sp.eye(m)]).tocsc()
+    cone = {'f': n, 'l': m}
+
+    return dict(A=A, b=np.hstack([-c, np.zeros(m)]), c=b), cone
@@ -0,0 +1,106 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_solve_async():
+    data, cone, true_x = ex.simple_socp()
+
+    sol = asyncio.run(scs.solve_async(data, cone, eps=1e-6, verbose=False))
+
+    assert sol['info']['status'] == 'Solved'
+    assert np.allclose(sol['x'], true_x)
+
+def test_gather():
+    problems = [ex.l1(30, seed=i) for i in range(4)]
+
+    async def main():
+        return await asyncio.gather(*[scs.solve_async(data, cone, verbose=False)
+                                      for data, cone in problems])
+
+    sols = asyncio.run(main())
+
+    for (data, cone), sol in zip(problems, sols):
+        assert np.allclose(sol['x'], scs.solve(data, cone, verbose=False)['x'])
+
+def test_stream():
+    # the slow problem is first, but should not hold up the others
+    slow = ex.many_iter_ecp()
+    problems = [slow] + [ex.simple_lp()]*3
+
+    async def main():
+        return [(i, sol) async for i, sol in scs.solve_stream(problems, eps=1e-8,
+                                                               verbose=False)]
+
+    results = asyncio.run(main())
+
+    assert sorted(i for i, _ in results) == [0, 1, 2, 3]
+    assert results[-1][0] == 0
+
+    for i, sol in results:
+        data, cone = problems[i]
+        expected = scs.solve(data, cone, eps=1e-8, verbose=False)
+        assert np.allclose(sol['x'], expected['x'])
+
+def test_stream_warm_starts():
+    data, cone = ex.many_iter_ecp()
+    sol = scs.solve(data, cone, verbose=False)
+
+    async def main():
+        return dict([r async for r in scs.solve_stream([(data, cone)]*2,
+                                                       warm_starts=[None, sol],
+                                                       verbose=False)])
+
+    sols = asyncio.run(main())
+
+    assert sols[1]['info']['iter'] == 0
+    assert sols[0]['info']['iter'] > 0
+
+    async def bad():
+        return [r async for r in scs.solve_stream([(data, cone)], warm_starts=[])]
+
+    with pytest.raises(ValueError):
+        asyncio.run(bad())
+
+def test_cancel():
+    data, cone = ex.many_iter_ecp()
+    token = scs.CancelToken()
+
+    async def main():
+        task = asyncio.ensure_future(scs.solve_async(data, cone, cancel=token,
+                                                     callback_stride=1,
+                                                     verbose=False))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert token.cancelled
+
+def test_stream_close():
+    # the callback slows each iteration down, so the slow solves would run
+    # for seconds, unless closing the stream cancels them
+    problems = [ex.simple_lp()] + [ex.many_iter_ecp()]*4
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    async def main():
+        stream = scs.solve_stream(problems, executor=executor,
+                                  callback=lambda r: time.sleep(0.01),
+                                  callback_stride=1, verbose=False)
+        async for i, sol in stream:
+            break
+        await stream.aclose()
+        return i, sol
+
+    i, sol = asyncio.run(main())
+    assert i == 0 and sol['info']['status'] == 'Solved'
+
+    start = time.time()
+    executor.shutdown(wait=True)
+    assert time.time() - start < 2
@@ -0,0 +1,102 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+import cyscs.bench as bench
+from cyscs.bench.__main__ import main
+
+import numpy as np
+import json
+
+
+def test_tile():
+    for name in 'lp', 'socp', 'sdp', 'ecp', 'pcp':
+        data, cone = bench.PROBLEMS[name](3)
+        example = getattr(ex, 'simple_' + name)
+        data1, cone1 = example()[:2]
+
+        sol = scs.solve(data, cone, verbose=False, eps=1e-6)
+        sol1 = scs.solve(data1, cone1, verbose=False, eps=1e-6)
+
+        assert sol['info']['status'] == 'Solved'
+        assert np.isclose(sol['info']['pobj'], 3*sol1['info']['pobj'], rtol=1e-4)
+        assert np.allclose(sol['x'], np.tile(sol1['x'], 3), atol=1e-4)
+
+def test_cases():
+    case_list = bench.cases(problems=['l1', 'lp'], sizes=[10, 20], threads=[1, 2],
+                            processes=[0, 2], warm=[False, True])
+
+    # several threads are not combined with processes
+    assert len(case_list) == 2*2*3*2
+    assert all(c.threads == 1 for c in case_list if c.processes > 0)
+
+    with pytest.raises(ValueError):
+        bench.cases(problems=['nope'])
+
+def test_run():
+    case_list = bench.cases(problems=['l1'], sizes=[10], threads=[1, 2], warm=[False, True])
+    results = bench.run(case_list, repeat=1)
+
+    assert len(results['results']) == len(case_list)
+    for result in results['results']:
+        assert result['iter'] > 0
+        assert result['solve_time'] > 0
+        assert (result['setup_time'] is None) == (result['threads'] > 1)
+
+    # results can be written to JSON
+    json.dumps(results)
+
+def test_peak_rss():
+    case_list = bench.cases(problems=['l1'], sizes=[1000, 10, 1000])
+    results = bench.run(case_list, repeat=1)['results']
+
+    if results[0]['peak_rss'] is None:
+        pytest.skip("RSS is not available on this platform")
+
+    # measured per case, not over the life of the process
+    assert results[1]['peak_rss'] < results[0]['peak_rss']/10
+    assert results[2]['peak_rss'] > results[0]['peak_rss']/2
+
+def test_compare():
+    case_list = bench.cases(problems=['lp'], sizes=[10])
+    results = bench.run(case_list, repeat=1)
+    results['results'][0]['peak_rss'] = 2**21
+
+    assert bench.compare(results, results) == []
+
+    slow = json.loads(json.dumps(results))
+    slow['results'][0]['iter'] *= 2
+    slow['results'][0]['solve_time'] = 1.0
+    slow['results'][0]['peak_rss'] = 2**30
+    regressions = bench.compare(slow, results)
+
+    assert set(r['metric'] for r in regressions) >= {'iter', 'solve_time', 'peak_rss'}
+    assert all(r['ratio'] > 1 for r in regressions)
+
+    # growth from a zero baseline
+    zero = json.loads(json.dumps(results))
+    zero['results'][0]['peak_rss'] = 0
+    regressions = bench.compare(slow, zero, metrics=['peak_rss'])
+    assert [r['ratio'] for r in regressions] == [float('inf')]
+    small = json.loads(json.dumps(zero))
+    small['results'][0]['peak_rss'] = 2**19
+    assert bench.compare(small, zero, metrics=['peak_rss']) == []
+
+    # faster results, or a different sweep, are not regressions
+    assert bench.compare(results, slow) == []
+    assert bench.compare(results, dict(results=[])) == []
+
+def test_cli(tmpdir):
+    base = str(tmpdir.join('base.json'))
+    args = ['--problems', 'lp', '--sizes', '5', '--solvers', 'direct',
+            '--start', 'cold', '--repeat', '1']
+
+    assert main(args + ['-o', base]) == 0
+    with open(base) as f:
+        results = json.load(f)
+    assert len(results['results']) == 1
+
+    # an impossible baseline
+    results['results'][0]['iter'] = 1
+    with open(base, 'w') as f:
+        json.dump(results, f)
+    assert main(args + ['--baseline', base]) == 1
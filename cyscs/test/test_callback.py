@@ -0,0 +1,196 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+
+import problems
+
+
+def assert_same_solve(sol, sol2):
+    assert sol2['info']['status'] == sol['info']['status']
+    assert sol2['info']['iter'] == sol['info']['iter']
+    for key in 'x', 'y', 's':
+        assert np.array_equal(sol2[key], sol[key], equal_nan=True)
+
+def test_callback():
+    data, cone = ex.many_iter_ecp()
+    progress = []
+
+    sol = scs.solve(data, cone, callback=progress.append, callback_stride=100,
+                    verbose=False)
+
+    assert len(progress) >= 5
+    assert progress[-1]['iter'] == sol['info']['iter']
+
+    iters = [p['iter'] for p in progress]
+    assert iters[:3] == [100, 200, 300]
+
+    for key in 'resPri', 'resDual', 'relGap', 'pobj', 'dobj':
+        assert key in progress[0]
+
+    # the residuals should shrink as the solve progresses
+    assert progress[-1]['resPri'] < progress[0]['resPri']
+
+def test_callback_solution():
+    data, cone, true_x = ex.simple_socp()
+    progress = []
+
+    sol = scs.solve(data, cone, callback=progress.append, callback_stride=5,
+                    eps=1e-6, verbose=False)
+
+    assert np.allclose(sol['x'], true_x)
+    assert sol['info']['status'] == 'Solved'
+    assert len(progress) > 1
+
+def test_callback_max_iters():
+    data, cone = ex.many_iter_ecp()
+    progress = []
+
+    sol = scs.solve(data, cone, callback=progress.append, callback_stride=30,
+                    max_iters=100, verbose=False)
+
+    assert [p['iter'] for p in progress] == [30, 60, 90, 100]
+    assert sol['info']['iter'] == 100
+
+def test_callback_certificates():
+    # strides continue from the full iterate, so certificates found by a
+    # single solve are found at the same iteration
+    for make, status in (problems.infeasible_lp, 'Infeasible'), (problems.unbounded_lp, 'Unbounded'):
+        for seed in range(3):
+            data, cone = make(seed=seed)
+            sol = scs.solve(data, cone, verbose=False)
+            assert sol['info']['status'] == status
+            assert sol['info']['iter'] > 100
+
+            for stride in 1, 7, 100:
+                sol2 = scs.solve(data, cone, callback=lambda p: None,
+                                 callback_stride=stride, verbose=False)
+                assert_same_solve(sol, sol2)
+
+def test_callback_indirect():
+    data, cone = ex.many_iter_ecp()
+    sol = scs.solve(data, cone, use_indirect=True, verbose=False)
+    sol2 = scs.solve(data, cone, use_indirect=True, callback=lambda p: None,
+                     callback_stride=13, verbose=False)
+    assert_same_solve(sol, sol2)
+
+def test_workspace_callback():
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone, verbose=False)
+    progress = []
+
+    sol = work.solve(callback=progress.append, callback_stride=50)
+
+    assert progress[-1]['iter'] == sol['info']['iter']
+    assert len(progress) >= 10
+
+    # setting persists, like other settings
+    assert work.settings['callback'] == progress.append
+
+def test_limits_not_reached():
+    # a time limit or token that never fires does not change the solve
+    for make in problems.infeasible_lp, problems.unbounded_lp:
+        for seed in range(3):
+            data, cone = make(seed=seed)
+            sol = scs.solve(data, cone, verbose=False)
+
+            sol2 = scs.solve(data, cone, time_limit=60.0, verbose=False)
+            assert_same_solve(sol, sol2)
+
+            sol2 = scs.solve(data, cone, cancel=scs.CancelToken(), verbose=False)
+            assert_same_solve(sol, sol2)
+
+            work = scs.Workspace(data, cone, verbose=False)
+            sol2 = work.solve(time_limit=60.0, cancel=scs.CancelToken())
+            assert_same_solve(sol, sol2)
+
+def test_strides_match_scs():
+    # strides.h repeats the iteration loop of scs.c from SCS 1.2.6, so a
+    # new SCS must be checked against it
+    assert scs.scs_version() == '1.2.6'
+
+    problems = [ex.simple_lp(), ex.simple_socp(), ex.simple_sdp(), ex.simple_ecp(),
+                ex.many_iter_ecp(), ex.simple_pcp(), ex.l1(30),
+                ex.random_lp(100), ex.random_socp(50), ex.random_sdp(3, 5),
+                ex.random_ecp(50), ex.random_pcp(50), ex.sparse_lasso(100),
+                ex.portfolio(50)]
+
+    for problem in problems:
+        data, cone = problem[:2]
+        # stopping at every iteration count up to 30 checks the iterates
+        # one by one, and the last one the whole solve
+        for max_iters in list(range(1, 31)) + [2500]:
+            sol = scs.solve(data, cone, max_iters=max_iters, verbose=False)
+            sol2 = scs.solve(data, cone, max_iters=max_iters, callback=lambda r: None,
+                             callback_stride=7, verbose=False)
+
+            assert_same_solve(sol, sol2)
+            assert np.array_equal(sol2['info']['pobj'], sol['info']['pobj'],
+                                  equal_nan=True)
+
+def test_callback_batch():
+    data, cone = ex.simple_lp()
+
+    with pytest.raises(ValueError):
+        scs.solve_many([(data, cone)], callback=print)
+
+    work = scs.Workspace(data, cone, callback=print)
+    with pytest.raises(ValueError):
+        work.solve_batch(B=np.vstack([data['b']]*2))
+
+def test_cancel():
+    data, cone = ex.many_iter_ecp()
+    token = scs.CancelToken()
+    progress = []
+
+    def callback(p):
+        progress.append(p)
+        if p['iter'] >= 200:
+            token.cancel()
+
+    sol = scs.solve(data, cone, cancel=token, callback=callback,
+                    callback_stride=100, verbose=False)
+
+    assert token.cancelled
+    assert sol['info']['status'] == 'Cancelled'
+    assert sol['info']['statusVal'] == -8
+    assert sol['info']['iter'] == 200
+    assert np.all(np.isfinite(sol['x']))
+
+def test_cancel_not_called():
+    data, cone, true_x = ex.simple_socp()
+    token = scs.CancelToken()
+
+    sol = scs.solve(data, cone, cancel=token, callback_stride=5, eps=1e-6,
+                    verbose=False)
+
+    assert sol['info']['status'] == 'Solved'
+    assert np.allclose(sol['x'], true_x)
+
+def test_workspace_cancel():
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone, verbose=False)
+    token = scs.CancelToken()
+    token.cancel()
+
+    sol = work.solve(cancel=token, callback_stride=10)
+    assert sol['info']['status'] == 'Cancelled'
+    assert sol['info']['iter'] == 10
+
+    # a fresh token lets the solve continue from the last iterate
+    sol = work.solve(cancel=scs.CancelToken(), warm_start=sol)
+    assert sol['info']['status'] == 'Solved'
+
+def test_time_limit():
+    data, cone = ex.many_iter_ecp()
+
+    sol = scs.solve(data, cone, time_limit=0.0, callback_stride=10,
+                    verbose=False)
+
+    assert sol['info']['status'] == 'Time limit reached'
+    assert sol['info']['statusVal'] == -9
+    assert sol['info']['iter'] == 10
+
+    with pytest.raises(ValueError):
+        scs.solve_many([(data, cone)], time_limit=1.0)
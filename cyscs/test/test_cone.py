@@ -1,6 +1,11 @@
 from __future__ import print_function
 import pytest
+import pickle
 
+import numpy as np
+import cyscs as scs
+import cyscs.examples as ex
+from cyscs.bench import tile
 from cyscs._scs import cone_len, format_and_copy_cone
 
 def test_size_f():
@@ -58,3 +63,122 @@ def test_cone():
                 sum(d['q']) + len(d['p'])*3 + sum([i*(i+1)/2 for i in d['s']]))
 
     assert cone_len(c) == expected
+
+def test_cone_object():
+    d = dict(f=1, l=20, ep=4, ed=7, q=[3,4,9,10], s=[3,2,4], p=[.1, -.7])
+    c = scs.Cone(**d)
+
+    assert c.size == cone_len(d) == cone_len(c)
+    assert c.offsets == dict(f=0, l=1, q=21, s=47, ep=66, ed=78, p=99)
+    assert sorted(c) == sorted(d)
+    assert c['q'].dtype == np.int64
+    assert c['p'].dtype == np.float64
+
+    with pytest.raises(ValueError):
+        c['q'][0] = 1
+
+    assert c == scs.Cone(**format_and_copy_cone(d))
+    assert c != scs.Cone(f=1)
+    assert hash(c) == hash(scs.Cone(**d))
+    assert pickle.loads(pickle.dumps(c)) == c
+
+def test_cone_trivial_keys():
+    c = scs.Cone(f=0, l=3, q=[])
+    assert dict(c) == dict(l=3)
+    assert c.size == 3
+
+def test_cone_negative():
+    with pytest.raises(ValueError):
+        scs.Cone(l=-1)
+
+    with pytest.raises(ValueError):
+        scs.Cone(q=[3, -2])
+
+def test_solve_with_cone():
+    problems = [ex.simple_lp(), ex.simple_socp()[:2], ex.simple_sdp()[:2],
+                ex.simple_ecp()[:2], ex.simple_pcp()[:2]]
+
+    for data, cone in problems:
+        c = scs.Cone(**cone)
+        sol = scs.solve(data, cone)
+
+        for use_indirect in False, True:
+            sol2 = scs.solve(data, c, use_indirect=use_indirect)
+            assert np.allclose(sol2['x'], sol['x'])
+
+        work = scs.Workspace(data, c)
+        assert np.allclose(work.solve()['x'], sol['x'])
+
+        sols = scs.solve_many([(data, c)]*3)
+        assert np.allclose(sols[2]['x'], sol['x'])
+
+def test_cone_built_once():
+    data, cone = ex.simple_socp()[:2]
+    c = scs.Cone(**cone)
+
+    with scs.profile() as prof:
+        for _ in range(3):
+            scs.solve(data, c)
+
+    assert prof.counts['stuff_c_cone'] == 1
+
+def test_block_rows():
+    c = scs.Cone(f=1, l=20, ep=4, ed=7, q=[3,4,9,10], s=[3,2,4], p=[.1, -.7])
+
+    assert c.block_rows('f').tolist() == [0, 1]
+    assert c.block_rows('l').tolist() == [1, 21]
+    assert c.block_rows('q').tolist() == [21, 24, 28, 37, 47]
+    assert c.block_rows('s').tolist() == [47, 53, 56, 66]
+    assert c.block_rows('ep').tolist() == [66, 69, 72, 75, 78]
+    assert c.block_rows('ed').tolist() == list(range(78, 100, 3))
+    assert c.block_rows('p').tolist() == [99, 102, 105]
+    assert c.block_rows('q') is c.block_rows('q')
+
+    assert c.block('q', 2) == slice(28, 37)
+    assert c.block('q', -1) == slice(37, 47)
+    assert c.block('l') == slice(1, 21)
+
+    with pytest.raises(IndexError):
+        c.block('q', 4)
+
+    with pytest.raises(ValueError):
+        c.block_rows('x')
+
+    empty = scs.Cone(l=2)
+    assert empty.block_rows('q').tolist() == [2]
+    assert empty.block_rows('f').tolist() == [0]
+    assert empty.block_rows('p').tolist() == [2]
+
+def test_solution_block():
+    data, cone = tile(*ex.simple_socp()[:2], k=3)
+    sol = scs.solve(data, cone)
+    c = sol.cone
+
+    assert isinstance(sol, scs.Solution)
+    assert c == scs.Cone(**cone)
+
+    bounds = c.block_rows('q')
+    for i in range(len(cone['q'])):
+        block = sol.block('q', i)
+        assert np.array_equal(block['y'], sol['y'][bounds[i]:bounds[i+1]])
+        assert np.array_equal(block['s'], sol['s'][bounds[i]:bounds[i+1]])
+        # views of the solution
+        assert np.may_share_memory(block['y'], sol['y'])
+
+    work = scs.Workspace(data, cone)
+    assert np.allclose(work.solve().block('q', 1)['y'], sol.block('q', 1)['y'])
+
+    B = np.tile(data['b'], (3, 1))
+    batch = work.solve_batch(B)
+    assert batch.block('q', 1)['y'].shape == (3, cone['q'][1])
+
+    sols = scs.solve_many([(data, cone)]*2)
+    assert np.allclose(sols[1].block('q', 0)['s'], sol.block('q', 0)['s'])
+
+def test_solution_pickle():
+    data, cone = tile(*ex.simple_socp()[:2], k=3)
+    sol = scs.solve(data, cone)
+    sol2 = pickle.loads(pickle.dumps(sol))
+
+    assert sol2.cone == sol.cone
+    assert np.array_equal(sol2.block('q', 1)['y'], sol.block('q', 1)['y'])
@@ -2,6 +2,7 @@ import cyscs as scs
 import pytest
 import cyscs.examples as ex
 import numpy as np
+import warnings
 
 def test_b():
     data, cone = ex.simple_lp()
@@ -154,3 +155,59 @@ def test_xys():
     work.solve(warm_start = ws)
 
 
+
+def test_int32_indices():
+    # with the optional 32-bit extensions, int32 CSC matrices are not converted
+    from cyscs._scs import _extensions
+
+    data, cone, true_x = ex.simple_socp()
+    data['A'].indices = data['A'].indices.astype(np.int32)
+    data['A'].indptr = data['A'].indptr.astype(np.int32)
+
+    if (False, np.dtype(np.int32), np.dtype(np.float64)) not in _extensions:
+        pytest.skip("cyscs built without 32-bit integer extensions")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        sol = scs.solve(data, cone, eps=1e-6)
+        work = scs.Workspace(data, cone, eps=1e-6)
+
+    assert np.allclose(sol['x'], true_x)
+    assert np.allclose(work.solve()['x'], true_x)
+    assert work.solve_batch(C=np.vstack([data['c']]*2))['info']['iter'][0] > 0
+
+def test_float32():
+    from cyscs._scs import _extensions
+
+    if (False, np.dtype(np.int64), np.dtype(np.float32)) not in _extensions:
+        with pytest.raises(ValueError):
+            scs.solve(*ex.simple_lp(), dtype=np.float32)
+        pytest.skip("cyscs built without single-precision extensions")
+
+    data, cone, true_x = ex.simple_socp()
+    data['b'] = data['b'].astype(np.float32)
+    data['c'] = data['c'].astype(np.float32)
+
+    with pytest.warns(UserWarning):
+        sol = scs.solve(data, cone, dtype=np.float32, eps=1e-5)
+
+    for key in 'x', 'y', 's':
+        assert sol[key].dtype == np.float32
+    assert np.allclose(sol['x'], true_x, atol=1e-4)
+
+    data['A'].data = data['A'].data.astype(np.float32)
+    work = scs.Workspace(data, cone, dtype=np.float32, use_indirect=True, eps=1e-5)
+    sol = work.solve()
+    assert sol['x'].dtype == np.float32
+    assert np.allclose(sol['x'], true_x, atol=1e-4)
+
+    sols = work.solve_batch(B=np.vstack([data['b']]*2))
+    assert sols['info']['pobj'].dtype == np.float32
+    assert np.allclose(sols['x'], true_x, atol=1e-4)
+
+def test_float32_bc():
+    data, cone = ex.simple_lp()
+
+    # b and c must match the requested dtype
+    with pytest.raises(ValueError):
+        scs.solve(data, cone, dtype=np.float32)
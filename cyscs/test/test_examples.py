@@ -0,0 +1,79 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+
+
+def check_csc(A):
+    assert A.format == 'csc'
+    assert A.indices.dtype == np.int64
+    assert A.indptr.dtype == np.int64
+    assert A.has_canonical_format
+
+def test_known_solution():
+    generators = [(ex.random_lp, dict(m=200)),
+                  (ex.random_socp, dict(num_cones=60)),
+                  (ex.random_sdp, dict(num_blocks=4, max_size=6)),
+                  (ex.random_ecp, dict(num_cones=40)),
+                  (ex.random_pcp, dict(num_cones=40))]
+
+    for generator, kwargs in generators:
+        data, cone, true_x = generator(density=0.1, **kwargs)
+        check_csc(data['A'])
+
+        sol = scs.solve(data, cone, verbose=False, eps=1e-6, max_iters=20000)
+        opt = data['c'].dot(true_x)
+
+        assert sol['info']['status'] in ('Solved', 'Solved/Inaccurate')
+        assert np.isclose(sol['info']['pobj'], opt, rtol=1e-3, atol=1e-3)
+
+def test_mixed_cone():
+    cone = dict(f=5, l=10, q=[3, 4], s=[2, 3], ep=2, ed=2, p=[0.3, -0.6])
+    data, cone, true_x = ex.random_cone_problem(cone, density=0.3, seed=1)
+
+    sol = scs.solve(data, cone, verbose=False, eps=1e-6, max_iters=20000)
+    assert np.isclose(sol['info']['pobj'], data['c'].dot(true_x), rtol=1e-3, atol=1e-3)
+
+def test_seed():
+    data, cone, x = ex.random_socp(100, seed=3)
+    data2, cone2, x2 = ex.random_socp(100, seed=3)
+    data3, _, _ = ex.random_socp(100, seed=4)
+
+    assert cone == cone2
+    assert (data['A'] != data2['A']).nnz == 0
+    assert np.array_equal(data['b'], data2['b'])
+    assert np.array_equal(x, x2)
+    assert not np.array_equal(data['c'], data3['c'])
+
+def test_lasso():
+    data, cone, extra = ex.sparse_lasso(50, seed=0)
+    check_csc(data['A'])
+
+    sol = scs.solve(data, cone, verbose=False, eps=1e-7, max_iters=20000)
+    n = extra['C'].shape[1]
+    x, lam = sol['x'][:n], data['c'][n]
+
+    r = extra['C'].dot(x) - extra['d']
+    assert np.isclose(0.5*r.dot(r) + lam*np.abs(x).sum(), sol['info']['pobj'], rtol=1e-4)
+
+def test_portfolio():
+    data, cone, extra = ex.portfolio(50, seed=0)
+    check_csc(data['A'])
+
+    sol = scs.solve(data, cone, verbose=False, eps=1e-7, max_iters=20000)
+    w = sol['x'][:50]
+
+    assert np.isclose(w.sum(), 1)
+    assert w.min() > -1e-6
+
+    risk = np.sum(extra['F'].T.dot(w)**2) + np.sum(extra['D']*w**2)
+    assert np.isclose(-extra['mu'].dot(w) + risk, sol['info']['pobj'], rtol=1e-4)
+
+def test_large():
+    data, cone, _ = ex.random_lp(m=100000, density=0.001)
+    A = data['A']
+
+    check_csc(A)
+    assert A.shape == (100000, 50000)
+    assert A.nnz > 0.99*5*10**6
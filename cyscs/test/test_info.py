@@ -0,0 +1,122 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import pickle
+
+from collections.abc import Mapping
+
+
+def test_attributes():
+    data, cone = ex.simple_lp()
+    info = scs.solve(data, cone)['info']
+
+    assert isinstance(info, scs.SolveInfo)
+    assert info.status == 'Solved'
+    assert info.statusVal == 1
+    assert info.iter == info['iter']
+    assert info['relGap'] == info.relGap
+
+    with pytest.raises(KeyError):
+        info['foo']
+
+def test_dict_compat():
+    data, cone = ex.simple_lp()
+    info = scs.solve(data, cone)['info']
+    d = info.to_dict()
+
+    assert type(d) is dict
+    assert set(d) == set(info.keys()) == set(info)
+    assert len(info) == len(d)
+    assert 'status' in info
+    np.testing.assert_equal(dict(info), d)
+
+def test_mapping():
+    data, cone = ex.simple_lp()
+    info = scs.solve(data, cone)['info']
+    d = info.to_dict()
+
+    assert isinstance(info, Mapping)
+    assert info.get('iter') == info.iter
+    assert info.get('foo') is None
+    assert info.get('foo', 3) == 3
+    np.testing.assert_equal(dict(info.items()), d)
+    np.testing.assert_equal(list(info.values()), [d[k] for k in info.keys()])
+
+    # the NaN residuals of a solved problem are equal
+    assert np.isnan(info.resInfeas)
+    assert info == d and d == info
+    assert info == pickle.loads(pickle.dumps(info))
+    assert not info != d
+    assert info != dict(d, iter=info.iter + 1)
+    assert info != dict(d, foo=1)
+    assert info != [1]
+
+def test_no_init():
+    with pytest.raises(TypeError):
+        scs._direct.SolveInfo()
+
+def test_pickle():
+    data, cone = ex.simple_socp()[:2]
+    info = scs.solve(data, cone)['info']
+
+    info2 = pickle.loads(pickle.dumps(info))
+    np.testing.assert_equal(info2.to_dict(), info.to_dict())
+
+def test_workspace_info():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone)
+
+    assert isinstance(work.info, scs.SolveInfo)
+    assert work.info.setupTime > 0
+
+    sol = work.solve()
+    np.testing.assert_equal(work.info.to_dict(), sol['info'].to_dict())
+
+def test_to_numpy():
+    problems = [ex.l1(20, seed=i) for i in range(4)]
+    infos = [sol['info'] for sol in scs.solve_many(problems)]
+
+    arr = scs.SolveInfo.to_numpy(infos)
+
+    assert arr.shape == (4,)
+    assert list(arr['iter']) == [info.iter for info in infos]
+    assert np.array_equal(arr['relGap'], [info.relGap for info in infos], equal_nan=True)
+    assert [s.decode() for s in arr['status']] == [info.status for info in infos]
+
+    assert scs.SolveInfo.to_numpy([]).shape == (0,)
+
+def test_to_numpy_batch_dtype():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone)
+
+    sols = work.solve_batch(B=np.vstack([data['b']]*2))
+    arr = scs.SolveInfo.to_numpy([work.solve()['info']])
+
+    assert arr.dtype == sols['info'].dtype
+
+def test_to_numpy_mixed_dtypes():
+    if (False, np.dtype(np.int64), np.dtype(np.float32)) not in scs._scs._extensions:
+        pytest.skip("float32 extension modules not built")
+
+    data, cone = ex.simple_lp()
+    info64 = scs.solve(data, cone)['info']
+    data32 = dict(A=data['A'].astype(np.float32), b=data['b'].astype(np.float32),
+                  c=data['c'].astype(np.float32))
+    info32 = scs.solve(data32, cone, dtype=np.float32)['info']
+
+    assert isinstance(info32, scs.SolveInfo)
+    assert scs.SolveInfo.to_numpy([info32])['pobj'].dtype == np.float32
+
+    with pytest.raises(TypeError):
+        scs.SolveInfo.to_numpy([info32, info64])
+
+def test_batch_status():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone)
+
+    sols = work.solve_batch(B=np.vstack([data['b']]*3))
+
+    # bytes after the status string are zeroed
+    assert list(sols['info']['status']) == [b'Solved']*3
@@ -0,0 +1,53 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+from cyscs.bench import memory
+
+import numpy as np
+
+
+def test_measure():
+    data, cone = ex.l1(m=50)
+    m, n = data['A'].shape
+
+    result = memory.measure(lambda: scs.solve(data, cone, verbose=False))
+
+    # x, y, s are allocated and returned
+    assert result['copies']['solution'] >= 8*(n + 2*m)
+    assert result['result'] >= 8*(n + 2*m)
+    assert result['peak'] >= result['result']
+    # the data is already in the right format
+    assert result['copies']['check_data'] < 8*data['A'].nnz
+
+def test_copies():
+    data, cone = ex.l1(m=50)
+    A = data['A'].astype(np.float32).tocsr()
+    data = dict(A=A, b=data['b'], c=data['c'])
+
+    result = memory.measure(lambda: scs.Workspace(data, cone, verbose=False))
+
+    # A is converted to CSC with int64 indices, and the Workspace keeps it
+    assert result['copies']['check_data'] >= 16*A.nnz
+    assert result['copies']['cone'] >= 0
+
+    # the functions are restored
+    assert scs._scs.check_data is scs._util.check_data
+
+def test_no_growth():
+    data, cone = ex.l1(m=30)
+    calls = memory.scenarios(data, cone)
+
+    for name in 'solve', 'workspace', 'resolve':
+        growth = memory.measure_growth(calls[name], n=20)
+        assert len(growth['traced']) == 20
+        assert not memory.leaks(growth)
+
+def test_leak_detected():
+    kept = []
+    growth = memory.measure_growth(lambda: kept.append(np.zeros(1000)), n=10)
+
+    assert growth['traced_per_call'] > 8000
+    assert memory.leaks(growth)
+
+def test_cli():
+    assert memory.main(['--problem', 'lp', '--size', '5', '-n', '5']) == 0
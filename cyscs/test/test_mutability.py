@@ -31,3 +31,78 @@ def test_solve():
     assert any(ws['y'] != sol['y'])
     assert any(ws['s'] != sol['s'])
 
+
+def test_out():
+    data, cone = ex.simple_lp()
+    m,n = data['A'].shape
+
+    out = dict(x=np.ones(n), y=np.ones(m), s=np.ones(m))
+    x = out['x']
+
+    sol = scs.solve(data, cone, out=out)
+
+    # the solution is written into the caller's buffers
+    assert sol['x'] is x
+    assert np.allclose(sol['x'], scs.solve(data, cone)['x'])
+
+def test_out_warm_start():
+    data, cone = ex.many_iter_ecp()
+    m,n = data['A'].shape
+    work = scs.Workspace(data, cone)
+
+    out = dict(x=np.zeros(n), y=np.zeros(m), s=np.zeros(m))
+
+    sol = work.solve(out=out)
+    assert sol['info']['iter'] >= 500
+
+    # warm start from the buffers' current contents, without copying
+    sol = work.solve(warm_start=out, out=out)
+    assert sol['info']['iter'] == 0
+    assert sol['y'] is out['y']
+
+    # without a warm start, the buffers are zeroed first
+    sol = work.solve(out=out)
+    assert sol['info']['iter'] >= 500
+
+def test_out_bad():
+    data, cone = ex.simple_lp()
+    m,n = data['A'].shape
+
+    with pytest.raises(ValueError):
+        scs.solve(data, cone, out=dict(x=np.zeros(n+1), y=np.zeros(m), s=np.zeros(m)))
+
+    with pytest.raises(ValueError):
+        scs.solve(data, cone, out=dict(x=np.zeros(n, dtype=np.float32),
+                                       y=np.zeros(m), s=np.zeros(m)))
+
+    with pytest.raises(ValueError):
+        scs.solve(data, cone, out=dict(x=np.zeros(2*n)[::2], y=np.zeros(m), s=np.zeros(m)))
+
+def test_A_not_modified():
+    # SCS normalizes A, but the caller's A must be left untouched,
+    # however the extension modules were built
+    data, cone, true_x = ex.simple_socp()
+    A = data['A'].copy()
+
+    scs.solve(data, cone)
+    assert (data['A'] != A).nnz == 0
+
+    work = scs.Workspace(data, cone)
+    work.solve()
+    assert (data['A'] != A).nnz == 0
+
+def test_workspace_keeps_A():
+    # the Workspace must keep A alive when SCS does not copy it
+    import gc
+
+    for normalize in True, False:
+        data, cone, true_x = ex.simple_socp()
+        work = scs.Workspace(data, cone, normalize=normalize, eps=1e-6)
+        del data
+        gc.collect()
+
+        # overwrite freed memory
+        junk = [np.ones(50) for _ in range(100)]
+
+        sol = work.solve()
+        assert np.allclose(sol['x'], true_x)
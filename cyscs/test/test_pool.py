@@ -0,0 +1,113 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_pool_solve():
+    data, cone, true_x = ex.simple_socp()
+    pool = scs.WorkspacePool(data, cone, size=2, eps=1e-6)
+
+    assert pool.size == 2
+
+    sol = pool.solve()
+    assert np.allclose(sol['x'], true_x)
+
+def test_pool_threads():
+    data, cone = ex.l1(50)
+    pool = scs.WorkspacePool(data, cone, size=3, verbose=False)
+
+    scales = np.linspace(1, 2, 12)
+    def solve(a):
+        return pool.solve(new_bc=dict(b=a*data['b']))
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sols = list(executor.map(solve, scales))
+
+    work = scs.Workspace(data, cone, verbose=False)
+    for a, sol in zip(scales, sols):
+        expected = work.solve(new_bc=dict(b=a*data['b']))
+        assert np.allclose(sol['x'], expected['x'])
+
+def test_pool_copies(monkeypatch):
+    copies = []
+    copy = scs.Workspace._copy
+    monkeypatch.setattr(scs.Workspace, '_copy',
+                        lambda work: copies.append(work) or copy(work))
+
+    data, cone = ex.many_iter_ecp()
+    pool = scs.WorkspacePool(data, cone, size=3, verbose=False, callback=print)
+    # the first workspace is factored, and the others copied from it
+    assert copies == [pool._workspaces[0]]*2
+    work = scs.Workspace(data, cone, verbose=False)
+    sol = work.solve()
+
+    for w in pool._workspaces:
+        assert w.settings['callback'] is print
+        w.settings['callback'] = None
+
+        sol2 = w.solve()
+        assert sol2['info']['iter'] == sol['info']['iter']
+        assert np.array_equal(sol2['x'], sol['x'])
+
+def test_pool_indirect():
+    data, cone = ex.simple_lp()
+    pool = scs.WorkspacePool(data, cone, size=2, use_indirect=True)
+
+    assert pool.solve()['info']['status'] == 'Solved'
+
+def test_pool_out():
+    data, cone = ex.simple_lp()
+    m, n = data['A'].shape
+    pool = scs.WorkspacePool(data, cone, size=2)
+
+    out = dict(x=np.zeros(n), y=np.zeros(m), s=np.zeros(m))
+    sol = pool.solve(new_bc=dict(b=2*data['b']), out=out)
+
+    assert sol['x'] is out['x'] and sol['y'] is out['y']
+    assert np.allclose(out['x'], scs.solve(dict(data, b=2*data['b']), cone)['x'])
+
+def test_pool_no_persist():
+    data, cone = ex.simple_lp()
+    pool = scs.WorkspacePool(data, cone, size=1)
+
+    pool.solve(new_bc=dict(b=2*data['b']), eps=1e-6)
+
+    with pool.workspace() as work:
+        assert np.all(work.data['b'] == data['b'])
+        assert work.settings['eps'] == 1e-3
+
+def test_checkout_checkin():
+    data, cone = ex.simple_lp()
+    pool = scs.WorkspacePool(data, cone, size=1)
+
+    work = pool.checkout()
+
+    with pytest.raises(Exception):
+        pool.checkout(timeout=0.01)
+
+    with pytest.raises(ValueError):
+        pool.checkin(scs.Workspace(data, cone))
+
+    pool.checkin(work)
+    assert pool.checkout() is work
+
+def test_checkin_twice():
+    data, cone = ex.simple_lp()
+    pool = scs.WorkspacePool(data, cone, size=2)
+
+    work = pool.checkout()
+    pool.checkin(work)
+    with pytest.raises(ValueError):
+        pool.checkin(work)
+
+    # a free workspace was never checked out
+    with pytest.raises(ValueError):
+        pool.checkin(pool._workspaces[1])
+
+    works = {pool.checkout(), pool.checkout()}
+    assert len(works) == 2
+    with pytest.raises(Exception):
+        pool.checkout(timeout=0.01)
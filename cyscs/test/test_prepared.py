@@ -0,0 +1,111 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import scipy.sparse as sp
+import warnings
+
+
+def assert_same(sol, sol2):
+    assert sol2['info']['iter'] == sol['info']['iter']
+    assert np.allclose(sol2['x'], sol['x'])
+    assert np.allclose(sol2['y'], sol['y'])
+    assert np.allclose(sol2['s'], sol['s'])
+
+def test_prepared():
+    problems = [ex.simple_lp(), ex.simple_socp()[:2], ex.simple_sdp()[:2],
+                ex.simple_ecp()[:2], ex.simple_pcp()[:2], ex.l1(m=30)]
+
+    for data, cone in problems:
+        prepared = scs.PreparedProblem(data, cone)
+        assert prepared.shape == data['A'].shape
+
+        for use_indirect in False, True:
+            sol = scs.solve(data, cone, use_indirect=use_indirect)
+            assert_same(sol, scs.solve(prepared, use_indirect=use_indirect))
+            assert_same(sol, prepared.solve(use_indirect=use_indirect))
+
+def test_converted_once():
+    data, cone = ex.l1(m=30)
+    A = sp.csc_matrix(data['A'])
+    A.indices = A.indices.astype(np.int32)
+    A.indptr = A.indptr.astype(np.int32)
+    data = dict(A=A, b=data['b'], c=data['c'])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        prepared = scs.PreparedProblem(data, cone)
+        sol = scs.solve(data, cone)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        sol2 = scs.solve(prepared)
+
+    assert_same(sol, sol2)
+
+def test_skips_checks():
+    data, cone = ex.l1(m=30)
+    prepared = scs.PreparedProblem(data, cone)
+
+    with scs.profile() as prof:
+        scs.solve(prepared)
+
+    assert 'check_data' not in prof.timings
+    assert 'as_cone' not in prof.timings
+    assert 'scs' in prof.timings
+
+def test_values_change():
+    data, cone = ex.l1(m=30)
+    data = dict(A=data['A'], b=data['b'].copy(), c=data['c'])
+    prepared = scs.PreparedProblem(data, cone)
+
+    data['b'] *= 2
+    assert_same(scs.solve(data, cone), scs.solve(prepared))
+
+def test_input_unchanged():
+    data, cone = ex.many_iter_ecp()
+    A = data['A'].copy()
+    prepared = scs.PreparedProblem(data, cone)
+
+    for normalize in True, False:
+        scs.solve(prepared, normalize=normalize)
+        assert np.array_equal(data['A'].data, A.data)
+
+def test_solve_many():
+    problems = [ex.simple_lp(), ex.simple_socp()[:2], ex.l1(m=30)]
+    prepared = [scs.PreparedProblem(data, cone) for data, cone in problems]
+
+    sols = scs.solve_many(problems, workers=2)
+    mixed = [prepared[0], problems[1], prepared[2]]
+
+    for sols2 in scs.solve_many(prepared, workers=2), scs.solve_many(mixed):
+        for sol, sol2 in zip(sols, sols2):
+            assert_same(sol, sol2)
+
+def test_warm_start_cache():
+    data, cone = ex.many_iter_ecp()
+    prepared = scs.PreparedProblem(data, cone)
+    cache = scs.WarmStartCache()
+
+    sol = scs.solve(prepared, warm_start_cache=cache)
+    sol2 = scs.solve(data, cone, warm_start_cache=cache)
+
+    assert len(cache) == 1
+    assert sol2['info']['iter'] < sol['info']['iter']
+
+def test_bad_args():
+    data, cone = ex.simple_lp()
+    prepared = scs.PreparedProblem(data, cone)
+
+    with pytest.raises(TypeError):
+        scs.solve(prepared, cone)
+
+    with pytest.raises(TypeError):
+        scs.solve(data)
+
+    with pytest.raises(ValueError):
+        scs.PreparedProblem(data, dict(l=1))
+
+    with pytest.raises(ValueError):
+        scs.solve(prepared, dtype=np.float32)
@@ -0,0 +1,145 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def redundant(data, cone):
+    """ Add to a problem with `f` and `l` cones a duplicate `f` row, a
+    duplicate `l` row with a larger `b`, a variable fixed to 2 by an `f` row,
+    an unused variable, and an empty `l` row.
+
+    The optimal value increases by 1.
+    """
+    A, b, c = data['A'].tocsr(), data['b'], data['c']
+    m, n = A.shape
+    f = cone['f']
+
+    A = sp.hstack([A, sp.csr_matrix((m, 2))]).tolil()
+    # the fixed variable also appears in the first l row
+    A[f, n] = 1.0
+    A = A.tocsr()
+
+    fixed = sp.csr_matrix(([3.0], ([0], [n])), shape=(1, n + 2))
+    empty = sp.csr_matrix((1, n + 2))
+    A = sp.vstack([A[:f], A[:1], fixed, A[f:], A[f:f + 1], empty]).tocsc()
+
+    bl = b[f:].copy()
+    bl[0] += 2.0
+    b = np.hstack([b[:f], b[:1], 6.0, bl, bl[0] + 1, 1.0])
+    c = np.hstack([c, 0.5, 0.0])
+
+    return dict(A=A, b=b, c=c), dict(cone, f=f + 2, l=cone['l'] + 2)
+
+
+def assert_optimal(data, cone, sol, tol=1e-3):
+    A, b, c = data['A'], data['b'], data['c']
+    x, y, s = sol['x'], sol['y'], sol['s']
+    f = cone['f']
+
+    assert np.allclose(A.dot(x) + s, b, atol=tol)
+    assert np.allclose(A.T.dot(y) + c, 0, atol=tol)
+    assert np.allclose(s[:f], 0)
+    assert np.all(s[f:] >= -tol) and np.all(y[f:] >= -tol)
+    assert np.isclose(c.dot(x), -b.dot(y), atol=tol)
+
+
+def assert_infeasible(data, sol, tol=1e-3):
+    A, b = data['A'], data['b']
+
+    assert sol['info']['status'] == 'Infeasible'
+    assert np.isclose(b.dot(sol['y']), -1)
+    assert np.allclose(A.T.dot(sol['y']), 0, atol=tol)
+    assert np.all(np.isnan(sol['x'])) and np.all(np.isnan(sol['s']))
+
+
+def test_presolve():
+    data, cone = ex.l1(m=30)
+    sol = scs.solve(data, cone, eps=1e-6, max_iters=5000)
+
+    data, cone = redundant(data, cone)
+    m, n = data['A'].shape
+    presolved = scs.solve(data, cone, eps=1e-6, max_iters=5000, presolve=True)
+
+    assert presolved['x'].shape == (n,) and presolved['y'].shape == (m,)
+    assert np.isclose(presolved['info']['pobj'], sol['info']['pobj'] + 1)
+    assert np.isclose(presolved['x'][-2], 2) and presolved['x'][-1] == 0
+    assert_optimal(data, cone, presolved)
+
+def test_workspace():
+    data, cone = redundant(*ex.l1(m=30))
+    work = scs.Workspace(data, cone, eps=1e-4, presolve=True)
+
+    sol = work.solve()
+    assert_optimal(data, cone, sol)
+
+    sol2 = work.solve(warm_start=sol)
+    assert sol2['info']['iter'] < sol['info']['iter']
+    assert_optimal(data, cone, sol2)
+
+    # the reductions are reused for new b, c
+    b = data['b'] + 0.1
+    sol = work.solve(new_bc=dict(b=b), out=sol)
+    assert_optimal(dict(data, b=b), cone, sol)
+
+    sol2 = scs.solve(dict(data, b=b), cone, eps=1e-4)
+    assert np.isclose(sol['info']['pobj'], sol2['info']['pobj'], rtol=1e-3)
+
+def test_nothing_removed():
+    data, cone = ex.simple_lp()
+    sol = scs.solve(data, cone, presolve=True)
+    sol2 = scs.solve(data, cone)
+
+    assert sol['info']['iter'] == sol2['info']['iter']
+    assert np.allclose(sol['x'], sol2['x'])
+
+def test_certificates():
+    data, cone = redundant(*ex.l1(m=30))
+    f = cone['f']
+
+    # inconsistent duplicate f rows
+    b = data['b'].copy()
+    b[f - 2] += 1
+    sol = scs.solve(dict(data, b=b), cone, presolve=True)
+    assert sol['info']['iter'] == 0
+    assert_infeasible(dict(data, b=b), sol)
+
+    # violated empty l row
+    b = data['b'].copy()
+    b[-1] = -1
+    sol = scs.solve(dict(data, b=b), cone, presolve=True)
+    assert sol['info']['iter'] == 0
+    assert_infeasible(dict(data, b=b), sol)
+
+    # unused variable with a nonzero cost
+    c = data['c'].copy()
+    c[-1] = 2
+    sol = scs.solve(dict(data, c=c), cone, presolve=True)
+    assert sol['info']['status'] == 'Unbounded'
+    assert np.isclose(c.dot(sol['x']), -1)
+    assert np.allclose(data['A'].dot(sol['x']) + sol['s'], 0)
+    assert np.all(np.isnan(sol['y']))
+
+def test_infeasible_reduced():
+    # x <= -1 and x >= 0, with a fixed variable and an unused one
+    A = sp.csc_matrix(np.array([[0., 2., 0.], [1., 1., 0.], [-1., 0., 0.]]))
+    b = np.array([2., 0., 0.])
+    c = np.array([1., 1., 0.])
+    data, cone = dict(A=A, b=b, c=c), dict(f=1, l=2)
+
+    sol = scs.solve(data, cone, presolve=True)
+    assert sol['info']['iter'] > 0
+    assert_infeasible(data, sol)
+
+def test_unsupported():
+    data, cone = redundant(*ex.l1(m=30))
+    work = scs.Workspace(data, cone, presolve=True)
+
+    with pytest.raises(ValueError):
+        work.solve_batch(B=data['b'][None])
+    with pytest.raises(ValueError):
+        work.update_A(data['A'].data)
+    with pytest.raises(ValueError):
+        scs.solve_many([(data, cone)], presolve=True)
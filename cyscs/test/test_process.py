@@ -0,0 +1,63 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+
+
+@pytest.fixture(scope='module')
+def solver():
+    with scs.ProcessSolver(workers=2, cache_size=2) as solver:
+        yield solver
+
+def test_solve(solver):
+    data, cone, true_x = ex.simple_socp()
+
+    sol = solver.solve(data, cone, eps=1e-6, verbose=False)
+
+    assert sol['info']['status'] == 'Solved'
+    assert np.allclose(sol['x'], true_x)
+
+    # the solution is copied out of shared memory
+    assert sol['x'].base is None
+
+def test_solve_many(solver):
+    problems = [ex.l1(30, seed=i) for i in range(3)]*3
+
+    sols = solver.solve_many(problems, verbose=False)
+
+    assert len(sols) == len(problems)
+    for (data, cone), sol in zip(problems, sols):
+        expected = scs.solve(data, cone, verbose=False)
+        assert np.allclose(sol['x'], expected['x'])
+
+def test_new_bc(solver):
+    # cached workspaces must use the new b and c
+    data, cone = ex.simple_lp()
+    data2 = dict(data, c=-data['c'])
+
+    sols = solver.solve_many([(data, cone), (data2, cone)]*2, verbose=False)
+
+    for sol, (d, c) in zip(sols, [(data, cone), (data2, cone)]*2):
+        assert np.allclose(sol['x'], scs.solve(d, c, verbose=False)['x'])
+
+def test_warm_start(solver):
+    data, cone = ex.many_iter_ecp()
+    sol = scs.solve(data, cone, verbose=False)
+
+    sol2 = solver.solve(data, cone, warm_start=sol, verbose=False)
+
+    assert sol2['info']['iter'] == 0
+
+def test_errors(solver):
+    data, cone = ex.simple_lp()
+    bad = dict(data, b=np.append(data['b'], 1.0))
+
+    with pytest.raises(ValueError):
+        solver.solve(bad, cone)
+
+    with pytest.raises(ValueError):
+        solver.solve(data, cone, callback=print)
+
+    with pytest.raises(ValueError):
+        solver.solve_many([(data, cone)], warm_starts=[])
@@ -0,0 +1,95 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import asyncio
+import threading
+
+
+def test_solve():
+    data, cone = ex.many_iter_ecp()
+
+    with scs.profile() as prof:
+        sol = scs.solve(data, cone, verbose=False)
+
+    for phase in ('settings', 'as_cone', 'check_data', 'make_sol',
+                  'stuff_c_data', 'stuff_c_cone', 'stuff_c_sol', 'scs', 'make_info',
+                  'c_setup', 'c_solve'):
+        assert prof.counts[phase] == 1
+        assert prof.timings[phase] >= 0
+
+    info = sol['info']
+    assert np.isclose(prof.timings['c_solve'], info['solveTime']/1e3)
+    assert prof.solver == prof.timings['scs']
+    assert prof.timings['scs'] >= prof.timings['c_solve']
+    assert prof.wrapper > 0
+
+def test_workspace():
+    data, cone = ex.simple_socp()[:2]
+
+    with scs.profile() as prof:
+        work = scs.Workspace(data, cone, verbose=False)
+        for _ in range(3):
+            work.solve()
+
+    assert prof.counts['scs_init'] == 1
+    assert prof.counts['scs_solve'] == 3
+    assert prof.counts['check_bc'] == 3
+    assert prof.counts['c_setup'] == 1
+    assert prof.counts['c_solve'] == 3
+    # the C cone struct is built once and reused
+    assert prof.counts['stuff_c_cone'] == 1
+    assert 'scs' not in prof.timings
+
+    assert np.isclose(prof.solver, prof.timings['scs_init'] + prof.timings['scs_solve'])
+    assert 'wrapper' in prof.report()
+
+def test_solve_many():
+    data, cone = ex.simple_lp()
+
+    with scs.profile() as prof:
+        scs.solve_many([(data, cone)]*8, workers=2, chunksize=2, verbose=False)
+
+    # phases run on the worker threads are recorded
+    assert prof.counts['stuff_c_data'] == 8
+    assert prof.counts['make_info'] == 8
+    assert prof.counts['scs'] == 4
+
+def test_inactive():
+    data, cone = ex.simple_lp()
+
+    with scs.profile() as prof:
+        pass
+    scs.solve(data, cone, verbose=False)
+
+    assert prof.timings == {}
+    assert prof.wrapper == prof.solver == 0
+
+def test_nested():
+    data, cone = ex.simple_lp()
+
+    with scs.profile() as outer:
+        with scs.profile() as inner:
+            scs.solve(data, cone, verbose=False)
+        scs.solve(data, cone, verbose=False)
+
+    assert inner.counts['scs'] == 1
+    assert outer.counts['scs'] == 1
+
+def test_other_threads():
+    data, cone = ex.simple_lp()
+
+    with scs.profile() as prof:
+        thread = threading.Thread(target=scs.solve, args=(data, cone),
+                                  kwargs=dict(verbose=False))
+        thread.start()
+        thread.join()
+
+    assert prof.timings == {}
+
+    # but solves run by this thread on an executor are recorded
+    with scs.profile() as prof:
+        asyncio.run(scs.solve_async(data, cone, verbose=False))
+
+    assert prof.counts['scs'] == 1
@@ -0,0 +1,142 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import pickle
+import warnings
+
+
+def assert_same_solve(work, work2):
+    sol = work.solve()
+    sol2 = work2.solve()
+
+    assert sol2['info']['iter'] == sol['info']['iter']
+    assert np.allclose(sol2['x'], sol['x'])
+    assert np.allclose(sol2['y'], sol['y'])
+
+def test_save_load(tmpdir):
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone, verbose=False, eps=1e-5)
+
+    path = str(tmpdir.join('work.npz'))
+    work.save(path)
+    work2 = scs.Workspace.load(path)
+
+    assert work2.settings == work.settings
+    assert work2.fixed == work.fixed
+    assert np.array_equal(work2.data['b'], work.data['b'])
+    assert 'A' not in work2.data
+
+    assert_same_solve(work, work2)
+
+def test_pickle():
+    problems = [ex.simple_lp(), ex.simple_socp()[:2], ex.simple_sdp()[:2],
+                ex.simple_pcp()[:2]]
+
+    for data, cone in problems:
+        for normalize in True, False:
+            work = scs.Workspace(data, cone, verbose=False, normalize=normalize)
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                work2 = pickle.loads(pickle.dumps(work))
+
+            assert_same_solve(work, work2)
+
+def test_new_bc():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone, verbose=False)
+    work.data['b'] = work.data['b'] + 1.0
+
+    work2 = pickle.loads(pickle.dumps(work))
+
+    assert np.array_equal(work2.data['b'], work.data['b'])
+    assert_same_solve(work, work2)
+
+def test_a_unchanged():
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone, verbose=False)
+
+    state = work.__getstate__()
+
+    # the saved A has its original values, not the normalized ones
+    assert np.allclose(state['A_x'], data['A'].data)
+    assert np.array_equal(state['A_i'], data['A'].indices)
+    assert not np.allclose(state['Anorm_x'], data['A'].data)
+
+def test_corrupted_state():
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone, verbose=False)
+    state = work.__getstate__()
+
+    def corrupt(key, index, value):
+        bad = dict(state)
+        bad[key] = state[key].copy()
+        bad[key][index] = value
+        return bad
+
+    k = len(state['P'])
+    lnz = state['L_p'][-1]
+    nnz = len(state['A_i'])
+    corrupted = [corrupt('A_i', 0, 10**9),
+                 corrupt('A_i', nnz - 1, -1),
+                 corrupt('A_p', 1, state['A_p'][-1] + 1),
+                 corrupt('A_p', -1, nnz - 1),
+                 corrupt('P', 0, state['P'][1]),
+                 corrupt('P', 0, k),
+                 corrupt('L_p', 0, 1),
+                 corrupt('L_p', 2, state['L_p'][-1] + 1),
+                 corrupt('L_i', lnz - 1, k),
+                 corrupt('L_i', 0, -1),
+                 corrupt('Anorm_x', 0, np.nan),
+                 corrupt('D', 0, np.inf),
+                 corrupt('E', 0, np.nan)]
+
+    for bad in corrupted:
+        work2 = scs.Workspace.__new__(scs.Workspace)
+        with pytest.raises(ValueError):
+            work2.__setstate__(bad)
+
+    # the state itself loads
+    work2 = scs.Workspace.__new__(scs.Workspace)
+    work2.__setstate__(state)
+    assert_same_solve(work, work2)
+
+def test_callback_dropped():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone, verbose=False, callback=print)
+
+    work2 = pickle.loads(pickle.dumps(work))
+    assert work2.settings['callback'] is None
+
+def test_indirect():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone, use_indirect=True)
+
+    with pytest.raises(ValueError):
+        pickle.dumps(work)
+
+def test_bad_state():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone, verbose=False)
+
+    state = work.__getstate__()
+    state['L_i'] = state['L_i'][:-1]
+
+    with pytest.raises(ValueError):
+        scs.Workspace.__new__(scs.Workspace).__setstate__(state)
+
+def test_float32():
+    if (False, np.dtype(np.int64), np.dtype(np.float32)) not in scs._scs._extensions:
+        pytest.skip("float32 extension modules not built")
+
+    data, cone = ex.simple_socp()[:2]
+    data = dict(A=data['A'].astype(np.float32), b=data['b'].astype(np.float32),
+                c=data['c'].astype(np.float32))
+    work = scs.Workspace(data, cone, dtype=np.float32, verbose=False)
+
+    work2 = pickle.loads(pickle.dumps(work))
+
+    assert work2.settings['dtype'] == np.float32
+    assert_same_solve(work, work2)
@@ -0,0 +1,98 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+
+
+def random_sym(rng, *shape):
+    M = rng.randn(*shape)
+    return M + np.swapaxes(M, -1, -2)
+
+def test_roundtrip():
+    rng = np.random.RandomState(0)
+
+    for n in 1, 2, 5:
+        M = random_sym(rng, n, n)
+        v = scs.svec(M)
+        assert v.shape == (n*(n+1)//2,)
+        assert np.allclose(scs.smat(v, n), M)
+
+        # inner products are preserved
+        N = random_sym(rng, n, n)
+        assert np.isclose(v.dot(scs.svec(N)), np.trace(M.dot(N)))
+
+def test_layout():
+    M = np.array([[1., 2., 4.],
+                  [2., 3., 5.],
+                  [4., 5., 6.]])
+    sq = np.sqrt(2)
+
+    assert np.allclose(scs.svec(M), [1, 2*sq, 4*sq, 3, 5*sq, 6])
+
+    rows, cols = ex.svec_indices(3)
+    assert np.array_equal(M[rows, cols], [1, 2, 4, 3, 5, 6])
+
+def test_batched():
+    rng = np.random.RandomState(0)
+    M = random_sym(rng, 2, 7, 4, 4)
+
+    v = scs.svec(M)
+    assert v.shape == (2, 7, 10)
+    assert np.allclose(v[1, 3], scs.svec(M[1, 3]))
+    assert np.allclose(scs.smat(v, 4), M)
+
+def test_blocks():
+    rng = np.random.RandomState(0)
+    sizes = [3, 1, 4, 3, 2]
+    mats = [random_sym(rng, n, n) for n in sizes]
+
+    v = scs.svec(mats)
+    assert np.allclose(v, np.concatenate([scs.svec(M) for M in mats]))
+
+    out = scs.smat(v, sizes)
+    assert len(out) == len(sizes)
+    for M, M2 in zip(mats, out):
+        assert np.allclose(M, M2)
+
+    # leading dimensions
+    mats = [random_sym(rng, 6, n, n) for n in sizes]
+    v = scs.svec(mats)
+    assert v.shape == (6, sum(n*(n+1)//2 for n in sizes))
+    assert np.allclose(scs.smat(v, sizes)[2], mats[2])
+
+def test_bad_input():
+    with pytest.raises(ValueError):
+        scs.svec(np.zeros((2, 3)))
+
+    with pytest.raises(ValueError):
+        scs.smat(np.zeros(5), 3)
+
+    with pytest.raises(ValueError):
+        scs.smat(np.zeros(5), [2, 2])
+
+def test_solution():
+    data, cone, true_x = ex.simple_sdp()
+    sol = scs.solve(data, cone, eps=1e-6)
+
+    S, = sol.smat('s')
+    Y, = sol.smat('y')
+
+    # slack and dual matrices are PSD and complementary
+    assert np.all(np.linalg.eigvalsh(S) > -1e-5)
+    assert np.all(np.linalg.eigvalsh(Y) > -1e-5)
+    assert np.allclose(S.dot(Y), 0, atol=1e-4)
+
+    assert np.allclose(scs.svec(S), sol.block('s', 0)['s'])
+
+def test_random_sdp():
+    data, cone, x = ex.random_sdp(num_blocks=6, max_size=5, density=0.1, seed=1)
+    work = scs.Workspace(data, cone, max_iters=50)
+    sol = work.solve()
+
+    Ys = sol.smat('y')
+    assert [Y.shape[0] for Y in Ys] == list(cone['s'])
+    assert np.allclose(scs.svec(Ys), sol['y'][sol.cone.offsets['s']:sol.cone.offsets['ep']])
+
+    batch = work.solve_batch(np.tile(data['b'], (2, 1)))
+    assert batch.smat('y')[0].shape[0] == 2
@@ -0,0 +1,54 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+
+
+def test_solve_many():
+    problems = [ex.l1(50, seed=i) for i in range(6)]
+
+    sols = scs.solve_many(problems, workers=2, verbose=False)
+
+    assert len(sols) == len(problems)
+
+    for (data, cone), sol in zip(problems, sols):
+        expected = scs.solve(data, cone, verbose=False)
+        assert sol['info']['status'] == 'Solved'
+        assert np.allclose(sol['x'], expected['x'])
+
+def test_mixed_cones():
+    problems = [ex.simple_socp()[:2], ex.simple_ecp()[:2],
+                ex.simple_sdp()[:2], ex.simple_pcp()[:2]]
+    true_xs = [ex.simple_socp()[2], ex.simple_ecp()[2],
+               ex.simple_sdp()[2], ex.simple_pcp()[2]]
+
+    sols = scs.solve_many(problems, workers=3, chunksize=1, eps=1e-6)
+
+    for sol, true_x in zip(sols, true_xs):
+        assert np.allclose(sol['x'], true_x)
+
+def test_empty():
+    assert scs.solve_many([], workers=2) == []
+
+def test_warm_starts():
+    data, cone = ex.many_iter_ecp()
+    sol = scs.solve(data, cone)
+
+    sols = scs.solve_many([(data, cone)]*2, warm_starts=[sol, None])
+
+    assert sols[0]['info']['iter'] == 0
+    assert sols[1]['info']['iter'] >= 500
+
+def test_warm_starts_len():
+    data, cone = ex.simple_lp()
+
+    with pytest.raises(ValueError):
+        scs.solve_many([(data, cone)]*2, warm_starts=[None])
+
+def test_bad_data():
+    data, cone = ex.simple_lp()
+    bad = dict(data, b=np.append(data['b'], 1.0))
+
+    with pytest.raises(ValueError):
+        scs.solve_many([(data, cone), (bad, cone)])
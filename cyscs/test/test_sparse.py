@@ -0,0 +1,71 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import scipy.sparse as sp
+import warnings
+
+from cyscs._sparse import to_csc
+
+
+def assert_same_matrix(A, B):
+    assert np.array_equal(A.indptr, B.indptr)
+    assert np.array_equal(A.indices, B.indices)
+    assert np.array_equal(A.data, B.data)
+
+def test_coo_csr():
+    data, cone = ex.l1(m=30)
+    sol = scs.solve(data, cone)
+
+    for A in data['A'].tocoo(), data['A'].tocsr():
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            sol2 = scs.solve(dict(data, A=A), cone)
+
+        assert sol2['info']['iter'] == sol['info']['iter']
+        assert np.allclose(sol2['x'], sol['x'])
+
+def test_dtypes():
+    A = ex.sparse_matrix(50, 40, density=0.2, rng=np.random.RandomState(0))
+
+    for fmt in 'coo', 'csr':
+        for index_dtype in np.int32, np.int64:
+            for value_dtype in np.float32, np.float64, np.int16:
+                B = A.astype(value_dtype).asformat(fmt)
+                if fmt == 'coo':
+                    B.row, B.col = B.row.astype(index_dtype), B.col.astype(index_dtype)
+                else:
+                    B.indices = B.indices.astype(index_dtype)
+                    B.indptr = B.indptr.astype(index_dtype)
+
+                C = to_csc(B)
+                assert C.indices.dtype == np.int64 and C.indptr.dtype == np.int64
+                assert C.data.dtype == np.float64
+                assert_same_matrix(C, B.tocsc().astype(np.float64))
+
+def test_duplicates():
+    rng = np.random.RandomState(0)
+    row = rng.randint(0, 20, size=200)
+    col = rng.randint(0, 10, size=200)
+    A = sp.coo_matrix((rng.randn(200), (row, col)), shape=(20, 10))
+
+    B = to_csc(A)
+    assert B.has_canonical_format
+    assert_same_matrix(B, A.tocsc())
+
+    # sorted entries without duplicates stay in place
+    A = A.tocsr().tocoo()
+    B = to_csc(A)
+    assert B.nnz == A.nnz
+    assert_same_matrix(B, A.tocsc())
+
+def test_other_formats():
+    data, cone = ex.l1(m=30)
+
+    with pytest.warns(UserWarning):
+        sol = scs.solve(dict(data, A=data['A'].tolil()), cone)
+    assert sol['info']['status'] == 'Solved'
+
+    with pytest.raises(TypeError):
+        to_csc(data['A'])
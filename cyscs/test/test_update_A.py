@@ -0,0 +1,107 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import pickle
+
+
+def scaled(data, values):
+    A = data['A'].copy()
+    A.data = values
+    return dict(A=A, b=data['b'], c=data['c'])
+
+def assert_same_solve(work, work2):
+    sol = work.solve()
+    sol2 = work2.solve()
+
+    assert sol2['info']['iter'] == sol['info']['iter']
+    assert np.allclose(sol2['x'], sol['x'])
+    assert np.allclose(sol2['y'], sol['y'])
+
+def test_update_A():
+    problems = [ex.simple_lp(), ex.simple_socp()[:2], ex.simple_sdp()[:2],
+                ex.many_iter_ecp()]
+
+    for data, cone in problems:
+        for normalize in True, False:
+            work = scs.Workspace(data, cone, verbose=False, normalize=normalize)
+            work.solve()
+
+            values = data['A'].data*np.linspace(0.5, 2.0, data['A'].nnz)
+            work.update_A(values)
+
+            work2 = scs.Workspace(scaled(data, values), cone, verbose=False,
+                                  normalize=normalize)
+            assert_same_solve(work, work2)
+
+def test_input_unchanged():
+    data, cone = ex.many_iter_ecp()
+    A = data['A'].copy()
+    work = scs.Workspace(data, cone, verbose=False)
+
+    values = 2*data['A'].data
+    original = values.copy()
+    work.update_A(values)
+    work.solve()
+
+    assert np.array_equal(values, original)
+    assert np.array_equal(data['A'].data, A.data)
+
+def test_repeated():
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone, verbose=False)
+
+    for scale in 2.0, 0.5, 1.0:
+        work.update_A(scale*data['A'].data)
+
+    work2 = scs.Workspace(data, cone, verbose=False)
+    assert_same_solve(work, work2)
+
+def test_float32():
+    data, cone = ex.many_iter_ecp()
+    data = dict(A=data['A'].astype(np.float32), b=data['b'].astype(np.float32),
+                c=data['c'].astype(np.float32))
+    work = scs.Workspace(data, cone, verbose=False, dtype=np.float32)
+
+    values = 2*data['A'].data
+    work.update_A(values)
+
+    work2 = scs.Workspace(scaled(data, values), cone, verbose=False, dtype=np.float32)
+    assert_same_solve(work, work2)
+
+def test_pickle_after_update():
+    data, cone = ex.simple_socp()[:2]
+    work = scs.Workspace(data, cone, verbose=False)
+
+    work.update_A(3*data['A'].data)
+    work2 = pickle.loads(pickle.dumps(work))
+
+    assert_same_solve(work, work2)
+
+def test_bad_values():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone, verbose=False)
+
+    with pytest.raises(ValueError):
+        work.update_A(np.ones(data['A'].nnz + 1))
+
+def test_failed_update():
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone, verbose=False)
+    work2 = scs.Workspace(data, cone, verbose=False)
+
+    for bad in np.nan, np.inf:
+        values = 2*data['A'].data
+        values[0] = bad
+        with pytest.raises(ValueError):
+            work.update_A(values)
+
+    assert_same_solve(work, work2)
+
+def test_indirect():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone, verbose=False, use_indirect=True)
+
+    with pytest.raises(ValueError):
+        work.update_A(data['A'].data)
@@ -0,0 +1,129 @@
+import cyscs as scs
+import pytest
+import cyscs.examples as ex
+
+import numpy as np
+import scipy.sparse as sp
+
+import problems
+
+
+def test_solve():
+    data, cone = ex.many_iter_ecp()
+    cache = scs.WarmStartCache()
+
+    sol = scs.solve(data, cone, warm_start_cache=cache, verbose=False)
+    assert sol['info']['iter'] > 0
+    assert len(cache) == 1
+
+    # same structure, so warm started from the cached solution
+    sol2 = scs.solve(data, cone, warm_start_cache=cache, verbose=False)
+    assert sol2['info']['iter'] == 0
+
+def test_drifting_data():
+    data, cone = ex.many_iter_ecp()
+    cache = scs.WarmStartCache()
+
+    cold = scs.solve(data, cone, verbose=False)
+    scs.solve(data, cone, warm_start_cache=cache, verbose=False)
+
+    # the data changes, but not the structure
+    data2 = dict(data, b=data['b']*1.01)
+
+    sol = scs.solve(data2, cone, warm_start_cache=cache, verbose=False)
+    assert sol['info']['status'] == 'Solved'
+    assert sol['info']['iter'] < cold['info']['iter']
+    assert len(cache) == 1
+
+def test_explicit_warm_start():
+    data, cone = ex.many_iter_ecp()
+    cache = scs.WarmStartCache()
+
+    scs.solve(data, cone, warm_start_cache=cache, verbose=False)
+
+    zeros = dict(x=np.zeros(len(data['c'])), y=np.zeros(len(data['b'])),
+                 s=np.zeros(len(data['b'])))
+    sol = scs.solve(data, cone, warm_start=zeros, warm_start_cache=cache, verbose=False)
+    assert sol['info']['iter'] > 0
+
+def test_cached_copies():
+    data, cone = ex.simple_lp()
+    cache = scs.WarmStartCache()
+
+    sol = scs.solve(data, cone, warm_start_cache=cache)
+    sol['x'][:] = np.nan
+
+    (entry,) = cache._entries.values()
+    assert not np.isnan(entry['x']).any()
+
+def test_budget():
+    problems = [ex.l1(20, seed=0), ex.simple_lp(), ex.simple_socp()[:2]]
+    sizes = []
+    for data, cone in problems:
+        m, n = data['A'].shape
+        sizes.append(8*(2*m + n))
+
+    cache = scs.WarmStartCache(max_bytes=sizes[1] + sizes[2])
+
+    for data, cone in problems:
+        scs.solve(data, cone, warm_start_cache=cache, verbose=False)
+
+    # the first, least recently used entry was evicted
+    assert len(cache) == 2
+    assert cache.nbytes == sizes[1] + sizes[2]
+
+    # too large for the budget
+    small = scs.WarmStartCache(max_bytes=8)
+    scs.solve(*problems[0], warm_start_cache=small, verbose=False)
+    assert len(small) == 0
+
+    cache.clear()
+    assert len(cache) == cache.nbytes == 0
+
+def test_infeasible_not_stored():
+    # x >= 1 and x <= -1
+    data = dict(A=sp.csc_matrix([[-1.0], [1.0]]), b=np.array([-1.0, -1.0]),
+                c=np.array([1.0]))
+    cone = dict(l=2)
+    cache = scs.WarmStartCache()
+
+    sol = scs.solve(data, cone, warm_start_cache=cache, verbose=False)
+    assert sol['info']['status'] == 'Infeasible'
+    assert len(cache) == 0
+
+    # minimize -x with x >= 1
+    data = dict(A=sp.csc_matrix([[-1.0]]), b=np.array([-1.0]), c=np.array([-1.0]))
+    sol = scs.solve(data, dict(l=1), warm_start_cache=cache, verbose=False)
+    assert sol['info']['status'] == 'Unbounded'
+    assert len(cache) == 0
+
+def test_stopped_not_stored():
+    data, cone = problems.infeasible_lp()
+    cache = scs.WarmStartCache()
+
+    # stopped just before the certificate is found, on a guess with NaN x
+    sol = scs.solve(data, cone, time_limit=0.0, callback_stride=400,
+                    warm_start_cache=cache, verbose=False)
+    assert sol['info']['status'] == 'Time limit reached'
+    assert np.isnan(sol['x']).any()
+    assert len(cache) == 0
+
+    # stopped on a finite iterate, which is a useful warm start
+    sol = scs.solve(data, cone, time_limit=0.0, callback_stride=100,
+                    warm_start_cache=cache, verbose=False)
+    assert sol['info']['status'] == 'Time limit reached'
+    assert len(cache) == 1
+
+def test_workspace():
+    data, cone = ex.many_iter_ecp()
+    cache = scs.WarmStartCache()
+
+    scs.solve(data, cone, warm_start_cache=cache, verbose=False)
+
+    # shares the entry with `cyscs.solve()`
+    work = scs.Workspace(data, cone, warm_start_cache=cache, verbose=False)
+    sol = work.solve()
+    assert sol['info']['iter'] == 0
+
+    work.solve(new_bc=dict(b=data['b']*1.01))
+    assert len(cache) == 1
@@ -14,7 +14,9 @@ def test_cache():
 
 def test_settings():
     expected_keys = set(['normalize', 'use_indirect', 'scale', 'verbose',
-                        'eps', 'cg_rate', 'max_iters', 'alpha', 'rho_x'])
+                        'eps', 'cg_rate', 'max_iters', 'alpha', 'rho_x',
+                        'dtype', 'callback', 'callback_stride', 'time_limit',
+                        'presolve'])
 
     data, cone, _ = ex.simple_socp()
     work = scs.Workspace(data, cone)
@@ -32,7 +34,8 @@ def test_fixed_settings():
     data, cone, _ = ex.simple_socp()
     work = scs.Workspace(data, cone)
 
-    expected_fixed = set(['normalize', 'use_indirect', 'scale', 'rho_x'])
+    expected_fixed = set(['normalize', 'use_indirect', 'scale', 'rho_x', 'dtype',
+                          'presolve'])
 
     assert set(work.fixed.keys()) == expected_fixed
 
@@ -118,3 +121,55 @@ def test_many_iter_ecp():
 
 
 
+
+def test_solve_batch():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone, eps=1e-6)
+
+    B = np.vstack([data['b'], 2*data['b'], 3*data['b']])
+    C = np.vstack([data['c'], data['c'], -data['c']])
+
+    sols = work.solve_batch(B, C)
+
+    assert sols['x'].shape == (3, 4)
+    assert sols['info'].shape == (3,)
+
+    for i in range(3):
+        sol = work.solve(new_bc=dict(b=B[i], c=C[i]))
+        assert np.allclose(sols['x'][i], sol['x'])
+        assert sols['info'][i]['status'].decode() == sol['info']['status']
+        assert sols['info'][i]['iter'] == sol['info']['iter']
+
+def test_solve_batch_broadcast():
+    data, cone, true_x = ex.simple_socp()
+    work = scs.Workspace(data, cone, eps=1e-6)
+
+    C = np.vstack([data['c']]*4)
+    sols = work.solve_batch(C=C)
+
+    assert np.allclose(sols['x'], true_x)
+
+def test_solve_batch_chain():
+    data, cone = ex.many_iter_ecp()
+    work = scs.Workspace(data, cone)
+
+    B = np.vstack([data['b']]*3)
+    sols = work.solve_batch(B, chain=True)
+
+    # each problem is the same, so warm starting from the previous solution
+    # should take 0 iterations
+    assert sols['info'][0]['iter'] >= 500
+    assert all(sols['info'][1:]['iter'] == 0)
+
+def test_solve_batch_bad_shape():
+    data, cone = ex.simple_lp()
+    work = scs.Workspace(data, cone)
+
+    with pytest.raises(ValueError):
+        work.solve_batch(np.zeros((2, 5)))
+
+    with pytest.raises(ValueError):
+        work.solve_batch(np.zeros((2, 4)), np.zeros((3, 4)))
+
+    with pytest.raises(ValueError):
+        work.solve_batch(np.zeros((2, 4), dtype=np.float32))
@@ -0,0 +1,327 @@
+#ifndef CYSCS_WORKIO_H_GUARD
+#define CYSCS_WORKIO_H_GUARD
+
+/* Save and restore the setup state of an SCS workspace built with the
+ * direct linear system solver: the normalized A, the scaling vectors and
+ * the LDL factorization of the KKT matrix.
+ *
+ * cyscs_load_work() rebuilds a workspace from that state without
+ * normalizing A or factoring the KKT matrix. It allocates everything
+ * with scs_malloc, exactly as scs_init() does, so the workspace is freed
+ * by scs_finish() as usual.
+ */
+
+#include <string.h>
+#include "glbopts.h"
+#include "scs.h"
+#include "cones.h"
+#include "linSys.h"
+#include "private.h"
+
+/* defined in linsys/direct/private.c, but not declared in its header */
+cs *formKKT(const AMatrix *A, const Settings *s);
+
+/* number of nonzeros in the factor L */
+static scs_int cyscs_factor_nnz(const Work *w) {
+    return w->p->L->p[w->p->L->n];
+}
+
+/* Copy the setup state of `w` into caller-allocated arrays:
+ * - A_p (n+1), A_i (nnz A), A_x (nnz A): A, with its original values
+ * - Anorm_x (nnz A): the values of A as normalized by SCS
+ * - D (m), E (n), means (2): the scaling, only written if normalize is set
+ * - L_p (m+n+1), L_i, L_x (cyscs_factor_nnz), L_D (m+n), P (m+n):
+ *   the factorization
+ */
+static void cyscs_save_work(const Work *w, scs_int *A_p, scs_int *A_i,
+                            scs_float *A_x, scs_float *Anorm_x, scs_float *D,
+                            scs_float *E, scs_float *means, scs_int *L_p,
+                            scs_int *L_i, scs_float *L_x, scs_float *L_D,
+                            scs_int *P) {
+    const AMatrix *A = w->A;
+    const cs *L = w->p->L;
+    scs_int m = w->m, n = w->n, nnz = A->p[n], lnz = L->p[L->n];
+    AMatrix A_orig = *A;
+
+    memcpy(A_p, A->p, (n + 1) * sizeof(scs_int));
+    memcpy(A_i, A->i, nnz * sizeof(scs_int));
+    memcpy(A_x, A->x, nnz * sizeof(scs_float));
+    memcpy(Anorm_x, A->x, nnz * sizeof(scs_float));
+
+    if (w->stgs->normalize) {
+        memcpy(D, w->scal->D, m * sizeof(scs_float));
+        memcpy(E, w->scal->E, n * sizeof(scs_float));
+        means[0] = w->scal->meanNormRowA;
+        means[1] = w->scal->meanNormColA;
+
+        /* undo the normalization on the copy of the values */
+        A_orig.x = A_x;
+        unNormalizeA(&A_orig, w->stgs, w->scal);
+    }
+
+    memcpy(L_p, L->p, (L->n + 1) * sizeof(scs_int));
+    memcpy(L_i, L->i, lnz * sizeof(scs_int));
+    memcpy(L_x, L->x, lnz * sizeof(scs_float));
+    memcpy(L_D, w->p->D, (m + n) * sizeof(scs_float));
+    memcpy(P, w->p->P, (m + n) * sizeof(scs_int));
+}
+
+/* free a partially allocated workspace from cyscs_load_work() */
+static void cyscs_free_work(Work *w, const Data *d) {
+    if (w->u)
+        scs_free(w->u);
+    if (w->v)
+        scs_free(w->v);
+    if (w->u_t)
+        scs_free(w->u_t);
+    if (w->u_prev)
+        scs_free(w->u_prev);
+    if (w->h)
+        scs_free(w->h);
+    if (w->g)
+        scs_free(w->g);
+    if (w->b)
+        scs_free(w->b);
+    if (w->c)
+        scs_free(w->c);
+    if (w->pr)
+        scs_free(w->pr);
+    if (w->dr)
+        scs_free(w->dr);
+    if (w->scal) {
+        if (w->scal->D)
+            scs_free(w->scal->D);
+        if (w->scal->E)
+            scs_free(w->scal->E);
+        scs_free(w->scal);
+    }
+    if (w->A && w->A != d->A)
+        freeAMatrix(w->A);
+    if (w->coneWork)
+        finishCone(w->coneWork);
+    /* also frees a partially allocated factor L */
+    freePriv(w->p);
+    scs_free(w);
+}
+
+/* Return a workspace for `d` and `k` with the state saved by
+ * cyscs_save_work(), or SCS_NULL if allocation fails.
+ * `lnz` is the number of nonzeros in the factor L.
+ *
+ * The state is copied as is, so the caller must check it first: P must be
+ * a permutation of 0..m+n-1, L_p nondecreasing from 0 to lnz, the entries
+ * of L_i in 0..m+n-1, and the values finite (check_state() in factor.pxi).
+ */
+static Work *cyscs_load_work(const Data *d, const Cone *k,
+                             const scs_float *Anorm_x, const scs_float *D,
+                             const scs_float *E, const scs_float *means,
+                             scs_int lnz, const scs_int *L_p,
+                             const scs_int *L_i, const scs_float *L_x,
+                             const scs_float *L_D, const scs_int *P) {
+    scs_int m = d->m, n = d->n, l = m + n + 1, nnz = d->A->p[n];
+    Work *w = scs_calloc(1, sizeof(Work));
+    Priv *p;
+    cs *L;
+
+    if (!w)
+        return SCS_NULL;
+
+    w->stgs = d->stgs;
+    w->m = m;
+    w->n = n;
+    w->u = scs_malloc(l * sizeof(scs_float));
+    w->v = scs_malloc(l * sizeof(scs_float));
+    w->u_t = scs_malloc(l * sizeof(scs_float));
+    w->u_prev = scs_malloc(l * sizeof(scs_float));
+    w->h = scs_malloc((l - 1) * sizeof(scs_float));
+    w->g = scs_malloc((l - 1) * sizeof(scs_float));
+    w->pr = scs_malloc(m * sizeof(scs_float));
+    w->dr = scs_malloc(n * sizeof(scs_float));
+    w->b = scs_malloc(m * sizeof(scs_float));
+    w->c = scs_malloc(n * sizeof(scs_float));
+    w->A = d->A;
+    w->coneWork = initCone(k);
+    w->p = p = scs_calloc(1, sizeof(Priv));
+
+    if (!w->u || !w->v || !w->u_t || !w->u_prev || !w->h || !w->g ||
+        !w->pr || !w->dr || !w->b || !w->c || !w->coneWork || !p) {
+        cyscs_free_work(w, d);
+        return SCS_NULL;
+    }
+
+    p->L = L = scs_calloc(1, sizeof(cs));
+    p->D = scs_malloc((m + n) * sizeof(scs_float));
+    p->P = scs_malloc((m + n) * sizeof(scs_int));
+    p->bp = scs_malloc((m + n) * sizeof(scs_float));
+
+    if (!L || !p->D || !p->P || !p->bp) {
+        cyscs_free_work(w, d);
+        return SCS_NULL;
+    }
+
+    L->m = L->n = m + n;
+    L->nz = -1;
+    L->nzmax = lnz;
+    L->p = scs_malloc((m + n + 1) * sizeof(scs_int));
+    L->i = scs_malloc(lnz * sizeof(scs_int));
+    L->x = scs_malloc(lnz * sizeof(scs_float));
+
+    if (!L->p || !L->i || !L->x) {
+        cyscs_free_work(w, d);
+        return SCS_NULL;
+    }
+
+    if (w->stgs->normalize) {
+#ifdef COPYAMATRIX
+        if (!copyAMatrix(&(w->A), d->A)) {
+            cyscs_free_work(w, d);
+            return SCS_NULL;
+        }
+#endif
+        w->scal = scs_calloc(1, sizeof(Scaling));
+        if (!w->scal || !(w->scal->D = scs_malloc(m * sizeof(scs_float))) ||
+            !(w->scal->E = scs_malloc(n * sizeof(scs_float)))) {
+            cyscs_free_work(w, d);
+            return SCS_NULL;
+        }
+
+        /* without COPYAMATRIX, this normalizes the caller's A in place,
+         * just as scs_init() would, and scs_finish() undoes it */
+        memcpy(w->A->x, Anorm_x, nnz * sizeof(scs_float));
+        memcpy(w->scal->D, D, m * sizeof(scs_float));
+        memcpy(w->scal->E, E, n * sizeof(scs_float));
+        w->scal->meanNormRowA = means[0];
+        w->scal->meanNormColA = means[1];
+    }
+
+    memcpy(L->p, L_p, (m + n + 1) * sizeof(scs_int));
+    memcpy(L->i, L_i, lnz * sizeof(scs_int));
+    memcpy(L->x, L_x, lnz * sizeof(scs_float));
+    memcpy(p->D, L_D, (m + n) * sizeof(scs_float));
+    memcpy(p->P, P, (m + n) * sizeof(scs_int));
+    p->totalSolveTime = 0.0;
+
+    return w;
+}
+
+#define CYSCS_SWAP(a, b, T) \
+    {                        \
+        T tmp_ = (a);        \
+        (a) = (b);           \
+        (b) = tmp_;          \
+    }
+
+/* Change the values of A in `w`, keeping its sparsity pattern. Redo the
+ * normalization and the numeric LDL factorization of the KKT matrix,
+ * reusing the fill-reducing ordering P.
+ *
+ * The new normalized A, scaling and factor are computed into new arrays,
+ * and only swapped into `w` once the factorization has succeeded, so on
+ * failure `w` is unchanged and can still be used.
+ *
+ * With COPYAMATRIX and normalize set, SCS's copy of A gets the new values.
+ * Otherwise SCS uses d->A directly, so `values` is normalized in place and
+ * w->A->x is pointed at it: the caller must keep it alive, and it must not
+ * be the array w->A->x points to now.
+ *
+ * Returns 0 on success, -1 if allocation fails, or -2 if the numeric
+ * factorization fails.
+ */
+static scs_int cyscs_update_A(Work *w, const Cone *k, scs_float *values) {
+    scs_int n = w->m + w->n, nnz = w->A->p[w->n], lnz = w->p->L->p[n];
+    scs_int kk = -1, status = -1;
+    cs *L = w->p->L, *K = SCS_NULL, *C = SCS_NULL;
+    AMatrix A = *(w->A);
+    Scaling scal = {SCS_NULL, SCS_NULL, 0, 0};
+    scs_int *Pinv = SCS_NULL, *Lp, *Parent, *Lnz, *Flag, *Pattern;
+    scs_float *Lx, *LD, *Y;
+
+    A.x = scs_malloc(nnz * sizeof(scs_float));
+    Lp = scs_malloc((n + 1) * sizeof(scs_int));
+    Lx = scs_malloc(lnz * sizeof(scs_float));
+    LD = scs_malloc(n * sizeof(scs_float));
+    Parent = scs_malloc(n * sizeof(scs_int));
+    Lnz = scs_malloc(n * sizeof(scs_int));
+    Flag = scs_malloc(n * sizeof(scs_int));
+    Pattern = scs_malloc(n * sizeof(scs_int));
+    Y = scs_malloc(n * sizeof(scs_float));
+    if (!A.x || !Lp || !Lx || !LD || !Parent || !Lnz || !Flag || !Pattern || !Y)
+        goto cleanup;
+
+    memcpy(A.x, values, nnz * sizeof(scs_float));
+    if (w->stgs->normalize) {
+        /* allocates the new scaling vectors */
+        normalizeA(&A, w->stgs, k, &scal);
+        if (!scal.D || !scal.E)
+            goto cleanup;
+    }
+
+    K = formKKT(&A, w->stgs);
+    Pinv = K ? cs_pinv(w->p->P, n) : SCS_NULL;
+    C = Pinv ? cs_symperm(K, Pinv, 1) : SCS_NULL;
+    if (!C)
+        goto cleanup;
+
+    /* same pattern, so Lp and the size of L are unchanged */
+    LDL_symbolic(n, C->p, C->i, Lp, Parent, Lnz, Flag, SCS_NULL, SCS_NULL);
+    kk = LDL_numeric(n, C->p, C->i, C->x, Lp, Parent, Lnz, L->i, Lx, LD, Y,
+                     Pattern, Flag, SCS_NULL, SCS_NULL);
+    if (kk != n) {
+        status = -2;
+        goto cleanup;
+    }
+
+    /* swap the new state in, leaving the old one to be freed */
+    if (w->stgs->normalize) {
+        CYSCS_SWAP(w->scal->D, scal.D, scs_float *);
+        CYSCS_SWAP(w->scal->E, scal.E, scs_float *);
+        w->scal->meanNormRowA = scal.meanNormRowA;
+        w->scal->meanNormColA = scal.meanNormColA;
+    }
+#ifdef COPYAMATRIX
+    if (w->stgs->normalize) {
+        CYSCS_SWAP(w->A->x, A.x, scs_float *);
+    } else
+#endif
+    {
+        memcpy(values, A.x, nnz * sizeof(scs_float));
+        w->A->x = values;
+    }
+    CYSCS_SWAP(L->x, Lx, scs_float *);
+    CYSCS_SWAP(w->p->D, LD, scs_float *);
+    status = 0;
+
+cleanup:
+    if (K)
+        cs_spfree(K);
+    if (C)
+        cs_spfree(C);
+    if (Pinv)
+        scs_free(Pinv);
+    if (scal.D)
+        scs_free(scal.D);
+    if (scal.E)
+        scs_free(scal.E);
+    if (A.x)
+        scs_free(A.x);
+    if (Lp)
+        scs_free(Lp);
+    if (Lx)
+        scs_free(Lx);
+    if (LD)
+        scs_free(LD);
+    if (Parent)
+        scs_free(Parent);
+    if (Lnz)
+        scs_free(Lnz);
+    if (Flag)
+        scs_free(Flag);
+    if (Pattern)
+        scs_free(Pattern);
+    if (Y)
+        scs_free(Y);
+
+    return status;
+}
+
+#endif
@@ -24,6 +24,26 @@ if '--cython' in sys.argv:
 
 file_ext = '.pyx' if USE_CYTHON else '.c'
 
+# optionally build extra extension modules using 32-bit integers,
+# so that scipy's default int32 CSC indices can be passed to C without conversion
+USE_INT32 = False
+if '--int32' in sys.argv:
+    sys.argv.remove('--int32')
+    USE_INT32 = True
+
+# optionally build without COPYAMATRIX, so SCS normalizes A in place instead of
+# making its own copy. the Python layer then hands SCS a private copy of A.data
+COPY_A = True
+if '--no-copy-a' in sys.argv:
+    sys.argv.remove('--no-copy-a')
+    COPY_A = False
+
+# optionally build extra extension modules using single-precision floats
+USE_FLOAT32 = False
+if '--float32' in sys.argv:
+    sys.argv.remove('--float32')
+    USE_FLOAT32 = True
+
 if system() == 'Linux':
     ext['libraries'] += ['rt']
 
@@ -33,33 +53,47 @@ rootDir = 'c/scs/'
 # collect the extension module options common to both direct and indirect versions
 ext['sources'] += glober(rootDir, ['src/*.c', 'linsys/*.c'])
 ext['include_dirs'] += glober(rootDir, ['', 'include', 'linsys'])
-ext['define_macros'] += [('PYTHON', None), ('DLONG', None),
-                         ('CTRLC', 1),     ('COPYAMATRIX', None)]
+ext['define_macros'] += [('PYTHON', None), ('CTRLC', 1)]
+if COPY_A:
+    ext['define_macros'] += [('COPYAMATRIX', None)]
 ext['extra_compile_args'] += ["-O3"]
 
 # add the blas and lapack info
 add_blas_lapack_info(ext)
 ext['include_dirs'] += [numpy.get_include()]
 
-# create the extension module arguments for the direct solver version
-# deep copy so that the dictionaries do not point to the same list objects
-ext_direct = copy.deepcopy(ext)
-# next two names need to match
-ext_direct['name'] = 'cyscs._direct'
-ext_direct['sources'] += ['cyscs/_direct' + file_ext]
-ext_direct['sources'] += glober(rootDir, ['linsys/direct/*.c', 'linsys/direct/external/*.c'])
-ext_direct['include_dirs'] += glober(rootDir, ['linsys/direct/', 'linsys/direct/external/'])
-
-
-ext_indirect = copy.deepcopy(ext)
-ext_indirect['name'] = 'cyscs._indirect'
-ext_indirect['sources'] += ['cyscs/_indirect' + file_ext]
-ext_indirect['sources'] += glober(rootDir, ['linsys/indirect/*.c'])
-ext_indirect['include_dirs'] += glober(rootDir, ['linsys/indirect/'])
-ext_indirect['define_macros'] += [('INDIRECT', None)]
-
-extensions = [Extension(**ext_direct),
-              Extension(**ext_indirect)]
+# each variant builds a direct and an indirect extension module, named
+# `cyscs._direct<suffix>` and `cyscs._indirect<suffix>`, with extra macros
+# setting the C integer and float types. the 64-bit integer, double precision
+# variant is always built
+variants = [('', [('DLONG', None)])]
+if USE_INT32:
+    variants += [('_i32', [])]
+if USE_FLOAT32:
+    variants += [(suffix + '_f32', macros + [('FLOAT', None)])
+                 for suffix, macros in variants]
+
+extensions = []
+for suffix, macros in variants:
+    # create the extension module arguments for the direct solver version
+    # deep copy so that the dictionaries do not point to the same list objects
+    ext_direct = copy.deepcopy(ext)
+    # next two names need to match
+    ext_direct['name'] = 'cyscs._direct' + suffix
+    ext_direct['sources'] += ['cyscs/_direct' + suffix + file_ext]
+    ext_direct['sources'] += glober(rootDir, ['linsys/direct/*.c', 'linsys/direct/external/*.c'])
+    ext_direct['include_dirs'] += glober(rootDir, ['linsys/direct/', 'linsys/direct/external/'])
+    ext_direct['define_macros'] += macros
+
+    ext_indirect = copy.deepcopy(ext)
+    ext_indirect['name'] = 'cyscs._indirect' + suffix
+    ext_indirect['sources'] += ['cyscs/_indirect' + suffix + file_ext]
+    ext_indirect['sources'] += glober(rootDir, ['linsys/indirect/*.c'])
+    ext_indirect['include_dirs'] += glober(rootDir, ['linsys/indirect/'])
+    ext_indirect['define_macros'] += [('INDIRECT', None)] + macros
+
+    extensions += [Extension(**ext_direct),
+                   Extension(**ext_indirect)]
 
 if USE_CYTHON:
     from Cython.Build import cythonize
@@ -74,7 +108,7 @@ setup(name='cyscs',
         author_email = 'ajfriend@gmail.com',
         url = 'http://github.com/ajfriend/cyscs',
         description='CySCS: A Cython wrapper for the SCS convex optimization solver.',
-        packages=['cyscs'],
+        packages=['cyscs', 'cyscs.bench'],
 #        py_modules=['scs.examples'],
         package_data={'cyscs': ['test/*.py']},
         zip_safe=False,